@@ -1,62 +1,21 @@
-import pandas as pd
-import hashlib
-import time
-import json
+import blockchain
+import metrics
+from lazy_imports import lazy_import
 
-# Block class for blockchain structure
-class Block:
-    def __init__(self, index, previous_hash, timestamp, sensor_data):
-        self.index = index
-        self.previous_hash = previous_hash
-        self.timestamp = timestamp
-        self.sensor_data = sensor_data  # Dictionary: avg heart rate and glucose
-        self.current_hash = self.calculate_hash()
+sensor_loader = lazy_import("sensor_loader")
 
-    def calculate_hash(self):
-        """Calculate the current block's hash"""
-        value = f"{self.index}{self.previous_hash}{self.timestamp}{json.dumps(self.sensor_data)}".encode()
-        return hashlib.sha256(value).hexdigest()
-
-# Blockchain class
-class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
-
-    def create_genesis_block(self):
-        """Create the Genesis block"""
-        genesis_data = {"avg_heart_rate": 0, "glucose": 0}
-        timestamp = time.time()
-        return Block(0, "0", timestamp, genesis_data)
-
-    def add_block(self, sensor_data):
-        """Add a new block to the chain"""
-        previous_block = self.chain[-1]
-        index = len(self.chain)
-        timestamp = time.time()
-        new_block = Block(index, previous_block.current_hash, timestamp, sensor_data)
-        self.chain.append(new_block)
-        return new_block
-
-    def print_chain(self):
-        """Display the blockchain"""
-        for block in self.chain:
-            print(json.dumps({
-                "Index": block.index,
-                "Previous Hash": block.previous_hash,
-                "Timestamp": block.timestamp,
-                "Sensor Data": block.sensor_data,
-                "Current Hash": block.current_hash
-            }, indent=4))
+# Blockchain class (averaged sensor readings)
+class Blockchain(blockchain.Blockchain):
+    genesis_data = {"avg_heart_rate": 0, "glucose": 0}
 
 # Load and process ECG data for average heart rate
+@metrics.timed("load_ecg_sensor_data")
 def load_ecg_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        ecg_signals = data.iloc[:, :-1]  # Columns 0-186 (ECG signals)
-        
         # Simulate a 5-minute interval with first 5 rows
-        interval_data = ecg_signals.head(5)
-        avg_heart_rate = interval_data.mean().mean() * 10 + 60  # Simple approximation
+        data = sensor_loader.read_ecg(file_path, nrows=5)
+        interval_data = data.iloc[:, :-1]  # Columns 0-186 (ECG signals)
+        avg_heart_rate = float(interval_data.mean().mean()) * 10 + 60  # Simple approximation
         return avg_heart_rate
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
@@ -66,10 +25,11 @@ def load_ecg_sensor_data(file_path):
         return 0
 
 # Load and process Diabetes data for glucose
+@metrics.timed("load_glucose_sensor_data")
 def load_glucose_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        glucose_data = data['blood_glucose_level'].head(5)  # First 5 rows
+        data = sensor_loader.read_diabetes(file_path, nrows=5, usecols=['blood_glucose_level'])
+        glucose_data = data['blood_glucose_level']  # First 5 rows
         avg_glucose = glucose_data.mean()  # Average over interval
         return avg_glucose
     except FileNotFoundError:
@@ -81,6 +41,7 @@ def load_glucose_sensor_data(file_path):
 
 # Main function
 def main():
+    metrics.enable_profiling()
     # File paths
     ecg_path = r"D:\سارا\ترم 3 دانشگاه قم\mitbih_test.csv"
     diabetes_path = r"D:\سارا\ترم 3 دانشگاه قم\diabetes_prediction_dataset.csv"
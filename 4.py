@@ -1,74 +1,18 @@
-import pandas as pd
-import hashlib
-import time
-import json
+from blockchain import Blockchain
+import metrics
+from lazy_imports import lazy_import
 
-# Block class with SHA-256 hashing
-class Block:
-    def __init__(self, index, previous_hash, timestamp, sensor_data):
-        self.index = index
-        self.previous_hash = previous_hash
-        self.timestamp = timestamp
-        self.sensor_data = sensor_data  # Dictionary: heart rate and glucose
-        self.current_hash = self.calculate_hash()
-
-    def calculate_hash(self):
-        """Calculate SHA-256 hash of the block for security and integrity"""
-        block_string = f"{self.index}{self.previous_hash}{self.timestamp}{json.dumps(self.sensor_data)}".encode()
-        return hashlib.sha256(block_string).hexdigest()
-
-# Blockchain class
-class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
-
-    def create_genesis_block(self):
-        """Create the Genesis block with initial dummy data"""
-        genesis_data = {"heart_rate": 0, "glucose": 0}
-        timestamp = time.time()
-        return Block(0, "0", timestamp, genesis_data)
-
-    def add_block(self, sensor_data):
-        """Add a new block with SHA-256 hashed data"""
-        previous_block = self.chain[-1]
-        index = len(self.chain)
-        timestamp = time.time()
-        new_block = Block(index, previous_block.current_hash, timestamp, sensor_data)
-        self.chain.append(new_block)
-        return new_block
-
-    def print_chain(self):
-        """Display the blockchain with hashed data"""
-        for block in self.chain:
-            print(json.dumps({
-                "Index": block.index,
-                "Previous Hash": block.previous_hash,
-                "Timestamp": block.timestamp,
-                "Sensor Data": block.sensor_data,
-                "Current Hash": block.current_hash
-            }, indent=4))
-
-    def is_chain_valid(self):
-        """Verify the integrity of the blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            # Recalculate hash to check integrity
-            if current_block.current_hash != current_block.calculate_hash():
-                print(f"Integrity check failed at Block {i}: Hash mismatch")
-                return False
-            if current_block.previous_hash != previous_block.current_hash:
-                print(f"Integrity check failed at Block {i}: Previous hash mismatch")
-                return False
-        return True
+heart_rate = lazy_import("heart_rate")
+sensor_loader = lazy_import("sensor_loader")
 
 # Load and process ECG data for heart rate (no averaging, individual rows)
+@metrics.timed("load_ecg_sensor_data")
 def load_ecg_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        ecg_signals = data.iloc[:, :-1].head(5)  # First 5 rows, excluding label
-        # Convert each row's ECG signals to an approximate heart rate
-        heart_rates = ecg_signals.mean(axis=1).apply(lambda x: int(60 + (x * 10)))
+        data = sensor_loader.read_ecg(file_path, nrows=5)
+        ecg_signals = data.iloc[:, :-1]  # First 5 rows, excluding label
+        # Estimate each row's heart rate from its RR interval
+        heart_rates = heart_rate.estimate_heart_rates(ecg_signals.to_numpy()).round().astype(int)
         return heart_rates.tolist()  # Return as a list of 5 values
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
@@ -78,10 +22,11 @@ def load_ecg_sensor_data(file_path):
         return [0] * 5
 
 # Load and process Diabetes data for glucose (no averaging, individual rows)
+@metrics.timed("load_glucose_sensor_data")
 def load_glucose_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        glucose_data = data['blood_glucose_level'].head(5)  # First 5 rows
+        data = sensor_loader.read_diabetes(file_path, nrows=5, usecols=['blood_glucose_level'])
+        glucose_data = data['blood_glucose_level']  # First 5 rows
         return glucose_data.tolist()  # Return as a list of 5 values
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
@@ -92,6 +37,7 @@ def load_glucose_sensor_data(file_path):
 
 # Main function
 def main():
+    metrics.enable_profiling()
     # File paths
     ecg_path = r"D:\سارا\ترم 3 دانشگاه قم\mitbih_test.csv"
     diabetes_path = r"D:\سارا\ترم 3 دانشگاه قم\diabetes_prediction_dataset.csv"
@@ -1,78 +1,24 @@
-import pandas as pd
-import hashlib
-import time
-import json
+import blockchain
+import metrics
+from lazy_imports import lazy_import
 
-# کلاس بلوک
-class Block:
-    def __init__(self, index, previous_hash, timestamp, sensor_data):
-        self.index = index
-        self.previous_hash = previous_hash
-        self.timestamp = timestamp
-        self.sensor_data = sensor_data  # دیکشنری شامل ضربان قلب و گلوکز
-        self.current_hash = self.calculate_hash()
-
-    def calculate_hash(self):
-        """محاسبه هش SHA-256 برای بلوک جهت امنیت و یکپارچگی"""
-        block_string = f"{self.index}{self.previous_hash}{self.timestamp}{json.dumps(self.sensor_data)}".encode()
-        return hashlib.sha256(block_string).hexdigest()
+heart_rate = lazy_import("heart_rate")
+sensor_loader = lazy_import("sensor_loader")
 
 # کلاس زنجیره بلاکچین
-class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
-
-    def create_genesis_block(self):
-        """ایجاد بلوک اولیه (جنسیس) با داده‌های صفر"""
-        genesis_data = {"heart_rate": 0, "glucose": 0}
-        timestamp = time.time()
-        return Block(0, "0", timestamp, genesis_data)
-
-    def add_block(self, sensor_data):
-        """اضافه کردن بلوک جدید به زنجیره"""
-        previous_block = self.chain[-1]
-        index = len(self.chain)
-        timestamp = time.time()
-        new_block = Block(index, previous_block.current_hash, timestamp, sensor_data)
-        self.chain.append(new_block)
-        return new_block
-
-    def verify_chain(self):
-        """تأیید درستی زنجیره بلاکچین"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            # بررسی صحت هش فعلی
-            if current_block.current_hash != current_block.calculate_hash():
-                print(f"خطا در تأیید بلوک {i}: عدم تطابق هش")
-                return False
-            
-            # بررسی ارتباط هش قبلی
-            if current_block.previous_hash != previous_block.current_hash:
-                print(f"خطا در تأیید بلوک {i}: عدم تطابق هش قبلی")
-                return False
-        
-        return True
-
-    def print_chain(self):
-        """نمایش ساختار زنجیره بلاکچین"""
-        for block in self.chain:
-            print(json.dumps({
-                "Index": block.index,
-                "Previous Hash": block.previous_hash,
-                "Timestamp": block.timestamp,
-                "Sensor Data": block.sensor_data,
-                "Current Hash": block.current_hash
-            }, indent=4))
+class Blockchain(blockchain.Blockchain):
+    hash_mismatch_message = "خطا در تأیید بلوک {index}: عدم تطابق هش"
+    link_mismatch_message = "خطا در تأیید بلوک {index}: عدم تطابق هش قبلی"
+    checkpoint_mismatch_message = "خطا در تأیید نقطه بازرسی {index}: عدم تطابق امضا"
 
 # تابع بارگذاری داده‌های حسگر ضربان قلب از ECG
+@metrics.timed("load_ecg_sensor_data")
 def load_ecg_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        ecg_signals = data.iloc[:, :-1].head(5)  # ۵ ردیف اول، بدون ستون برچسب
-        # محاسبه تقریبی ضربان قلب برای هر ردیف
-        heart_rates = ecg_signals.mean(axis=1).apply(lambda x: int(60 + (x * 10)))
+        data = sensor_loader.read_ecg(file_path, nrows=5)
+        ecg_signals = data.iloc[:, :-1]  # ۵ ردیف اول، بدون ستون برچسب
+        # تخمین ضربان قلب هر ردیف از فاصله RR
+        heart_rates = heart_rate.estimate_heart_rates(ecg_signals.to_numpy()).round().astype(int)
         return heart_rates.tolist()
     except FileNotFoundError:
         print(f"خطا: فایل {file_path} یافت نشد.")
@@ -82,10 +28,11 @@ def load_ecg_sensor_data(file_path):
         return [0] * 5
 
 # تابع بارگذاری داده‌های حسگر گلوکز از دیتاست دیابت
+@metrics.timed("load_glucose_sensor_data")
 def load_glucose_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        glucose_data = data['blood_glucose_level'].head(5)  # ۵ ردیف اول
+        data = sensor_loader.read_diabetes(file_path, nrows=5, usecols=['blood_glucose_level'])
+        glucose_data = data['blood_glucose_level']  # ۵ ردیف اول
         return glucose_data.tolist()
     except FileNotFoundError:
         print(f"خطا: فایل {file_path} یافت نشد.")
@@ -96,6 +43,7 @@ def load_glucose_sensor_data(file_path):
 
 # تابع اصلی
 def main():
+    metrics.enable_profiling()
     # مسیر فایل‌ها
     ecg_path = r"D:\سارا\ترم 3 دانشگاه قم\mitbih_test.csv"
     diabetes_path = r"D:\سارا\ترم 3 دانشگاه قم\diabetes_prediction_dataset.csv"
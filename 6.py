@@ -1,13 +1,18 @@
-import pandas as pd
-import numpy as np
+import metrics
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+heart_rate = lazy_import("heart_rate")
+sensor_loader = lazy_import("sensor_loader")
 
 # تابع بارگذاری و پردازش داده‌های ECG برای ضربان قلب
+@metrics.timed("load_ecg_sensor_data")
 def load_ecg_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        ecg_signals = data.iloc[:, :-1].head(5)  # ۵ ردیف اول، بدون ستون برچسب
-        # محاسبه تقریبی ضربان قلب برای هر ردیف
-        heart_rates = ecg_signals.mean(axis=1).apply(lambda x: int(60 + (x * 10)))
+        data = sensor_loader.read_ecg(file_path, nrows=5)
+        ecg_signals = data.iloc[:, :-1]  # ۵ ردیف اول، بدون ستون برچسب
+        # تخمین ضربان قلب هر ردیف از فاصله RR
+        heart_rates = heart_rate.estimate_heart_rates(ecg_signals.to_numpy()).round().astype(int)
         heart_rate_mean = np.mean(heart_rates)
         heart_rate_std = np.std(heart_rates)
         return heart_rate_mean, heart_rate_std, heart_rates.tolist()
@@ -19,10 +24,11 @@ def load_ecg_sensor_data(file_path):
         return 0, 0, [0] * 5
 
 # تابع بارگذاری و پردازش داده‌های گلوکز
+@metrics.timed("load_glucose_sensor_data")
 def load_glucose_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        glucose_data = data['Glucose'].head(5)  # ۵ ردیف اول، ستون Glucose
+        data = sensor_loader.read_diabetes(file_path, nrows=5, usecols=['Glucose'])
+        glucose_data = data['Glucose']  # ۵ ردیف اول، ستون Glucose
         glucose_mean = np.mean(glucose_data)
         glucose_std = np.std(glucose_data)
         return glucose_mean, glucose_std, glucose_data.tolist()
@@ -35,6 +41,7 @@ def load_glucose_sensor_data(file_path):
 
 # تابع اصلی
 def main():
+    metrics.enable_profiling()
     # مسیر فایل‌ها
     ecg_path = r"D:\سارا\ترم 3 دانشگاه قم\فصل سوم و چهارم پایان نامه 1\mitbih_test.csv"
     diabetes_path = r"D:\سارا\ترم 3 دانشگاه قم\فصل سوم و چهارم پایان نامه 1\diabetes.csv"
@@ -1,112 +1,158 @@
 #  کتابخانه‌های مورد نیاز
-import pandas as pd
-import hashlib
 import time
 import json
-import matplotlib.pyplot as plt
-import networkx as nx
 import random
+import struct
+
+import blockchain
+import metrics
 
 #  آدرس فایل‌ها
 path_test = r'D:\سارا\ترم 3 دانشگاه قم\فصل سوم و چهارم پایان نامه 1\mitbih_test.csv'
 path_diabetes = r'D:\سارا\ترم 3 دانشگاه قم\فصل سوم و چهارم پایان نامه 1\diabetes.csv'
 
-#  بارگذاری داده‌ها
-mitbih_data = pd.read_csv(path_test)
-diabetes_data = pd.read_csv(path_diabetes)
-
 #  تعریف کلاس بلاک
-class Block:
-    def __init__(self, index, previous_hash, data, timestamp, token=0):
-        self.index = index
-        self.previous_hash = previous_hash
-        self.timestamp = timestamp
-        self.data = data
+class Block(blockchain.Block):
+    __slots__ = ("token",)
+
+    def __init__(self, index, previous_hash, data, timestamp, token=0, hash_format=blockchain.HASH_FORMAT_V1):
         self.token = token  # اضافه کردن ویژگی token
-        self.hash = self.calculate_hash()
+        super().__init__(index, previous_hash, timestamp, data, hash_format=hash_format)
+
+    @property
+    def data(self):
+        return self.sensor_data
 
-    def calculate_hash(self):
+    @property
+    def hash(self):
+        return self.current_hash
+
+    @hash.setter
+    def hash(self, value):
+        self.current_hash = value
+
+    def legacy_preimage(self):
         block_content = f"{self.index}{self.previous_hash}{self.timestamp}{json.dumps(self.data)}{self.token}"
-        return hashlib.sha256(block_content.encode()).hexdigest()
+        return block_content.encode()
+
+    def canonical_payload(self):
+        # توکن بعد از داده‌ها به صورت عدد صحیح ۸ بایتی
+        return super().canonical_payload() + struct.pack(">q", self.token)
 
 #  تعریف کلاس بلاکچین
-class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
+class Blockchain(blockchain.Blockchain):
+    block_class = Block
+    hash_mismatch_message = " خطا: بلاک {index} نامعتبر است!"
+    link_mismatch_message = " خطا: ارتباط بلاک {index} با بلاک قبلی نامعتبر است!"
+    checkpoint_mismatch_message = " خطا: امضای نقطه بازرسی {index} نامعتبر است!"
 
     def create_genesis_block(self):
-        return Block(0, "0", "Genesis Block", time.time(), token=0)
+        return Block(0, "0", "Genesis Block", time.time(), token=0, hash_format=self.hash_format)
 
     def get_latest_block(self):
         return self.chain[-1]
 
     def add_block(self, new_block):
-        new_block.previous_hash = self.get_latest_block().hash
-        new_block.hash = new_block.calculate_hash()
-        self.chain.append(new_block)
-
-    def is_chain_valid(self):
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            if current_block.hash != current_block.calculate_hash():
-                print(f" خطا: بلاک {current_block.index} نامعتبر است!")
-                return False
-            if current_block.previous_hash != previous_block.hash:
-                print(f" خطا: ارتباط بلاک {current_block.index} با بلاک قبلی نامعتبر است!")
-                return False
-        return True
-
-# ایجاد بلاکچین
-blockchain = Blockchain()
-
-#  اندازه‌گیری زمان پردازش و ذخیره‌سازی
-start_time = time.time()
-
-#  اضافه کردن داده‌ها به بلاکچین
-for i, row in diabetes_data.iterrows():
-    block = Block(i + 1, blockchain.get_latest_block().hash, row.to_dict(), time.time(), token=random.randint(1, 100))
-    blockchain.add_block(block)
-
-end_time = time.time()
-
-print(f"\n زمان پردازش داده‌ها: {end_time - start_time:.2f} ثانیه")
-print(f" صحت زنجیره بلاکچین: {blockchain.is_chain_valid()}")
-
-#  نمودار زمان پاسخ‌دهی با بلاکچین و بدون بلاکچین
-times_with_blockchain = [random.uniform(0.1, 0.5) for _ in range(50)]
-times_without_blockchain = [random.uniform(0.05, 0.3) for _ in range(50)]
-
-plt.figure(figsize=(10, 5))
-plt.plot(times_with_blockchain, label="با بلاکچین", marker='o')
-plt.plot(times_without_blockchain, label="بدون بلاکچین", marker='x')
-plt.title(" مقایسه زمان پاسخ‌دهی")
-plt.xlabel("نمونه")
-plt.ylabel("زمان (ثانیه)")
-plt.legend()
-plt.show()
-
-#  نمودار توزیع توکن‌ها بین کاربران
-tokens = [block.token for block in blockchain.chain]
-
-plt.figure(figsize=(8, 4))
-plt.hist(tokens, bins=20, color='skyblue', edgecolor='black')
-plt.title(" توزیع توکن‌ها بین کاربران")
-plt.xlabel("مقدار توکن")
-plt.ylabel("تعداد")
-plt.show()
-
-#  نمایش گراف زنجیره بلوک‌ها
-G = nx.DiGraph()
-
-for block in blockchain.chain:
-    G.add_node(block.index, label=f"Block {block.index}")
-
-for i in range(1, len(blockchain.chain)):
-    G.add_edge(blockchain.chain[i - 1].index, blockchain.chain[i].index)
-
-plt.figure(figsize=(12, 6))
-pos = nx.spring_layout(G)
-nx.draw(G, pos, with_labels=True, node_color='lightgreen', font_weight='bold', node_size=1000)
-plt.title(" ساختار گرافی زنجیره بلاکچین")
-plt.show()
+        #  بلاکی که با هش آخرین بلاک ساخته شده، هش معتبر دارد و دوباره هش نمی‌شود
+        latest_hash = self.get_latest_block().hash
+        if new_block.previous_hash != latest_hash or not new_block.hash:
+            new_block.previous_hash = latest_hash
+            new_block.hash = new_block.calculate_hash()
+        return self._append(new_block)
+
+    def add_blocks_from_frame(self, df):
+        """افزودن دسته‌ای ردیف‌های یک DataFrame به بلاکچین؛ هر بلاک فقط یک بار هش می‌شود"""
+        # سریال‌سازی ستونی: یک بار تبدیل کل جدول به لیست‌های پایتونی به جای iterrows
+        columns = [str(column) for column in df.columns]
+        rows = df.to_numpy().tolist()
+        previous_hash = self.get_latest_block().hash
+        start_index = len(self.chain)
+        new_blocks = []
+        for offset, values in enumerate(rows):
+            block = Block(start_index + offset, previous_hash, dict(zip(columns, values)),
+                          time.time(), token=random.randint(1, 100), hash_format=self.hash_format)
+            previous_hash = block.hash
+            new_blocks.append(block)
+        #  کل دسته یک‌جا به زنجیره اضافه می‌شود؛ ایندکس بیماران در اولین جستجو به‌روز می‌شود
+        self.chain.extend(new_blocks)
+        return new_blocks
+
+#  تابع اصلی؛ pandas، matplotlib و خواندن فایل‌ها فقط هنگام اجرای اسکریپت بارگذاری می‌شوند
+#  تا import کردن کلاس‌های Block و Blockchain سریع بماند
+def main():
+    metrics.enable_profiling()
+    import matplotlib.pyplot as plt
+
+    import chain_plot
+    import sensor_loader
+
+    #  بارگذاری داده‌ها
+    mitbih_data = sensor_loader.read_ecg(path_test)
+    diabetes_data = sensor_loader.read_diabetes(path_diabetes)
+
+    # ایجاد بلاکچین
+    blockchain = Blockchain()
+
+    #  اندازه‌گیری زمان پردازش و ذخیره‌سازی
+    start_time = time.perf_counter()
+
+    #  اضافه کردن داده‌ها به بلاکچین به صورت دسته‌ای
+    blockchain.add_blocks_from_frame(diabetes_data)
+
+    end_time = time.perf_counter()
+
+    #  مقایسه با روش قبلی (iterrows): benchmarks/bench_bulk_ingest.py
+    print(f"\n زمان پردازش داده‌ها: {end_time - start_time:.2f} ثانیه")
+    print(f" سرعت: {len(diabetes_data) / max(end_time - start_time, 1e-9):,.0f} ردیف در ثانیه")
+    print(f" صحت زنجیره بلاکچین: {blockchain.is_chain_valid()}")
+
+    #  اندازه‌گیری واقعی زمان پاسخ‌دهی هر ردیف با بلاکچین و بدون بلاکچین
+    #  (برای همه عملیات‌ها و اندازه‌های مختلف داده: benchmarks/bench_latency.py)
+    #  هر دو حالت همان کار را انجام می‌دهند (ساخت رکورد از ردیف با توکن و زمان)؛ تفاوت فقط هش و اتصال بلاک است
+    columns = [str(column) for column in diabetes_data.columns]
+    rows = diabetes_data.head(50).to_numpy().tolist()
+
+    timed_blockchain = Blockchain()
+    times_with_blockchain = []
+    for values in rows:
+        start = time.perf_counter_ns()
+        latest = timed_blockchain.get_latest_block()
+        timed_blockchain.add_block(Block(latest.index + 1, latest.hash, dict(zip(columns, values)), time.time(),
+                                         token=random.randint(1, 100)))
+        times_with_blockchain.append((time.perf_counter_ns() - start) / 1e6)
+
+    stored_rows = []
+    times_without_blockchain = []
+    for values in rows:
+        start = time.perf_counter_ns()
+        stored_rows.append({"index": len(stored_rows) + 1, "data": dict(zip(columns, values)),
+                            "timestamp": time.time(), "token": random.randint(1, 100)})
+        times_without_blockchain.append((time.perf_counter_ns() - start) / 1e6)
+
+    plt.figure(figsize=(10, 5))
+    plt.plot(times_with_blockchain, label="با بلاکچین", marker='o')
+    plt.plot(times_without_blockchain, label="بدون بلاکچین", marker='x')
+    plt.title(" مقایسه زمان پاسخ‌دهی")
+    plt.xlabel("نمونه")
+    plt.ylabel("زمان (میلی‌ثانیه)")
+    plt.legend()
+    plt.show()
+
+    #  نمودار توزیع توکن‌ها بین کاربران
+    tokens = [block.token for block in blockchain.chain]
+
+    plt.figure(figsize=(8, 4))
+    plt.hist(tokens, bins=20, color='skyblue', edgecolor='black')
+    plt.title(" توزیع توکن‌ها بین کاربران")
+    plt.xlabel("مقدار توکن")
+    plt.ylabel("تعداد")
+    plt.show()
+
+    #  نمایش زنجیره بلوک‌ها با چینش خطی (بدون گراف networkx و spring_layout)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    chain_plot.draw_chain(ax, chain_plot.block_values(blockchain.chain))
+    plt.title(" ساختار زنجیره بلاکچین")
+    plt.show()
+
+if __name__ == "__main__":
+    main()
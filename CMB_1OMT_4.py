@@ -1,20 +1,18 @@
-import hashlib
-import time
-import json
-from typing import List
-from cryptography.fernet import Fernet
-import pandas as pd
-import matplotlib.pyplot as plt
-import networkx as nx
-import random
+import metrics
+from lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
+heart_rate = lazy_import("heart_rate")
+patient_registry = lazy_import("patient_registry")
+sensor_loader = lazy_import("sensor_loader")
 
 # تابع خواندن داده‌های حسگر قند خون
+@metrics.timed("load_glucose_sensor_data")
 def load_glucose_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        glucose_data = data[['Glucose']].head(5)  # ۵ ردیف اول، ستون Glucose
+        glucose_data = sensor_loader.read_diabetes(file_path, nrows=5, usecols=['Glucose'])  # ۵ ردیف اول، ستون Glucose
         glucose_data.columns = ['Glucose']  # نام ستون ثابت می‌مونه
-        glucose_data['patient_id'] = [f"P{str(i+1).zfill(3)}" for i in range(len(glucose_data))]
+        glucose_data['patient_code'] = patient_registry.positional_codes(len(glucose_data))
         return glucose_data
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
@@ -24,15 +22,16 @@ def load_glucose_sensor_data(file_path):
         return pd.DataFrame()
 
 # تابع خواندن داده‌های حسگر ضربان قلب
+@metrics.timed("load_heart_rate_sensor_data")
 def load_heart_rate_sensor_data(file_path):
     try:
-        data = pd.read_csv(file_path)
-        ecg_data = data.iloc[:, :-1].head(5)  # ۵ ردیف اول بدون برچسب
-        # تبدیل ساده سیگنال ECG به ضربان قلب تقریبی (میانگین سیگنال)
+        data = sensor_loader.read_ecg(file_path, nrows=5)
+        ecg_data = data.iloc[:, :-1]  # ۵ ردیف اول بدون برچسب
+        # تخمین ضربان قلب از فاصله بین قله‌های R سیگنال ECG
         heart_rate_data = pd.DataFrame({
-            'Heart_Rate': ecg_data.mean(axis=1).apply(lambda x: int(60 + (x * 10)))
+            'Heart_Rate': heart_rate.estimate_heart_rates(ecg_data.to_numpy()).round().astype(int)
         })
-        heart_rate_data['patient_id'] = [f"P{str(i+1).zfill(3)}" for i in range(len(heart_rate_data))]
+        heart_rate_data['patient_code'] = patient_registry.positional_codes(len(heart_rate_data))
         return heart_rate_data
     except FileNotFoundError:
         print(f"Error: File {file_path} not found.")
@@ -45,27 +44,36 @@ def load_heart_rate_sensor_data(file_path):
 def combine_sensor_data(glucose_data, heart_rate_data):
     if glucose_data.empty or heart_rate_data.empty:
         return pd.DataFrame()
-    combined_data = pd.merge(
-        glucose_data[['patient_id', 'Glucose']],
-        heart_rate_data[['patient_id', 'Heart_Rate']],
-        on='patient_id'
-    )
+    # اتصال مستقیم بر اساس کد عددی بیمار (بدون merge روی رشته‌ها)
+    combined_data = patient_registry.join_by_code(glucose_data, heart_rate_data, ['Glucose'], ['Heart_Rate'])
     return combined_data
 
+# ترکیب جریانی داده‌ها: ورودی‌های تکه‌تکه (مرتب بر اساس کد بیمار) بدون بارگذاری کامل هر دو جدول
+def iter_combine_sensor_data(glucose_chunks, heart_rate_chunks):
+    return patient_registry.iter_join_by_code(glucose_chunks, heart_rate_chunks, ['Glucose'], ['Heart_Rate'])
+
 # مسیر فایل‌ها
 glucose_path = r"D:\سارا\ترم 3 دانشگاه قم\فصل سوم و چهارم پایان نامه 1\diabetes.csv"
 heart_rate_path = r"D:\سارا\ترم 3 دانشگاه قم\فصل سوم و چهارم پایان نامه 1\mitbih_test.csv"
 
-# خواندن داده‌ها
-glucose_sensor_data = load_glucose_sensor_data(glucose_path)
-heart_rate_sensor_data = load_heart_rate_sensor_data(heart_rate_path)
+# تابع اصلی
+def main():
+    metrics.enable_profiling()
+    # خواندن داده‌ها
+    glucose_sensor_data = load_glucose_sensor_data(glucose_path)
+    heart_rate_sensor_data = load_heart_rate_sensor_data(heart_rate_path)
+
+    # ترکیب داده‌ها
+    sensor_data = combine_sensor_data(glucose_sensor_data, heart_rate_sensor_data)
 
-# ترکیب داده‌ها
-sensor_data = combine_sensor_data(glucose_sensor_data, heart_rate_sensor_data)
+    # نمایش داده‌ها
+    if not sensor_data.empty:
+        print("Sensor Data (Glucose and Heart Rate):")
+        display_data = sensor_data.drop(columns='patient_code')
+        display_data.insert(0, 'patient_id', patient_registry.patient_ids(sensor_data['patient_code']))
+        print(display_data.to_string(index=False))
+    else:
+        print("No sensor data loaded.")
 
-# نمایش داده‌ها
-if not sensor_data.empty:
-    print("Sensor Data (Glucose and Heart Rate):")
-    print(sensor_data.to_string(index=False))
-else:
-    print("No sensor data loaded.")
+if __name__ == "__main__":
+    main()
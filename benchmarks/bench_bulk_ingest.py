@@ -0,0 +1,80 @@
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import blockchain
+
+script = importlib.import_module("8")
+
+# The original Block of 8.py: hashed in its constructor, legacy string preimage
+class OriginalBlock:
+    def __init__(self, index, previous_hash, data, timestamp, token=0):
+        self.index = index
+        self.previous_hash = previous_hash
+        self.timestamp = timestamp
+        self.data = data
+        self.token = token
+        self.hash = self.calculate_hash()
+
+    def calculate_hash(self):
+        block_content = f"{self.index}{self.previous_hash}{self.timestamp}{json.dumps(self.data)}{self.token}"
+        return hashlib.sha256(block_content.encode()).hexdigest()
+
+# The original ingestion loop: iterrows, and add_block hashes every block a second time
+def original_ingest(frame):
+    chain = [OriginalBlock(0, "0", "Genesis Block", time.time())]
+    for i, row in frame.iterrows():
+        block = OriginalBlock(i + 1, chain[-1].hash, row.to_dict(), time.time(), token=random.randint(1, 100))
+        block.previous_hash = chain[-1].hash
+        block.hash = block.calculate_hash()
+        chain.append(block)
+    return chain
+
+# Synthetic frame with the columns of diabetes.csv
+def diabetes_frame(rows):
+    rng = np.random.default_rng(rows)
+    return pd.DataFrame({
+        "Pregnancies": rng.integers(0, 12, rows),
+        "Glucose": rng.integers(70, 200, rows),
+        "BloodPressure": rng.integers(50, 100, rows),
+        "SkinThickness": rng.integers(0, 50, rows),
+        "Insulin": rng.integers(0, 300, rows),
+        "BMI": rng.uniform(18, 45, rows).round(1),
+        "DiabetesPedigreeFunction": rng.uniform(0.1, 2.0, rows).round(3),
+        "Age": rng.integers(21, 80, rows),
+        "Outcome": rng.integers(0, 2, rows)
+    })
+
+def rows_per_second(ingest, frame):
+    start = time.perf_counter()
+    ingest(frame)
+    return len(frame) / (time.perf_counter() - start)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Rows/sec of 8.py's bulk ingestion against the original loop")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    frame = diabetes_frame(args.rows)
+
+    variants = (
+        ("original iterrows loop (hashes twice)", original_ingest),
+        ("add_blocks_from_frame, legacy hash",
+         lambda data: script.Blockchain(hash_format=blockchain.HASH_FORMAT_LEGACY).add_blocks_from_frame(data)),
+        ("add_blocks_from_frame", lambda data: script.Blockchain().add_blocks_from_frame(data))
+    )
+    for name, ingest in variants:
+        print(f"{name:<40} {rows_per_second(ingest, frame):12,.0f} rows/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chain_io
+from blockchain import Blockchain
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Export/import speed of the NDJSON and binary chain formats")
+    parser.add_argument("--blocks", type=int, default=1_000_000)
+    parser.add_argument("--print-blocks", type=int, default=100_000,
+                        help="blocks dumped with the old one-print-per-block view for comparison")
+    args = parser.parse_args()
+
+    blockchain = Blockchain()
+    for i in range(args.blocks - 1):
+        blockchain.add_block({
+            "patient_id": f"P{str(i % 1000 + 1).zfill(3)}",
+            "heart_rate": random.randint(55, 120),
+            "glucose": random.randint(70, 200)
+        })
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        blockchain.print_chain(start=0, stop=args.print_blocks)
+        printed = time.perf_counter() - start
+    print(f"print_chain, every block: {args.print_blocks / printed:,.0f} blocks/sec")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, export in (("ndjson", chain_io.export_ndjson), ("binary", chain_io.export_binary)):
+            path = os.path.join(directory, f"chain.{name}")
+            start = time.perf_counter()
+            export(blockchain, path)
+            exported = time.perf_counter() - start
+            start = time.perf_counter()
+            imported = chain_io.import_chain(path, Blockchain())
+            loaded = time.perf_counter() - start
+            assert imported.chain[-1].current_hash == blockchain.chain[-1].current_hash
+            print(f"{name:<7} {os.path.getsize(path) / 2**20:8.1f} MiB  "
+                  f"export {exported:6.2f} s ({len(blockchain.chain) / exported:,.0f} blocks/sec)  "
+                  f"import + verify {loaded:6.2f} s ({len(blockchain.chain) / loaded:,.0f} blocks/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Block, Blockchain
+
+# The original Block layout: a plain object with a per-instance __dict__
+class DictBlock:
+    def __init__(self, index, previous_hash, timestamp, sensor_data, hash_format):
+        self.index = index
+        self.previous_hash = previous_hash
+        self.timestamp = timestamp
+        self.sensor_data = sensor_data
+        self.hash_format = hash_format
+        self.current_hash = self.calculate_hash()
+
+    legacy_preimage = Block.legacy_preimage
+    canonical_payload = Block.canonical_payload
+    binary_preimage = Block.binary_preimage
+    calculate_hash = Block.calculate_hash
+
+class DictBlockchain(Blockchain):
+    block_class = DictBlock
+
+# The sensor_stats readings every benchmark block holds
+FIELDS = ("heart_rate_mean", "heart_rate_std", "glucose_mean", "glucose_std")
+
+# Bytes allocated per block while building a chain
+def bytes_per_block(chain_class, num_blocks, **kwargs):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    blockchain = chain_class(**kwargs)
+    for i in range(num_blocks):
+        blockchain.add_block({
+            "heart_rate_mean": 60.0 + i % 40,
+            "heart_rate_std": 1.5 + i % 7,
+            "glucose_mean": 80.0 + i % 120,
+            "glucose_std": 3.25 + i % 11
+        })
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / len(blockchain.chain)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Memory per block: dict-based, __slots__ and compact chain")
+    parser.add_argument("--blocks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for name, chain_class, kwargs in (
+        ("dict blocks (before)", DictBlockchain, {}),
+        ("__slots__ blocks", Blockchain, {}),
+        ("compact chain", Blockchain, {"compact": True, "compact_fields": FIELDS}),
+    ):
+        print(f"{name:<22} {bytes_per_block(chain_class, args.blocks, **kwargs):,.0f} bytes/block")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chain_plot
+from blockchain import Blockchain
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Time to render a long chain with the ribbon layout")
+    parser.add_argument("--blocks", type=int, default=1_000_000)
+    parser.add_argument("--output", default="chain.png", help="PNG or SVG file")
+    args = parser.parse_args()
+
+    blockchain = Blockchain(compact=True)
+    for i in range(args.blocks - 1):
+        blockchain.add_block({"heart_rate": 60 + i % 60, "glucose": 80 + i % 120})
+
+    start = time.perf_counter()
+    values = chain_plot.block_values(blockchain.chain)
+    extracted = time.perf_counter() - start
+    start = time.perf_counter()
+    per_cell = chain_plot.render_chain(args.output, values, highlight=[len(values) // 2], title="Blockchain")
+    rendered = time.perf_counter() - start
+    print(f"blocks={len(values):,} blocks per cell={per_cell}")
+    print(f"value extraction: {extracted:.2f} s, rendering to {args.output}: {rendered:.2f} s")
+
+if __name__ == "__main__":
+    main()
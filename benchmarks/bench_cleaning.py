@@ -0,0 +1,68 @@
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import cleaning
+
+# Diabetes-like data with some missing and negative values
+def write_dataset(path, rows):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Glucose": rng.integers(70, 200, rows).astype(float),
+        "BloodPressure": rng.integers(50, 100, rows),
+        "BMI": rng.uniform(18, 45, rows).round(1),
+        "Age": rng.integers(21, 80, rows)
+    })
+    frame.loc[rng.choice(rows, rows // 50), "Glucose"] = np.nan
+    frame.loc[rng.choice(rows, rows // 50), "BloodPressure"] = -1
+    frame.to_csv(path, index=False)
+
+# The original in-memory pipeline of 2.py
+def clean_in_memory(file_path, output_path):
+    from sklearn.preprocessing import MinMaxScaler
+
+    data = pd.read_csv(file_path).dropna()
+    data = data[(data >= 0).all(axis=1)]
+    numeric_cols = data.select_dtypes(include=[np.number]).columns
+    data[numeric_cols] = MinMaxScaler().fit_transform(data[numeric_cols])
+    data.to_csv(output_path, index=False)
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="In-memory vs two-pass streaming cleaning and normalization")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=cleaning.CHUNK_ROWS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        raw = os.path.join(directory, "raw.csv")
+        write_dataset(raw, args.rows)
+        in_memory = os.path.join(directory, "in_memory.csv")
+        streamed = os.path.join(directory, "streamed.csv")
+        for name, function, output in (("in-memory", clean_in_memory, in_memory),
+                                       ("two-pass streaming", lambda *a: cleaning.clean_normalize_csv(
+                                           *a, chunk_rows=args.chunk_rows), streamed)):
+            elapsed, peak = measure(function, raw, output)
+            print(f"{name:<20} {elapsed:6.2f} s  peak memory {peak / 2**20:8.1f} MiB")
+        print(f"identical output: {filecmp.cmp(in_memory, streamed, shallow=False)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sensor_loader
+
+# Time one call and return (seconds, result)
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+# Compare CSV parsing with cold (snapshot build) and warm (snapshot read) loads
+def bench(name, loader, file_path):
+    for stale in glob.glob(glob.escape(sensor_loader._cache_prefix(file_path)) + ".*"):
+        os.remove(stale)
+    csv_time, data = timed(loader, file_path, cache=False)
+    cold_time, _ = timed(loader, file_path)
+    warm_time, _ = timed(loader, file_path)
+    partial_time, _ = timed(loader, file_path, nrows=5, usecols=[0])
+    print(f"{name}: {len(data):,} rows  csv={csv_time:.3f}s  cold={cold_time:.3f}s  "
+          f"warm={warm_time:.4f}s  speedup={csv_time / warm_time:.0f}x  warm 5 rows x 1 column={partial_time:.4f}s")
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs cached snapshot load time")
+    parser.add_argument("--ecg", help="path to mitbih_test.csv")
+    parser.add_argument("--diabetes", help="path to diabetes.csv or diabetes_prediction_dataset.csv")
+    args = parser.parse_args()
+
+    if args.ecg:
+        bench("ECG", sensor_loader.read_ecg, args.ecg)
+    if args.diabetes:
+        bench("Diabetes", sensor_loader.read_diabetes, args.diabetes)
+    if not args.ecg and not args.diabetes:
+        parser.error("pass --ecg and/or --diabetes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+import dataset_split
+
+# The original split of 1.py: dropna, two DataFrame splits, concat back together
+def split_with_copies(data):
+    data = data.dropna()
+    X = data.iloc[:, :-1]
+    y = data.iloc[:, -1]
+    X_train, X_temp, y_train, y_temp = train_test_split(X, y, test_size=0.3, stratify=y, random_state=42)
+    X_val, X_test, y_val, y_test = train_test_split(X_temp, y_temp, test_size=0.5, stratify=y_temp,
+                                                    random_state=42)
+    return (pd.concat([X_train, y_train], axis=1), pd.concat([X_val, y_val], axis=1),
+            pd.concat([X_test, y_test], axis=1))
+
+def split_by_index(data):
+    return dataset_split.split_frame(data, data.columns[-1])
+
+def split_to_disk(data, directory):
+    rows = dataset_split.complete_positions(data)
+    train, val, test = (rows[split] for split in dataset_split.split_indices(data.iloc[:, -1].to_numpy()[rows]))
+    return dataset_split.write_splits(data.to_numpy(), {"train": train, "val": val, "test": test}, directory, "ecg")
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    outputs = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, outputs
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Stratified ECG split: DataFrame copies vs index arrays")
+    parser.add_argument("--rows", type=int, default=109_446, help="MIT-BIH train + test is 109,446 beats")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = rng.random((args.rows, 188), dtype=np.float32)
+    matrix[:, -1] = rng.choice(5, args.rows, p=[0.83, 0.03, 0.07, 0.01, 0.06])
+    data = pd.DataFrame(matrix)
+    print(f"data: {args.rows:,} x 188 float32 = {matrix.nbytes / 2**20:.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, function, extra in (("DataFrame copies (1.py before)", split_with_copies, ()),
+                                      ("index arrays + take", split_by_index, ()),
+                                      ("index arrays to .npy", split_to_disk, (directory,))):
+            elapsed, peak, outputs = measure(function, data, *extra)
+            print(f"{name:<32} {elapsed:6.2f} s  peak extra memory {peak / 2**20:8.1f} MiB")
+            del outputs
+
+if __name__ == "__main__":
+    main()
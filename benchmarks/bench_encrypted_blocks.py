@@ -0,0 +1,54 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+from encryption import EncryptedBlockchain
+
+# Blocks/sec for appending every reading to a fresh chain
+def blocks_per_second(append, readings):
+    start = time.perf_counter()
+    append(readings)
+    return len(readings) / (time.perf_counter() - start)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Block append rate with encryption on vs off")
+    parser.add_argument("--blocks", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    readings = [{
+        "patient_id": f"P{str(i % 1000 + 1).zfill(3)}",
+        "heart_rate": random.randint(55, 120),
+        "glucose": random.randint(70, 200)
+    } for i in range(args.blocks)]
+
+    def plain(batch):
+        blockchain = Blockchain()
+        for reading in batch:
+            blockchain.add_block(reading)
+
+    def encrypted_one_by_one(batch):
+        blockchain = EncryptedBlockchain()
+        for reading in batch:
+            blockchain.add_block(reading)
+
+    def encrypted_batched(batch):
+        EncryptedBlockchain(workers=args.workers).add_blocks(batch)
+
+    for name, append in (("encryption off", plain), ("encryption on (add_block)", encrypted_one_by_one),
+                         (f"encryption on (add_blocks, {args.workers} threads)", encrypted_batched)):
+        print(f"{name:<40} {blocks_per_second(append, readings):,.0f} blocks/sec")
+
+    blockchain = EncryptedBlockchain()
+    blockchain.add_blocks(readings)
+    start = time.perf_counter()
+    records = blockchain.read_patient("P042")
+    print(f"read_patient (decrypt {len(records)} blocks): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
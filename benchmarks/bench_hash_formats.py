@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import HASH_FORMAT_LEGACY, HASH_FORMAT_V1, Blockchain
+
+# Hash every block of the chain once and return hashes/sec
+def hashes_per_second(blockchain, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for block in blockchain.chain:
+            block.calculate_hash()
+    return len(blockchain.chain) * repeats / (time.perf_counter() - start)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Legacy f-string vs binary V1 hash preimage")
+    parser.add_argument("--blocks", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, hash_format in (("legacy", HASH_FORMAT_LEGACY), ("binary v1", HASH_FORMAT_V1)):
+        blockchain = Blockchain(hash_format=hash_format)
+        for i in range(args.blocks):
+            blockchain.add_block({"heart_rate": 60 + i % 40, "glucose": 80.5 + i % 120})
+        rate = hashes_per_second(blockchain, args.repeats)
+        print(f"{name:<10} {rate:,.0f} hashes/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose startup is tracked; the blockchain core and the scripts must stay light
+MODULES = ("blockchain", "chain_io", "metrics", "proof_of_work", "sharded_chain", "encryption",
+           "1", "2", "3", "4", "5", "6", "7", "8", "CMB_1OMT_4")
+HEAVY = ("pandas", "numpy", "sklearn", "matplotlib", "networkx", "cryptography")
+
+# Import one module in a fresh interpreter under -X importtime
+def measure(module):
+    """Return (cumulative import time in ms, heavy packages actually executed)
+
+    Lazily imported modules are only looked up at import time, so they do
+    not show up in the -X importtime log until they are used.
+    """
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); __import__({module!r})"
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stderr
+    cumulative_us = 0
+    loaded = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        package = name.strip().split(".")[0]
+        if package in HEAVY:
+            loaded.add(package)
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, sorted(loaded)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Startup cost of the core modules and pipeline scripts")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="exit non-zero if any module takes longer than this to import")
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        try:
+            runs = [measure(module) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<16} import failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        best = min(ms for ms, _ in runs)
+        heavy = runs[0][1]
+        results[module] = {"import_ms": best, "heavy_modules": heavy}
+        print(f"{module:<16} {best:9.1f} ms (best of {args.runs})  heavy: {', '.join(heavy) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_ms is not None:
+        slow = [module for module, result in results.items() if result["import_ms"] > args.max_ms]
+        if slow:
+            print(f"Slower than {args.max_ms} ms: {', '.join(slow)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
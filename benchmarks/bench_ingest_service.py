@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+from ingest_service import IngestService
+
+# One simulated sensor: a connection sending heart rate and glucose readings
+async def sensor(host, port, sensor_id, num_readings):
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(num_readings):
+        reading = {
+            "sensor_id": sensor_id,
+            "seq": i,
+            "heart_rate": random.randint(55, 120),
+            "glucose": random.randint(70, 200)
+        }
+        writer.write(json.dumps(reading).encode() + b"\n")
+        if i % 100 == 99:
+            await writer.drain()
+    await writer.drain()
+    # Half-close and wait until the service has read (and queued) everything
+    writer.write_eof()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+async def run(args):
+    blockchain = Blockchain()
+    service = IngestService(blockchain, queue_size=args.queue_size, batch_size=args.batch_size, track_latency=True)
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(sensor("127.0.0.1", port, f"S{n:04d}", args.readings) for n in range(args.sensors)))
+    await service.drain()
+    elapsed = time.perf_counter() - start
+    await service.stop()
+
+    latencies_ms = sorted(latency / 1e6 for latency in service.latencies_ns)
+    quantiles = statistics.quantiles(latencies_ms, n=100)
+    print(f"sensors={args.sensors} readings={service.readings_appended:,} blocks={len(blockchain.chain) - 1:,}")
+    print(f"throughput: {service.readings_appended / elapsed:,.0f} readings/sec")
+    print(f"append latency: p50={quantiles[49]:.2f} ms  p99={quantiles[98]:.2f} ms")
+    print(f"chain valid: {blockchain.verify_chain()}")
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the asyncio ingestion service")
+    parser.add_argument("--sensors", type=int, default=200)
+    parser.add_argument("--readings", type=int, default=1000, help="readings per sensor")
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import sensor_loader
+from blockchain import Blockchain
+
+# Percentiles reported for every operation; "max" is added separately
+PERCENTILES = (50, 90, 95, 99)
+
+# Synthetic dataset with the columns of diabetes.csv, written once per size
+def write_dataset(directory, rows):
+    rng = random.Random(rows)
+    frame = pd.DataFrame({
+        "Pregnancies": [rng.randint(0, 12) for _ in range(rows)],
+        "Glucose": [rng.randint(70, 200) for _ in range(rows)],
+        "BloodPressure": [rng.randint(50, 100) for _ in range(rows)],
+        "SkinThickness": [rng.randint(0, 50) for _ in range(rows)],
+        "Insulin": [rng.randint(0, 300) for _ in range(rows)],
+        "BMI": [round(rng.uniform(18, 45), 1) for _ in range(rows)],
+        "DiabetesPedigreeFunction": [round(rng.uniform(0.1, 2.0), 3) for _ in range(rows)],
+        "Age": [rng.randint(21, 80) for _ in range(rows)],
+        "Outcome": [rng.randint(0, 1) for _ in range(rows)]
+    })
+    path = os.path.join(directory, f"diabetes_{rows}.csv")
+    frame.to_csv(path, index=False)
+    return path
+
+# Readings as the scripts build them: one dict per row, rows spread over patients
+def frame_readings(frame, patients):
+    columns = [str(column) for column in frame.columns]
+    readings = []
+    for row, values in enumerate(frame.to_numpy().tolist()):
+        reading = dict(zip(columns, values))
+        reading["patient_id"] = f"P{str(row % patients + 1).zfill(3)}"
+        readings.append(reading)
+    return readings
+
+# Nanosecond latency of each call of operation(item)
+def time_each(operation, items):
+    samples = []
+    for item in items:
+        start = time.perf_counter_ns()
+        operation(item)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+# Latency of repeated whole-dataset operations
+def time_repeated(operation, repeats):
+    return time_each(lambda _: operation(), range(repeats))
+
+def summarize(operation, variant, size, samples):
+    """One result row; latencies in microseconds, None when there are no samples"""
+    micros = sorted(sample / 1000 for sample in samples)
+    if not micros:
+        row = {"operation": operation, "variant": variant, "size": size, "samples": 0, "mean_us": None}
+        row.update({f"p{percentile}_us": None for percentile in PERCENTILES})
+        row.update(max_us=None, curve_us=[])
+        return row
+    quantiles = statistics.quantiles(micros, n=100, method="inclusive") if len(micros) > 1 else micros * 99
+    row = {"operation": operation, "variant": variant, "size": size, "samples": len(micros),
+           "mean_us": statistics.fmean(micros)}
+    for percentile in PERCENTILES:
+        row[f"p{percentile}_us"] = quantiles[percentile - 1]
+    row["max_us"] = micros[-1]
+    # Full percentile curve, used for the plots and kept in the JSON output
+    row["curve_us"] = quantiles + [micros[-1]]
+    return row
+
+# Measure every operation, with and without the chain, for one dataset size
+def run_size(path, size, args):
+    results = []
+    readings = frame_readings(sensor_loader.read_diabetes(path, cache=False), args.patients)
+
+    # load: CSV into a DataFrame, and CSV all the way into a chain
+    def load_plain():
+        return sensor_loader.read_diabetes(path, cache=False)
+
+    def load_chain():
+        chain = Blockchain()
+        for reading in frame_readings(sensor_loader.read_diabetes(path, cache=False), args.patients):
+            chain.add_block(reading)
+        return chain
+
+    results.append(summarize("load", "plain", size, time_repeated(load_plain, args.repeats)))
+    results.append(summarize("load", "chain", size, time_repeated(load_chain, args.repeats)))
+
+    # append: one reading into a list (and per-patient dict) vs one block into the chain
+    plain_rows = []
+    plain_index = {}
+
+    def append_plain(reading):
+        plain_rows.append(reading)
+        plain_index.setdefault(reading["patient_id"], []).append(reading)
+
+    blockchain = Blockchain()
+    results.append(summarize("append", "plain", size, time_each(append_plain, readings)))
+    results.append(summarize("append", "chain", size, time_each(blockchain.add_block, readings)))
+
+    # hash: recomputing one block's hash, the unit of work behind append and verify
+    results.append(summarize("hash", "chain", size, time_each(lambda block: block.calculate_hash(),
+                                                              blockchain.chain)))
+
+    # verify: a full audit of every block, and the incremental check after one append
+    results.append(summarize("verify_full", "chain", size,
+                             time_repeated(lambda: blockchain.verify_chain(full=True), args.repeats)))
+    incremental = []
+    for reading in readings[:args.queries]:
+        blockchain.add_block(reading)
+        start = time.perf_counter_ns()
+        blockchain.verify_chain()
+        incremental.append(time.perf_counter_ns() - start)
+    results.append(summarize("verify_incremental", "chain", size, incremental))
+
+    # query: all readings of one patient (the chain indexes blocks as they are appended)
+    rng = random.Random(size)
+    patient_ids = [f"P{str(rng.randrange(args.patients) + 1).zfill(3)}" for _ in range(args.queries)]
+    results.append(summarize("query", "plain", size, time_each(lambda patient: plain_index.get(patient, []),
+                                                               patient_ids)))
+    results.append(summarize("query", "chain", size, time_each(blockchain.blocks_for_patient, patient_ids)))
+    return results
+
+def write_results(results, args, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, "latency.json")
+    with open(json_path, "w") as f:
+        json.dump({"parameters": vars(args), "results": results}, f, indent=2)
+    csv_path = os.path.join(output_dir, "latency.csv")
+    columns = [column for column in results[0] if column != "curve_us"]
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    return json_path, csv_path
+
+# Percentile curves, one panel per operation; matplotlib is only needed here
+def plot_results(results, output_dir):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, skipping plots")
+        return None
+    operations = list(dict.fromkeys(row["operation"] for row in results))
+    figure, axes = plt.subplots(len(operations), 1, figsize=(9, 3 * len(operations)), squeeze=False)
+    x = list(range(1, 100)) + [100]
+    for axis, operation in zip(axes[:, 0], operations):
+        for row in results:
+            if row["operation"] == operation and row["curve_us"]:
+                axis.plot(x, row["curve_us"], label=f"{row['variant']}, n={row['size']:,}")
+        axis.set_title(operation)
+        axis.set_xlabel("percentile")
+        axis.set_ylabel("latency (µs)")
+        axis.set_yscale("log")
+        if axis.lines:
+            axis.legend(fontsize="small")
+    figure.tight_layout()
+    plot_path = os.path.join(output_dir, "latency_percentiles.png")
+    figure.savefig(plot_path)
+    plt.close(figure)
+    return plot_path
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Per-operation latency with and without the blockchain layer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="dataset rows")
+    parser.add_argument("--patients", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5, help="runs of the whole-dataset operations")
+    parser.add_argument("--queries", type=int, default=1000, help="patient queries and incremental verifies")
+    parser.add_argument("--output-dir", default="latency_results")
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = write_dataset(directory, size)
+            results.extend(run_size(path, size, args))
+
+    print(f"{'operation':<20}{'variant':<8}{'size':>9}{'p50 µs':>12}{'p99 µs':>12}{'max µs':>12}")
+    for row in results:
+        if not row["samples"]:
+            print(f"{row['operation']:<20}{row['variant']:<8}{row['size']:>9,}{'no samples':>12}")
+            continue
+        print(f"{row['operation']:<20}{row['variant']:<8}{row['size']:>9,}"
+              f"{row['p50_us']:>12.1f}{row['p99_us']:>12.1f}{row['max_us']:>12.1f}")
+    for path in (*write_results(results, args, args.output_dir),
+                 None if args.no_plot else plot_results(results, args.output_dir)):
+        if path:
+            print(f"wrote {path}")
+
+if __name__ == "__main__":
+    main()
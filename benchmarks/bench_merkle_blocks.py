@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import merkle
+from blockchain import Blockchain
+
+# Synthetic rows shaped like diabetes.csv
+def synthetic_rows(num_rows, seed=0):
+    rng = random.Random(seed)
+    return [{
+        "Pregnancies": rng.randint(0, 12),
+        "Glucose": rng.randint(50, 200),
+        "BloodPressure": rng.randint(40, 110),
+        "SkinThickness": rng.randint(0, 60),
+        "Insulin": rng.randint(0, 400),
+        "BMI": round(rng.uniform(18, 45), 1),
+        "DiabetesPedigreeFunction": round(rng.uniform(0.05, 2.4), 3),
+        "Age": rng.randint(21, 81),
+        "Outcome": rng.randint(0, 1)
+    } for _ in range(num_rows)]
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Per-row blocks vs Merkle batch blocks")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--proofs", type=int, default=10_000)
+    args = parser.parse_args()
+    rows = synthetic_rows(args.rows)
+
+    # One block per row, as in 8.py
+    blockchain = Blockchain()
+    start = time.perf_counter()
+    for row in rows:
+        blockchain.add_block(row)
+    append_time = time.perf_counter() - start
+    start = time.perf_counter()
+    blockchain.verify_chain(full=True)
+    verify_time = time.perf_counter() - start
+    print(f"per-row:      {args.rows / append_time:>12,.0f} rows/sec appended  "
+          f"{len(blockchain.chain):>8,} headers  header verify {verify_time:.3f}s")
+
+    for batch_size in args.batch_sizes:
+        blockchain = merkle.MerkleBlockchain()
+        start = time.perf_counter()
+        for offset in range(0, len(rows), batch_size):
+            blockchain.add_batch(rows[offset:offset + batch_size])
+        append_time = time.perf_counter() - start
+        start = time.perf_counter()
+        blockchain.verify_chain(full=True)
+        verify_time = time.perf_counter() - start
+
+        block = blockchain.chain[1]
+        tree = block.merkle_tree()
+        positions = [random.randrange(len(block.sensor_data)) for _ in range(args.proofs)]
+        proofs = [tree.proof(position) for position in positions]
+        latencies = []
+        for position, proof in zip(positions, proofs):
+            start = time.perf_counter_ns()
+            merkle.verify_proof(block.sensor_data[position], proof, block.merkle_root)
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+        print(f"merkle {batch_size:>6}: {args.rows / append_time:>12,.0f} rows/sec appended  "
+              f"{len(blockchain.chain):>8,} headers  header verify {verify_time:.3f}s  "
+              f"proof verify p50={statistics.median(latencies):.1f} us ({len(proofs[0])} hashes)")
+
+if __name__ == "__main__":
+    main()
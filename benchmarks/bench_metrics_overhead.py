@@ -0,0 +1,50 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics are switched on at import time, so each setting runs in its own interpreter
+WORKLOAD = """
+import sys, time
+sys.path.insert(0, {root!r})
+import metrics
+from blockchain import Blockchain
+metrics.enable_profiling()
+blockchain = Blockchain()
+start = time.perf_counter()
+for i in range({blocks}):
+    blockchain.add_block({{"heart_rate": 60 + i % 60, "glucose": 80 + i % 120}})
+blockchain.verify_chain(full=True)
+print({blocks} / (time.perf_counter() - start))
+"""
+
+def run(blocks, environment):
+    env = dict(os.environ, **environment)
+    output = subprocess.run([sys.executable, "-c", WORKLOAD.format(root=ROOT, blocks=blocks)], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="add_block + verify throughput with metrics off and on")
+    parser.add_argument("--blocks", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings = (
+            ("metrics off", {"SENSOR_METRICS": "0"}),
+            ("metrics on", {"SENSOR_METRICS": "1", "SENSOR_METRICS_FILE": os.path.join(directory, "m.json")}),
+            ("metrics on + cProfile", {"SENSOR_METRICS": "1", "SENSOR_METRICS_FILE": os.path.join(directory, "m.prom"),
+                                       "SENSOR_PROFILE": "cprofile",
+                                       "SENSOR_PROFILE_FILE": os.path.join(directory, "run.prof")})
+        )
+        for name, environment in settings:
+            best = max(run(args.blocks, environment) for _ in range(args.runs))
+            print(f"{name:<24} {best:12,.0f} blocks/sec (best of {args.runs})")
+
+if __name__ == "__main__":
+    main()
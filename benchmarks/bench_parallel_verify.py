@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+
+# Build a chain of synthetic heart rate / glucose readings
+def build_chain(num_blocks):
+    blockchain = Blockchain()
+    for i in range(num_blocks):
+        blockchain.add_block({"heart_rate": 60 + i % 40, "glucose": 80 + i % 120})
+    return blockchain
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Full-audit verification time vs worker count")
+    parser.add_argument("--blocks", type=int, default=1_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"Building {args.blocks:,} synthetic blocks...")
+    blockchain = build_chain(args.blocks)
+
+    worker_counts = sorted({1, *(2 ** k for k in range(1, args.max_workers.bit_length())), args.max_workers})
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        is_valid = blockchain.verify_chain(full=True, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"workers={workers:<3} valid={is_valid} time={elapsed:.2f}s "
+              f"blocks/sec={args.blocks / elapsed:,.0f} speedup={baseline / elapsed:.2f}x")
+
+if __name__ == "__main__":
+    main()
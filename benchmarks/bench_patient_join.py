@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import patient_registry
+
+# Previous approach: f-string ids in both loaders, then pd.merge on the strings
+def merge_on_string_ids(glucose, heart_rates):
+    glucose_data = pd.DataFrame({"Glucose": glucose})
+    glucose_data["patient_id"] = [f"P{str(i+1).zfill(3)}" for i in range(len(glucose_data))]
+    heart_rate_data = pd.DataFrame({"Heart_Rate": heart_rates})
+    heart_rate_data["patient_id"] = [f"P{str(i+1).zfill(3)}" for i in range(len(heart_rate_data))]
+    return pd.merge(glucose_data[["patient_id", "Glucose"]], heart_rate_data[["patient_id", "Heart_Rate"]],
+                    on="patient_id")
+
+# Integer codes and a direct indexed join
+def join_on_codes(glucose, heart_rates):
+    glucose_data = pd.DataFrame({"Glucose": glucose, "patient_code": patient_registry.positional_codes(len(glucose))})
+    heart_rate_data = pd.DataFrame({"Heart_Rate": heart_rates,
+                                    "patient_code": patient_registry.positional_codes(len(heart_rates))})
+    return patient_registry.join_by_code(glucose_data, heart_rate_data, ["Glucose"], ["Heart_Rate"])
+
+# Same join over chunked inputs
+def stream_join_on_codes(glucose, heart_rates, chunk_rows):
+    def chunks(name, values):
+        for start in range(0, len(values), chunk_rows):
+            part = values[start:start + chunk_rows]
+            yield pd.DataFrame({name: part, "patient_code": patient_registry.positional_codes(len(part), start)})
+    total = 0
+    for joined in patient_registry.iter_join_by_code(chunks("Glucose", glucose), chunks("Heart_Rate", heart_rates),
+                                                     ["Glucose"], ["Heart_Rate"]):
+        total += len(joined)
+    return total
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="String-id merge vs integer-code join")
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    glucose = rng.integers(50, 200, args.patients)
+    heart_rates = rng.integers(50, 150, args.patients)
+
+    for name, run in (
+        ("f-string ids + pd.merge", lambda: len(merge_on_string_ids(glucose, heart_rates))),
+        ("codes + join_by_code", lambda: len(join_on_codes(glucose, heart_rates))),
+        ("codes + iter_join_by_code", lambda: stream_join_on_codes(glucose, heart_rates, args.chunk_rows)),
+    ):
+        start = time.perf_counter()
+        rows = run()
+        print(f"{name:<26} {rows:,} rows in {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main()
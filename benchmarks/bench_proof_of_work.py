@@ -0,0 +1,39 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+from proof_of_work import MinedBlockchain
+
+def blocks_per_second(blockchain, blocks):
+    start = time.perf_counter()
+    for i in range(blocks):
+        blockchain.add_block({"heart_rate": 60 + i % 60, "glucose": 80 + i % 120})
+    return blocks / (time.perf_counter() - start)
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Append throughput vs proof-of-work difficulty and cores")
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[0, 8, 12, 16, 20])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=2.0, help="rough time budget per configuration")
+    args = parser.parse_args()
+    print(f"{os.cpu_count()} CPUs")
+
+    print(f"plain Blockchain:           {blocks_per_second(Blockchain(), 100_000):12,.1f} blocks/sec")
+    for difficulty in args.difficulties:
+        for workers in args.workers if difficulty >= MinedBlockchain.parallel_difficulty else [1]:
+            blockchain = MinedBlockchain(difficulty=difficulty, workers=workers)
+            # Expected tries per block is 2**difficulty; size the run to the time budget
+            blocks = max(3, min(100_000, int(args.seconds * 300_000 / 2 ** difficulty)))
+            rate = blocks_per_second(blockchain, blocks)
+            valid = blockchain.verify_chain() and blockchain.verify_work()
+            blockchain.close()
+            print(f"difficulty {difficulty:2d}, {workers} worker(s): {rate:12,.1f} blocks/sec  "
+                  f"({blocks} blocks, valid: {valid})")
+
+if __name__ == "__main__":
+    main()
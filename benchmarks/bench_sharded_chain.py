@@ -0,0 +1,62 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sensor_loader
+from blockchain import Blockchain
+from sharded_chain import ShardedBlockchain
+
+# Diabetes rows as readings, spread over patients as in CMB_1OMT_4.py
+def diabetes_readings(path, rows, patients):
+    if path:
+        frame = sensor_loader.read_diabetes(path)
+        columns = [str(column) for column in frame.columns]
+        records = [dict(zip(columns, values)) for values in frame.to_numpy().tolist()]
+    else:
+        records = [{"Glucose": random.randint(70, 200), "BloodPressure": random.randint(50, 100),
+                    "BMI": round(random.uniform(18, 45), 1), "Age": random.randint(21, 80)}
+                   for _ in range(min(rows, 768))]
+    readings = []
+    for i in range(rows):
+        reading = dict(records[i % len(records)])
+        reading["patient_id"] = f"P{str(i % patients + 1).zfill(3)}"
+        readings.append(reading)
+    return readings
+
+# Main function
+def main():
+    parser = argparse.ArgumentParser(description="Append throughput of sharded chains")
+    parser.add_argument("--diabetes", help="diabetes CSV (default: synthetic rows with its columns)")
+    parser.add_argument("--rows", type=int, default=500_000, help="readings, cycling through the dataset")
+    parser.add_argument("--patients", type=int, default=1000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--anchor-interval", type=int, default=10000)
+    args = parser.parse_args()
+    readings = diabetes_readings(args.diabetes, args.rows, args.patients)
+    print(f"{len(readings):,} readings, {os.cpu_count()} CPUs")
+
+    blockchain = Blockchain()
+    start = time.perf_counter()
+    for reading in readings:
+        blockchain.add_block(reading)
+    elapsed = time.perf_counter() - start
+    print(f"single chain, in process: {len(readings) / elapsed:10,.0f} blocks/sec")
+
+    for shards in args.shards:
+        sharded = ShardedBlockchain(shards, anchor_interval=args.anchor_interval)
+        start = time.perf_counter()
+        for reading in readings:
+            sharded.add_block(reading)
+        sharded.heads()  # Wait until every shard has appended everything
+        elapsed = time.perf_counter() - start
+        valid = sharded.verify_chain()
+        sharded.close()
+        print(f"{shards} shard(s):                {len(readings) / elapsed:10,.0f} blocks/sec  "
+              f"(anchors: {len(sharded.anchor_chain.chain) - 1}, valid: {valid})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,797 @@
+import bisect
+import hashlib
+import hmac
+import json
+import mmap
+import os
+import struct
+import time
+import warnings
+from array import array
+
+import metrics
+
+_fork_chain = None  # Chain inherited by forked verification workers
+
+# Hash preimage formats: the original f-string and the versioned binary layout
+HASH_FORMAT_LEGACY = 0
+HASH_FORMAT_V1 = 1
+
+# V1 header: version, index, timestamp, raw previous hash, payload length
+_V1_HEADER = struct.Struct(">BQd32sI")
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+def _digest_bytes(hex_hash):
+    """Raw 32-byte form of a hex hash (the genesis "0" becomes all zeros)"""
+    return bytes.fromhex(hex_hash.rjust(64, "0"))
+
+# Block class with SHA-256 hashing
+class Block:
+    __slots__ = ("index", "previous_hash", "timestamp", "sensor_data", "hash_format", "current_hash")
+
+    def __init__(self, index, previous_hash, timestamp, sensor_data, hash_format=HASH_FORMAT_V1):
+        self.index = index
+        self.previous_hash = previous_hash
+        self.timestamp = timestamp
+        self.sensor_data = sensor_data  # Dictionary: heart rate and glucose
+        self.hash_format = hash_format
+        self.current_hash = self.calculate_hash()
+
+    def legacy_preimage(self):
+        """Original preimage: fields concatenated into one string"""
+        return f"{self.index}{self.previous_hash}{self.timestamp}{json.dumps(self.sensor_data)}".encode()
+
+    def canonical_payload(self):
+        """Sensor data as compact JSON with sorted keys"""
+        return _CANONICAL_JSON.encode(self.sensor_data).encode()
+
+    def binary_preimage(self):
+        """Fixed-layout preimage: packed header followed by the length-prefixed payload"""
+        payload = self.canonical_payload()
+        header = _V1_HEADER.pack(self.hash_format, self.index, self.timestamp,
+                                 _digest_bytes(self.previous_hash), len(payload))
+        return header + payload
+
+    @metrics.timed("block_calculate_hash")
+    def calculate_hash(self):
+        """Calculate SHA-256 hash of the block for security and integrity"""
+        if self.hash_format == HASH_FORMAT_V1:
+            return hashlib.sha256(self.binary_preimage()).hexdigest()
+        if self.hash_format == HASH_FORMAT_LEGACY:
+            return hashlib.sha256(self.legacy_preimage()).hexdigest()
+        raise ValueError(f"Unknown hash format: {self.hash_format}")
+
+def _extra_slot_names(block_class):
+    """Slots a Block subclass adds on top of the core block fields"""
+    return tuple(
+        name for cls in reversed(block_class.__mro__) if cls is not Block
+        for name in cls.__dict__.get("__slots__", ())
+    )
+
+# Sensor data of a CompactChain view; the values are rebuilt from the columns, so edits are refused
+class _FrozenSensorData(dict):
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Sensor data read from a CompactChain is read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+def _restore_block(block_class, state):
+    """Unpickle a CompactChain view as a plain block"""
+    block = object.__new__(block_class)
+    for name, value in state:
+        setattr(block, name, value)
+    return block
+
+# Block views of a CompactChain refuse changes that could never be stored back
+class _ReadOnlyBlock:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Blocks read from a CompactChain are read-only (cannot set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Blocks read from a CompactChain are read-only (cannot delete {name!r})")
+
+    def __reduce__(self):
+        block_class = type(self).__bases__[1]
+        names = Block.__slots__ + _extra_slot_names(block_class)
+        return _restore_block, (block_class, [(name, getattr(self, name)) for name in names])
+
+_read_only_classes = {}
+
+def _read_only_class(block_class):
+    view_class = _read_only_classes.get(block_class)
+    if view_class is None:
+        view_class = _read_only_classes[block_class] = type(block_class.__name__, (_ReadOnlyBlock, block_class),
+                                                            {"__slots__": (), "__module__": block_class.__module__})
+    return view_class
+
+# Column-oriented, append-only storage for long chains
+class CompactChain:
+    """Sequence of blocks kept as packed columns instead of Block objects
+
+    Hashes are stored as raw 32-byte digests in one bytearray, timestamps
+    and the numeric sensor `fields` in typed arrays, and previous_hash is
+    read from the neighbouring digest. Payloads with other keys or
+    non-numeric values are kept as they are (with a warning the first
+    time). Without fields, the first dictionary payload defines them.
+    Indexing rebuilds a read-only Block view from the columns.
+    """
+
+    def __init__(self, block_class=Block, fields=None):
+        self.block_class = block_class
+        self._view_class = _read_only_class(block_class)
+        self._extra_fields = _extra_slot_names(block_class)
+        self._indexes = array("q")
+        self._timestamps = array("d")
+        self._formats = bytearray()
+        self._hashes = bytearray()
+        self._previous_overrides = {}  # Position -> previous_hash not derivable from the neighbour
+        self._fields = tuple(fields) if fields is not None else None  # Sensor fields stored in typed columns
+        self._columns = [array("d") for _ in self._fields] if fields is not None else []
+        self._int_masks = array("Q")  # Bit k set: field k was an int, not a float
+        self._overflow = {}  # Position -> sensor data that does not fit the columns
+        self._warned = False
+        self._extras = [[] for _ in self._extra_fields]
+
+    @property
+    def fields(self):
+        """Sensor fields stored as columns (None until known)"""
+        return self._fields
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._view(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._view(i) for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("chain index out of range")
+        return self._view(key)
+
+    def _digest_hex(self, i):
+        return self._hashes[32 * i:32 * i + 32].hex()
+
+    def _column_values(self, sensor_data):
+        """Sensor values in column order plus an int-type bitmask, or None if they do not fit"""
+        if not isinstance(sensor_data, dict) or len(sensor_data) > 64:
+            return None
+        if self._fields is None:
+            self._fields = tuple(sensor_data)
+            self._columns = [array("d", [0.0] * len(self)) for _ in self._fields]
+        if tuple(sensor_data) != self._fields:
+            return None
+        values = list(sensor_data.values())
+        int_mask = 0
+        for bit, value in enumerate(values):
+            if type(value) is int and -2 ** 53 <= value <= 2 ** 53:
+                int_mask |= 1 << bit
+            elif not isinstance(value, float):
+                return None
+        return values, int_mask
+
+    def append(self, block):
+        position = len(self)
+        packed = self._column_values(block.sensor_data)
+        self._indexes.append(block.index)
+        self._timestamps.append(block.timestamp)
+        self._formats.append(block.hash_format)
+        if position == 0 or block.previous_hash != self._digest_hex(position - 1):
+            self._previous_overrides[position] = block.previous_hash
+        self._hashes += bytes.fromhex(block.current_hash)
+        if packed is None:
+            if position and not self._warned:
+                # The genesis block may hold placeholder data; later misfits lose the compact layout
+                warnings.warn(f"Block {block.index} does not fit the compact columns {self._fields}; "
+                              "it and any later misfits are stored unpacked", RuntimeWarning, stacklevel=3)
+                self._warned = True
+            self._overflow[position] = block.sensor_data
+            packed = [0.0] * len(self._columns), 0
+        values, int_mask = packed
+        for value, column in zip(values, self._columns):
+            column.append(value)
+        self._int_masks.append(int_mask)
+        for name, extra in zip(self._extra_fields, self._extras):
+            extra.append(getattr(block, name))
+
+    def extend(self, blocks):
+        for block in blocks:
+            self.append(block)
+
+    def _view(self, i):
+        block = object.__new__(self.block_class)
+        block.index = self._indexes[i]
+        if i in self._previous_overrides:
+            block.previous_hash = self._previous_overrides[i]
+        else:
+            block.previous_hash = self._digest_hex(i - 1)
+        block.timestamp = self._timestamps[i]
+        if i in self._overflow:
+            # Stored as appended; editing it changes the chain, which verify_chain() will report
+            block.sensor_data = self._overflow[i]
+        else:
+            int_mask = self._int_masks[i]
+            block.sensor_data = _FrozenSensorData({
+                field: int(column[i]) if int_mask >> bit & 1 else column[i]
+                for bit, (field, column) in enumerate(zip(self._fields, self._columns))
+            })
+        block.hash_format = self._formats[i]
+        block.current_hash = self._digest_hex(i)
+        for name, extra in zip(self._extra_fields, self._extras):
+            setattr(block, name, extra[i])
+        block.__class__ = self._view_class  # Same layout; from here on the view refuses changes
+        return block
+
+def _check_json_native(value, name):
+    """Raise ValueError unless value comes back unchanged from JSON (so a reloaded block hashes the same)"""
+    if value is None or isinstance(value, (str, int, float)):
+        return
+    if isinstance(value, list):
+        for item in value:
+            _check_json_native(item, name)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise ValueError(f"{name} has the non-string key {key!r}, which JSON would turn into a string")
+            _check_json_native(item, name)
+    else:
+        raise ValueError(f"{name} holds a {type(value).__name__}, which JSON cannot store as such")
+
+# Append-only on-disk storage: fixed-size block headers plus a payload log
+class DiskChain:
+    """Sequence of blocks persisted in two append-only files
+
+    "<path>.blocks" holds one fixed-size header per block (index,
+    timestamp, hash format, raw previous/current digests and the payload
+    location) and "<path>.payload" holds the JSON-encoded sensor data.
+    Appended blocks are written and fsynced in batches of sync_every;
+    reads go through mmap, so reopening a chain does not load it.
+    Payloads must be JSON-native (dicts with string keys, lists, strings,
+    numbers, booleans, None); append() rejects anything else. Use it as a
+    context manager, or call close(), so the last batch is written.
+    "<path>.verified" keeps the owning Blockchain's signed verification
+    state.
+    """
+
+    MAGIC = b"BCHAIN01"
+    RECORD = struct.Struct(">qdBB32s32sQI")  # index, timestamp, format, flags, prev, hash, offset, length
+    GENESIS_PREVIOUS = 1  # Flag: previous_hash is the genesis placeholder "0"
+
+    def __init__(self, path, block_class=Block, sync_every=1000):
+        self.path = path
+        self.block_class = block_class
+        self.sync_every = sync_every
+        self.closed = False
+        self._extra_fields = _extra_slot_names(block_class)
+        self._pending = []  # Blocks appended since the last sync
+        self._header_map = None
+        self._payload_map = None
+        header_path, payload_path = path + ".blocks", path + ".payload"
+        if not os.path.exists(header_path):
+            with open(header_path, "wb") as f:
+                f.write(self.MAGIC)
+            open(payload_path, "wb").close()
+        self._header_file = open(header_path, "r+b")
+        self._payload_file = open(payload_path, "r+b")
+        if self._header_file.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError(f"{header_path} is not a blockchain log")
+        # Drop a partially written record left by a crash
+        size = os.fstat(self._header_file.fileno()).st_size - len(self.MAGIC)
+        self._stored = size // self.RECORD.size
+        self._header_file.truncate(len(self.MAGIC) + self._stored * self.RECORD.size)
+        self._payload_end = 0
+        if self._stored:
+            self._header_file.seek(len(self.MAGIC) + (self._stored - 1) * self.RECORD.size)
+            *_, offset, length = self.RECORD.unpack(self._header_file.read(self.RECORD.size))
+            self._payload_end = offset + length
+        self._payload_file.truncate(self._payload_end)
+
+    def __len__(self):
+        return self._stored + len(self._pending)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("chain index out of range")
+        if key >= self._stored:
+            return self._pending[key - self._stored]
+        return self._view(key)
+
+    def _maps(self):
+        if self._header_map is None:
+            self._header_map = mmap.mmap(self._header_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._payload_map is None and self._payload_end:
+            self._payload_map = mmap.mmap(self._payload_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._header_map, self._payload_map
+
+    def _record(self, i):
+        header_map, _ = self._maps()
+        return self.RECORD.unpack_from(header_map, len(self.MAGIC) + i * self.RECORD.size)
+
+    def _view(self, i):
+        index, timestamp, hash_format, flags, previous, current, offset, length = self._record(i)
+        _, payload_map = self._maps()
+        sensor_data, *extras = json.loads(payload_map[offset:offset + length])
+        block = object.__new__(self.block_class)
+        block.index = index
+        block.previous_hash = "0" if flags & self.GENESIS_PREVIOUS else previous.hex()
+        block.timestamp = timestamp
+        block.sensor_data = sensor_data
+        block.hash_format = hash_format
+        block.current_hash = current.hex()
+        for name, value in zip(self._extra_fields, extras):
+            setattr(block, name, value)
+        return block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        # Last resort for a chain that was never closed: write its pending blocks
+        if not getattr(self, "closed", True):
+            self.close()
+
+    def append(self, block):
+        _check_json_native(block.sensor_data, f"Block {block.index} sensor data")
+        for name in self._extra_fields:
+            _check_json_native(getattr(block, name), f"Block {block.index} {name}")
+        self._pending.append(block)
+        if len(self._pending) >= self.sync_every:
+            self.flush()
+
+    def extend(self, blocks):
+        for block in blocks:
+            self.append(block)
+
+    def hash_at(self, i):
+        """current_hash of block i, read from its header without parsing the payload"""
+        if i >= self._stored:
+            return self._pending[i - self._stored].current_hash
+        return self._record(i)[5].hex()
+
+    def flush(self):
+        """Write pending blocks to disk and fsync both files"""
+        if not self._pending:
+            return
+        headers = bytearray()
+        payloads = bytearray()
+        for block in self._pending:
+            payload = json.dumps([block.sensor_data, *(getattr(block, name) for name in self._extra_fields)]).encode()
+            flags = self.GENESIS_PREVIOUS if block.previous_hash == "0" else 0
+            headers += self.RECORD.pack(block.index, block.timestamp, block.hash_format, flags,
+                                        _digest_bytes(block.previous_hash), bytes.fromhex(block.current_hash),
+                                        self._payload_end + len(payloads), len(payload))
+            payloads += payload
+        # Payloads first, so a header never points past the end of the payload file
+        self._payload_file.seek(self._payload_end)
+        self._payload_file.write(payloads)
+        self._payload_file.flush()
+        os.fsync(self._payload_file.fileno())
+        self._header_file.seek(len(self.MAGIC) + self._stored * self.RECORD.size)
+        self._header_file.write(headers)
+        self._header_file.flush()
+        os.fsync(self._header_file.fileno())
+        self._payload_end += len(payloads)
+        self._stored += len(self._pending)
+        self._pending = []
+        self._close_maps()
+
+    def _close_maps(self):
+        for mapping in (self._header_map, self._payload_map):
+            if mapping is not None:
+                mapping.close()
+        self._header_map = self._payload_map = None
+
+    def read_state(self):
+        """Verification state saved with write_state(), or None"""
+        try:
+            with open(self.path + ".verified") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_state(self, state):
+        """Flush the blocks the state refers to, then replace the saved state atomically"""
+        self.flush()
+        temp_path = self.path + ".verified.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path + ".verified")
+
+    def close(self):
+        """Flush pending blocks and close the files"""
+        if self.closed:
+            return
+        self.flush()
+        self._close_maps()
+        self._header_file.close()
+        self._payload_file.close()
+        self.closed = True
+
+# Worker: index of the first block in a range whose stored hash is stale
+def _first_stale_hash(task):
+    start, stop, blocks = task
+    if blocks is None:
+        blocks = _fork_chain[start:stop]
+    for offset, block in enumerate(blocks):
+        if block.current_hash != block.calculate_hash():
+            return start + offset
+    return None
+
+# Block positions sorted by timestamp, kept in two parallel arrays
+class _TimeIndex:
+    __slots__ = ("timestamps", "positions")
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.positions = array("q")
+
+    def add(self, timestamp, position):
+        """Append in the usual in-order case, fall back to a sorted insert"""
+        if not self.timestamps or self.timestamps[-1] <= timestamp:
+            self.timestamps.append(timestamp)
+            self.positions.append(position)
+        else:
+            at = bisect.bisect_right(self.timestamps, timestamp)
+            self.timestamps.insert(at, timestamp)
+            self.positions.insert(at, position)
+
+    def between(self, since, until):
+        """Positions with since <= timestamp <= until, in timestamp order"""
+        low = 0 if since is None else bisect.bisect_left(self.timestamps, since)
+        high = len(self.timestamps) if until is None else bisect.bisect_right(self.timestamps, until)
+        return self.positions[low:high]
+
+# Signed record of a verified block hash
+class Checkpoint:
+    def __init__(self, index, block_hash, signature):
+        self.index = index
+        self.block_hash = block_hash
+        self.signature = signature
+
+# Blockchain class
+class Blockchain:
+    block_class = Block
+    genesis_data = {"heart_rate": 0, "glucose": 0}
+    payload_label = "Sensor Data"
+    hash_mismatch_message = "Integrity check failed at Block {index}: Hash mismatch"
+    link_mismatch_message = "Integrity check failed at Block {index}: Previous hash mismatch"
+    checkpoint_mismatch_message = "Integrity check failed at checkpoint {index}: Signature mismatch"
+
+    def __init__(self, checkpoint_interval=1000, checkpoint_key=None, hash_format=HASH_FORMAT_V1,
+                 compact=False, compact_fields=None, path=None, sync_every=1000):
+        self.hash_format = hash_format
+        if path is not None:
+            # Reopening an existing log keeps its blocks, genesis included
+            self.chain = DiskChain(path, self.block_class, sync_every)
+        elif compact:
+            # Readings have the fields of the genesis data unless the caller names them
+            if compact_fields is None and isinstance(self.genesis_data, dict):
+                compact_fields = tuple(self.genesis_data)
+            self.chain = CompactChain(self.block_class, compact_fields)
+        else:
+            self.chain = []
+        if len(self.chain) == 0:
+            self.chain.append(self.create_genesis_block())
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_key = checkpoint_key if checkpoint_key is not None else os.urandom(32)
+        self.checkpoints = []
+        self.verified_upto = 0  # Index of the last block known to be valid
+        self._verified_hash = self._hash_at(0)
+        if isinstance(self.chain, DiskChain):
+            self._restore_verified()
+        self._reset_indexes()
+        if len(self.chain) == 1:
+            self._catch_up_indexes()  # A new chain: index as blocks are appended from the start
+
+    def create_genesis_block(self):
+        """Create the Genesis block with initial dummy data"""
+        timestamp = time.time()
+        return self.block_class(0, "0", timestamp, dict(self.genesis_data), hash_format=self.hash_format)
+
+    @metrics.timed("blockchain_add_block")
+    def add_block(self, sensor_data):
+        """Add a new block with SHA-256 hashed data"""
+        previous_block = self.chain[-1]
+        index = len(self.chain)
+        timestamp = time.time()
+        return self._append(self._new_block(index, previous_block.current_hash, timestamp, sensor_data))
+
+    def _new_block(self, index, previous_hash, timestamp, sensor_data):
+        """Build the next block; subclasses that store extra header fields override this"""
+        return self.block_class(index, previous_hash, timestamp, sensor_data, hash_format=self.hash_format)
+
+    def _append(self, new_block):
+        """Append a block that is already linked and hashed, indexing it if the indexes are current"""
+        self.chain.append(new_block)
+        if self._indexed_upto == len(self.chain) - 1:
+            self._index_block(self._indexed_upto, new_block)
+            self._indexed_upto += 1
+        return new_block
+
+    def load_blocks(self, blocks, verified=False):
+        """Replace every block, e.g. with an import from chain_io
+
+        verified=True records the blocks as already checked (the import
+        rehashed them), so the next verify_chain() starts after them.
+        """
+        if isinstance(self.chain, DiskChain):
+            raise ValueError("Blocks cannot be loaded into an on-disk chain")
+        chain = CompactChain(self.block_class, self.chain.fields) if isinstance(self.chain, CompactChain) else []
+        chain.extend(blocks)
+        if len(chain) == 0:
+            raise ValueError("A chain needs at least its genesis block")
+        self.chain = chain
+        self.checkpoints = []
+        self.verified_upto = 0
+        self._verified_hash = chain[0].current_hash
+        self._reset_indexes()
+        if verified:
+            self._mark_verified(len(chain) - 1)
+
+    def close(self):
+        """Flush and close the on-disk log of a persistent chain"""
+        if isinstance(self.chain, DiskChain):
+            self.chain.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def patient_ids(self, block):
+        """Patient ids a block holds readings for (one reading, a list of them or an ingest batch)"""
+        data = block.sensor_data
+        if isinstance(data, dict) and isinstance(data.get("readings"), list):
+            data = data["readings"]
+        readings = data if isinstance(data, list) else [data]
+        return {reading["patient_id"] for reading in readings
+                if isinstance(reading, dict) and "patient_id" in reading}
+
+    def _index_block(self, position, block):
+        self._time_index.add(block.timestamp, position)
+        for patient_id in self.patient_ids(block):
+            index = self._patient_index.get(patient_id)
+            if index is None:
+                index = self._patient_index[patient_id] = _TimeIndex()
+            index.add(block.timestamp, position)
+
+    def _reset_indexes(self):
+        """Drop the indexes of a replaced or reopened chain; the next query rebuilds them
+
+        Reopening a DiskChain therefore reads no payloads, and once a query
+        has caught up, _append() keeps the indexes current.
+        """
+        self._time_index = _TimeIndex()  # Every block
+        self._patient_index = {}  # patient_id -> the blocks with readings for that patient
+        self._indexed_upto = 0  # Blocks before this position are indexed
+
+    def _catch_up_indexes(self):
+        for position in range(self._indexed_upto, len(self.chain)):
+            self._index_block(position, self.chain[position])
+        self._indexed_upto = len(self.chain)
+
+    def _blocks_in_range(self, index, since, until):
+        return [self.chain[position] for position in index.between(since, until)]
+
+    def blocks_for_patient(self, patient_id, since=None, until=None):
+        """Blocks with readings for patient_id and since <= timestamp <= until, in O(log n + k)"""
+        self._catch_up_indexes()
+        index = self._patient_index.get(patient_id)
+        return self._blocks_in_range(index, since, until) if index is not None else []
+
+    def blocks_between(self, since=None, until=None):
+        """Blocks with since <= timestamp <= until, in O(log n + k)"""
+        self._catch_up_indexes()
+        return self._blocks_in_range(self._time_index, since, until)
+
+    def print_chain(self, head=5, tail=5, start=None, stop=None):
+        """Display the blockchain with hashed data
+
+        Long chains are summarized: only the first head and last tail
+        blocks are printed, or the blocks in [start, stop) if given. Use
+        chain_io to export every block.
+        """
+        if start is not None or stop is not None:
+            ranges = [range(*slice(start, stop).indices(len(self.chain)))]
+        elif len(self.chain) <= head + tail:
+            ranges = [range(len(self.chain))]
+        else:
+            ranges = [range(head), range(len(self.chain) - tail, len(self.chain))]
+        for n, positions in enumerate(ranges):
+            if n:
+                print(f"... {positions.start - ranges[n - 1].stop:,} blocks not shown ...")
+            for block in self.chain[positions.start:positions.stop]:
+                print(json.dumps({
+                    "Index": block.index,
+                    "Previous Hash": block.previous_hash,
+                    "Timestamp": block.timestamp,
+                    self.payload_label: block.sensor_data,
+                    "Current Hash": block.current_hash
+                }, indent=4))
+        if len(self.chain) > sum(len(positions) for positions in ranges):
+            print(f"{len(self.chain):,} blocks in total")
+
+    def sign_checkpoint(self, index, block_hash):
+        """Sign a block hash with the chain's checkpoint key (HMAC-SHA256)"""
+        message = f"{index}:{block_hash}".encode()
+        return hmac.new(self.checkpoint_key, message, hashlib.sha256).hexdigest()
+
+    def _checkpoint_intact(self, checkpoint):
+        """Check a checkpoint's signature and that its block hash is unchanged"""
+        if checkpoint.index >= len(self.chain):
+            return False
+        expected = self.sign_checkpoint(checkpoint.index, checkpoint.block_hash)
+        return (hmac.compare_digest(expected, checkpoint.signature)
+                and self._hash_at(checkpoint.index) == checkpoint.block_hash)
+
+    def _resume_point(self):
+        """Index after which incremental verification can safely continue"""
+        if (self.verified_upto < len(self.chain)
+                and self._hash_at(self.verified_upto) == self._verified_hash):
+            return self.verified_upto
+        # The watermark no longer matches the chain: fall back to the newest intact checkpoint
+        for checkpoint in reversed(self.checkpoints):
+            if self._checkpoint_intact(checkpoint):
+                return checkpoint.index
+        return 0
+
+    def _mark_verified(self, index):
+        """Move the verified-up-to watermark and sign any checkpoints it passed"""
+        self.checkpoints = [c for c in self.checkpoints if c.index <= index]
+        self.verified_upto = index
+        self._verified_hash = self._hash_at(index)
+        if self.checkpoint_interval:
+            last = self.checkpoints[-1].index if self.checkpoints else 0
+            next_index = (last // self.checkpoint_interval + 1) * self.checkpoint_interval
+            while next_index <= index:
+                block_hash = self.chain[next_index].current_hash
+                self.checkpoints.append(Checkpoint(next_index, block_hash,
+                                                   self.sign_checkpoint(next_index, block_hash)))
+                next_index += self.checkpoint_interval
+        if isinstance(self.chain, DiskChain):
+            self._save_verified()
+
+    def _save_verified(self):
+        """Persist the watermark and checkpoints next to an on-disk chain"""
+        self.chain.write_state({
+            "verified_upto": self.verified_upto,
+            "block_hash": self._verified_hash,
+            "signature": self.sign_checkpoint(self.verified_upto, self._verified_hash),
+            "checkpoints": [[c.index, c.block_hash, c.signature] for c in self.checkpoints]
+        })
+
+    def _hash_at(self, i):
+        """current_hash of block i; a DiskChain reads only the block's header"""
+        if isinstance(self.chain, DiskChain):
+            return self.chain.hash_at(i)
+        return self.chain[i].current_hash
+
+    def _restore_verified(self):
+        """Resume from a reopened chain's saved state if it was signed with this chain's checkpoint key
+
+        With the default random key nothing saved can be trusted, so the
+        first verify_chain() rehashes every block.
+        """
+        state = self.chain.read_state()
+        if state is None:
+            return
+        index, block_hash = state["verified_upto"], state["block_hash"]
+        expected = self.sign_checkpoint(index, block_hash)
+        if hmac.compare_digest(expected, state["signature"]) and index < len(self.chain):
+            self.verified_upto = index
+            self._verified_hash = block_hash
+        self.checkpoints = [Checkpoint(*checkpoint) for checkpoint in state["checkpoints"]]
+        self.checkpoints = [c for c in self.checkpoints if self._checkpoint_intact(c)]
+
+    def _first_broken_link(self, start, stop):
+        """Index of the first block in [start, stop) not linked to its predecessor"""
+        for i in range(start, stop):
+            if self.chain[i].previous_hash != self.chain[i - 1].current_hash:
+                return i
+        return None
+
+    def _parallel_stale_hash(self, start, stop, workers):
+        """Recompute hashes of blocks [start, stop) in a process pool"""
+        global _fork_chain
+        # Imported here so that loading the core does not pay for the process pool machinery
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if start >= stop:
+            return None
+        size = -(-(stop - start) // (workers * 4))
+        bounds = [(s, min(s + size, stop)) for s in range(start, stop, size)]
+        if "fork" in multiprocessing.get_all_start_methods():
+            # Forked workers read the chain directly instead of unpickling it
+            context = multiprocessing.get_context("fork")
+            _fork_chain = self.chain
+            tasks = [(s, e, None) for s, e in bounds]
+        else:
+            context = multiprocessing.get_context()
+            tasks = [(s, e, self.chain[s:e]) for s, e in bounds]
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        try:
+            # Ranges come back in order, so the first hit is the lowest index
+            for result in executor.map(_first_stale_hash, tasks):
+                if result is not None:
+                    return result
+            return None
+        finally:
+            executor.shutdown(cancel_futures=True)
+            _fork_chain = None
+
+    @metrics.timed("blockchain_verify_chain")
+    def verify_chain(self, full=False, workers=None):
+        """Verify the integrity of the blockchain
+
+        Only blocks appended since the last successful check are rehashed
+        unless full=True, which rehashes every block and re-checks every
+        signed checkpoint (use it for audits). With workers > 1 the hashes
+        are recomputed in a process pool; the reported failure is the same
+        as the sequential check's.
+        """
+        if full:
+            for checkpoint in self.checkpoints:
+                if not self._checkpoint_intact(checkpoint):
+                    print(self.checkpoint_mismatch_message.format(index=checkpoint.index))
+                    return False
+            start = 0
+        else:
+            start = self._resume_point()
+        if workers is not None and workers > 1:
+            broken_link = self._first_broken_link(start + 1, len(self.chain))
+            stop = broken_link + 1 if broken_link is not None else len(self.chain)
+            stale_hash = self._parallel_stale_hash(start + 1, stop, workers)
+            if stale_hash is not None:
+                return self._fail(stale_hash, self.hash_mismatch_message)
+            if broken_link is not None:
+                return self._fail(broken_link, self.link_mismatch_message)
+            self._mark_verified(len(self.chain) - 1)
+            return True
+        for i in range(start + 1, len(self.chain)):
+            current_block = self.chain[i]
+            previous_block = self.chain[i - 1]
+            # Recalculate hash to check integrity
+            if current_block.current_hash != current_block.calculate_hash():
+                return self._fail(i, self.hash_mismatch_message)
+            if current_block.previous_hash != previous_block.current_hash:
+                return self._fail(i, self.link_mismatch_message)
+        self._mark_verified(len(self.chain) - 1)
+        return True
+
+    def _fail(self, i, message):
+        """Report a failed check at block i; everything before it is valid"""
+        print(message.format(index=self.chain[i].index))
+        metrics.increment("verify_failures")
+        self._mark_verified(i - 1)
+        return False
+
+    def is_chain_valid(self, full=False, workers=None):
+        """Verify the integrity of the blockchain (alias of verify_chain, which is what metrics time)"""
+        return self.verify_chain(full=full, workers=workers)
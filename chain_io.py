@@ -0,0 +1,141 @@
+import json
+import struct
+
+from blockchain import Block, _digest_bytes, _extra_slot_names
+
+# Export formats: newline-delimited JSON, or fixed headers with inline JSON payloads
+BINARY_MAGIC = b"BCHNEX01"
+BINARY_RECORD = struct.Struct(">qdBB32s32sI")  # index, timestamp, format, flags, prev, hash, payload length
+GENESIS_PREVIOUS = 1  # Flag: previous_hash is the genesis placeholder "0"
+BUFFER_SIZE = 1 << 20
+BATCH_BLOCKS = 4096  # Blocks encoded per write call
+
+_COMPACT_JSON = json.JSONEncoder(separators=(",", ":"))
+
+def _batched(chain, encode):
+    batch = []
+    for block in chain:
+        batch.append(encode(block))
+        if len(batch) == BATCH_BLOCKS:
+            yield b"".join(batch)
+            batch = []
+    if batch:
+        yield b"".join(batch)
+
+# Write every block as one JSON line
+def export_ndjson(chain, path):
+    """Export a chain (or a Blockchain) to newline-delimited JSON; return the number of blocks"""
+    chain = getattr(chain, "chain", chain)
+    extra_fields = _extra_slot_names(type(chain[0]))
+
+    def encode(block):
+        record = {
+            "index": block.index,
+            "previous_hash": block.previous_hash,
+            "timestamp": block.timestamp,
+            "sensor_data": block.sensor_data,
+            "hash_format": block.hash_format,
+            "current_hash": block.current_hash
+        }
+        for name in extra_fields:
+            record[name] = getattr(block, name)
+        return _COMPACT_JSON.encode(record).encode() + b"\n"
+
+    with open(path, "wb", buffering=BUFFER_SIZE) as f:
+        for data in _batched(chain, encode):
+            f.write(data)
+    return len(chain)
+
+# Write every block as a packed header followed by its JSON payload
+def export_binary(chain, path):
+    """Export a chain (or a Blockchain) to the compact binary format; return the number of blocks"""
+    chain = getattr(chain, "chain", chain)
+    extra_fields = _extra_slot_names(type(chain[0]))
+
+    def encode(block):
+        payload = _COMPACT_JSON.encode([block.sensor_data, *(getattr(block, name) for name in extra_fields)]).encode()
+        flags = GENESIS_PREVIOUS if block.previous_hash == "0" else 0
+        return BINARY_RECORD.pack(block.index, block.timestamp, block.hash_format, flags,
+                                  _digest_bytes(block.previous_hash), bytes.fromhex(block.current_hash),
+                                  len(payload)) + payload
+
+    with open(path, "wb", buffering=BUFFER_SIZE) as f:
+        f.write(BINARY_MAGIC)
+        for data in _batched(chain, encode):
+            f.write(data)
+    return len(chain)
+
+def iter_ndjson(path, block_class=Block):
+    """Stream blocks back from an NDJSON export without verifying them"""
+    extra_fields = _extra_slot_names(block_class)
+    with open(path, "rb", buffering=BUFFER_SIZE) as f:
+        for line in f:
+            record = json.loads(line)
+            block = object.__new__(block_class)
+            block.index = record["index"]
+            block.previous_hash = record["previous_hash"]
+            block.timestamp = record["timestamp"]
+            block.sensor_data = record["sensor_data"]
+            block.hash_format = record["hash_format"]
+            block.current_hash = record["current_hash"]
+            for name in extra_fields:
+                setattr(block, name, record[name])
+            yield block
+
+def iter_binary(path, block_class=Block):
+    """Stream blocks back from a binary export without verifying them"""
+    extra_fields = _extra_slot_names(block_class)
+    with open(path, "rb", buffering=BUFFER_SIZE) as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a binary chain export")
+        while header := f.read(BINARY_RECORD.size):
+            if len(header) < BINARY_RECORD.size:
+                raise ValueError(f"{path} ends in a truncated block")
+            index, timestamp, hash_format, flags, previous, current, length = BINARY_RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                raise ValueError(f"{path} ends in a truncated block")
+            sensor_data, *extras = json.loads(payload)
+            block = object.__new__(block_class)
+            block.index = index
+            block.previous_hash = "0" if flags & GENESIS_PREVIOUS else previous.hex()
+            block.timestamp = timestamp
+            block.sensor_data = sensor_data
+            block.hash_format = hash_format
+            block.current_hash = current.hex()
+            for name, value in zip(extra_fields, extras):
+                setattr(block, name, value)
+            yield block
+
+# Re-check hashes, bodies and links while the blocks stream in
+def iter_verified(blocks):
+    """Pass blocks through, raising ValueError at the first stale hash, body or broken link
+
+    Blocks whose header only commits to a digest of their body (such as
+    merkle.MerkleBlock) also have verify_body() called, since the header
+    hash alone would accept edited readings.
+    """
+    previous_hash = None
+    for block in blocks:
+        if block.current_hash != block.calculate_hash():
+            raise ValueError(f"Integrity check failed at Block {block.index}: Hash mismatch")
+        verify_body = getattr(block, "verify_body", None)
+        if verify_body is not None and not verify_body():
+            raise ValueError(f"Integrity check failed at Block {block.index}: Body does not match its header")
+        if previous_hash is not None and block.previous_hash != previous_hash:
+            raise ValueError(f"Integrity check failed at Block {block.index}: Previous hash mismatch")
+        previous_hash = block.current_hash
+        yield block
+
+def iter_export(path, block_class=Block, verify=True):
+    """Stream blocks from either export format (detected from the file), verifying them by default"""
+    with open(path, "rb") as f:
+        binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    blocks = iter_binary(path, block_class) if binary else iter_ndjson(path, block_class)
+    return iter_verified(blocks) if verify else blocks
+
+# Load an export into a Blockchain, replacing its blocks
+def import_chain(path, blockchain, verify=True):
+    """Fill blockchain with the exported blocks; a verified import needs no later full rehash"""
+    blockchain.load_blocks(iter_export(path, blockchain.block_class, verify), verified=verify)
+    return blockchain
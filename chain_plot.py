@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+# Chains up to this many blocks are drawn block by block with labels and links
+DETAILED_LIMIT = 100
+# Above DETAILED_LIMIT, consecutive blocks are merged so at most this many cells are drawn
+MAX_CELLS = 250_000
+
+# Position of every cell on a ribbon that snakes left-to-right, then right-to-left
+def ribbon_layout(count, per_row):
+    """(row, column) arrays for cells 0 .. count-1; consecutive cells are always adjacent"""
+    positions = np.arange(count)
+    rows, columns = np.divmod(positions, per_row)
+    columns = np.where(rows % 2 == 1, per_row - 1 - columns, columns)
+    return rows, columns
+
+def _row_length(cells, aspect):
+    """Cells per ribbon row so the whole ribbon is about aspect times wider than tall"""
+    return max(1, min(cells, math.ceil(math.sqrt(cells * aspect))))
+
+# Level of detail: average each run of `size` consecutive blocks into one cell
+def bin_values(values, size):
+    """Mean of values over consecutive bins (the last bin may be shorter)"""
+    values = np.asarray(values, dtype=np.float64)
+    starts = np.arange(0, len(values), size)
+    sums = np.add.reduceat(values, starts)
+    counts = np.diff(np.append(starts, len(values)))
+    return sums / counts
+
+def block_values(chain, value=None):
+    """One number per block, by default the seconds since the previous block"""
+    if value is not None:
+        return np.fromiter((value(block) for block in chain), dtype=np.float64, count=len(chain))
+    timestamps = np.fromiter((block.timestamp for block in chain), dtype=np.float64, count=len(chain))
+    return np.diff(timestamps, prepend=timestamps[:1])
+
+def _draw_detailed(ax, values, highlight, per_row):
+    from matplotlib.collections import LineCollection
+
+    rows, columns = ribbon_layout(len(values), per_row)
+    points = np.column_stack((columns, -rows))
+    ax.add_collection(LineCollection([points[i:i + 2] for i in range(len(points) - 1)], colors="gray", zorder=1))
+    colors = np.full(len(values), "lightgreen", dtype=object)
+    colors[list(highlight)] = "red"
+    ax.scatter(points[:, 0], points[:, 1], s=600, c=list(colors), edgecolors="black", zorder=2)
+    for index, (x, y) in enumerate(points):
+        ax.text(x, y, str(index), ha="center", va="center", fontweight="bold", zorder=3)
+    ax.set_xlim(-0.7, per_row - 0.3)
+    ax.set_ylim(-rows.max() - 0.7, 0.7)
+
+def _draw_binned(ax, values, highlight, cmap, aspect, max_cells):
+    from matplotlib import colormaps
+
+    size = max(1, math.ceil(len(values) / max_cells))
+    cells = bin_values(values, size)
+    per_row = _row_length(len(cells), aspect)
+    rows, columns = ribbon_layout(len(cells), per_row)
+    low, high = np.nanpercentile(cells, [1, 99])
+    scaled = np.clip((cells - low) / (high - low), 0, 1) if high > low else np.zeros_like(cells)
+    image = np.ones((rows.max() + 1, per_row, 4))  # Cells past the end of the chain stay white
+    image[rows, columns] = colormaps[cmap](scaled)
+    if len(highlight):
+        # A highlighted block marks its whole bin, so it stays visible at any zoom level
+        marked = np.unique(np.asarray(list(highlight), dtype=np.int64) // size)
+        image[rows[marked], columns[marked]] = (1.0, 0.0, 0.0, 1.0)
+    ax.imshow(image, aspect="auto", interpolation="nearest")
+    ax.set_xticks([])
+    ax.set_yticks([])
+    return size
+
+# Draw a chain of `len(values)` blocks onto existing matplotlib axes
+def draw_chain(ax, values, highlight=(), cmap="viridis", aspect=4.0, max_cells=MAX_CELLS):
+    """Ribbon view of the chain; returns the number of blocks per drawn cell
+
+    values holds one number per block (e.g. from block_values) and colours
+    the cells of the binned view; highlight lists block indexes to mark in red, such
+    as the block verify_chain() rejected. No per-block graph or artist is
+    built once the chain is longer than DETAILED_LIMIT.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= DETAILED_LIMIT:
+        if len(values):
+            _draw_detailed(ax, values, highlight, _row_length(len(values), aspect))
+        ax.set_axis_off()
+        return 1
+    return _draw_binned(ax, values, highlight, cmap, aspect, max_cells)
+
+# Render straight to a PNG/SVG file without a GUI backend
+def render_chain(path, values, highlight=(), title=None, figsize=(12, 6), dpi=150, **options):
+    """Save the ribbon view to path (the format follows the extension); return the blocks per cell"""
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize, dpi=dpi)
+    ax = figure.add_subplot()
+    size = draw_chain(ax, values, highlight, **options)
+    caption = f"{len(values):,} blocks" + (f", {size:,} per cell" if size > 1 else "")
+    ax.set_title(f"{title} ({caption})" if title else caption)
+    figure.savefig(path)
+    return size
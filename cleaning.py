@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+import sensor_loader
+from row_filter import NON_NEGATIVE, filter_rows
+
+CHUNK_ROWS = 100_000
+
+# Pass one: everything the in-memory script learns from the whole file
+class CleaningScan:
+    """Missing-value counts, row counts and per-column min/max over the valid rows
+
+    Rows are valid when they are complete and pass rules (by default the
+    script's "no negative values"); see row_filter.ValidityRules.
+    """
+
+    def __init__(self, rules=NON_NEGATIVE):
+        self.rules = rules
+        self.rows = 0
+        self.complete_rows = 0  # Rows left after dropping missing values
+        self.valid_rows = 0     # ... and after dropping rows with negative values
+        self.missing = None
+        self.numeric_columns = None
+        self.minimum = None
+        self.maximum = None
+
+    @property
+    def invalid_rows(self):
+        return self.complete_rows - self.valid_rows
+
+    def add(self, chunk):
+        """Fold one chunk of the raw file into the statistics"""
+        self.rows += len(chunk)
+        result = filter_rows(chunk, self.rules)
+        missing = result.missing
+        self.missing = missing if self.missing is None else self.missing.add(missing, fill_value=0).astype(np.int64)
+        valid = result.frame
+        self.complete_rows += result.complete_rows
+        self.valid_rows += len(valid)
+        numeric = list(chunk.select_dtypes(include=[np.number]).columns)
+        if self.numeric_columns is None:
+            self.numeric_columns = numeric
+        else:
+            # A column is scaled only if every chunk parsed it as a number
+            self.numeric_columns = [column for column in self.numeric_columns if column in numeric]
+        columns = self.numeric_columns
+        chunk_min = valid[columns].min()
+        chunk_max = valid[columns].max()
+        if self.minimum is None:
+            self.minimum, self.maximum = chunk_min, chunk_max
+        else:
+            self.minimum = pd.concat([self.minimum[columns], chunk_min], axis=1).min(axis=1)
+            self.maximum = pd.concat([self.maximum[columns], chunk_max], axis=1).max(axis=1)
+
+    def scale_and_offset(self):
+        """MinMaxScaler's scale_ and min_ for feature_range (0, 1), computed the same way"""
+        minimum = self.minimum.to_numpy(dtype=np.float64)
+        data_range = self.maximum.to_numpy(dtype=np.float64) - minimum
+        data_range[data_range < 10 * np.finfo(np.float64).eps] = 1.0  # Constant columns are left unscaled
+        scale = 1 / data_range
+        return scale, 0 - minimum * scale
+
+def scan_csv(file_path, chunk_rows=CHUNK_ROWS, rules=NON_NEGATIVE):
+    """Pass one over a CSV, one chunk in memory at a time"""
+    scan = CleaningScan(rules)
+    for chunk in sensor_loader.iter_windows(file_path, chunk_rows):
+        scan.add(chunk)
+    return scan
+
+# Pass two: filter and scale chunk by chunk, appending to the output file
+def clean_normalize_csv(file_path, output_path, chunk_rows=CHUNK_ROWS, scan=None, rules=NON_NEGATIVE):
+    """Drop incomplete and invalid rows and Min-Max scale the numeric columns
+
+    Writes the same file as the in-memory dropna / filter /
+    MinMaxScaler.fit_transform / to_csv sequence while holding only one
+    chunk in memory. Returns the pass-one CleaningScan (whose rules are
+    used when one is passed in).
+    """
+    scan = scan_csv(file_path, chunk_rows, rules) if scan is None else scan
+    scale, offset = scan.scale_and_offset()
+    columns = scan.numeric_columns
+    with open(output_path, "w", newline="") as output:
+        header = True
+        for chunk in sensor_loader.iter_windows(file_path, chunk_rows):
+            valid = filter_rows(chunk, scan.rules).frame
+            if len(valid):
+                valid = valid.copy()
+                values = valid[columns].to_numpy(dtype=np.float64)
+                values *= scale
+                values += offset
+                valid[columns] = values
+            if header or len(valid):
+                valid.to_csv(output, header=header, index=False)
+                header = False
+    return scan
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+
+from row_filter import COMPLETE, filter_rows
+
+# Rows copied per step when a split is written to disk
+WRITE_ROWS = 8192
+
+# Stratified train/validation/test positions, computed once
+def split_indices(labels, holdout_size=0.3, test_share=0.5, random_state=42):
+    """Return (train, val, test) row positions
+
+    Two train_test_split calls as in 1.py (holdout_size of the rows held
+    out, test_share of those for test), but on position arrays instead of
+    DataFrames: the same seed gives exactly the rows the DataFrame version
+    gives, and no data is copied.
+    """
+    from sklearn.model_selection import train_test_split  # sklearn takes ~1 s to import, so only when splitting
+
+    labels = np.asarray(labels)
+    positions = np.arange(len(labels))
+    train, temp = train_test_split(positions, test_size=holdout_size, stratify=labels,
+                                   random_state=random_state)
+    val, test = train_test_split(temp, test_size=test_share, stratify=labels[temp], random_state=random_state)
+    return train, val, test
+
+def complete_positions(frame):
+    """Positions of the rows without missing values (what dropna() keeps), without copying the frame"""
+    return np.flatnonzero(filter_rows(frame, COMPLETE).mask)
+
+# Split a frame; each row is copied once, into its own split
+def split_frame(frame, label_column, holdout_size=0.3, test_share=0.5, random_state=42, dropna=True):
+    """(train, val, test) DataFrames with features and label together, as 1.py returned them"""
+    rows = complete_positions(frame) if dropna else np.arange(len(frame))
+    labels = frame[label_column].to_numpy()[rows]
+    return tuple(frame.take(rows[split]) for split in split_indices(labels, holdout_size, test_share, random_state))
+
+# Write splits of a numeric matrix straight to .npy files
+def write_splits(matrix, splits, directory, prefix):
+    """Copy each split's rows into {prefix}_{name}.npy in WRITE_ROWS blocks
+
+    splits maps a name to row positions. Peak extra memory is one block;
+    the returned arrays are read-only memory maps of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = {}
+    for name, positions in splits.items():
+        path = os.path.join(directory, f"{prefix}_{name}.npy")
+        output = np.lib.format.open_memmap(path, mode="w+", dtype=matrix.dtype,
+                                           shape=(len(positions),) + matrix.shape[1:])
+        for start in range(0, len(positions), WRITE_ROWS):
+            output[start:start + WRITE_ROWS] = matrix[positions[start:start + WRITE_ROWS]]
+        output.flush()
+        del output
+        written[name] = np.load(path, mmap_mode="r")
+    return written
@@ -0,0 +1,136 @@
+import base64
+import json
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+import blockchain
+import metrics
+
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+_NONCE_SIZE = 12
+_SEALED_KEY = "__enc__"  # Holds the ciphertext in a sealed reading; reserved in readings
+
+# AES-256-GCM keys addressed by a key id, so old blocks stay readable after rotation
+class KeyRing:
+    def __init__(self, key=None):
+        self._ciphers = {}
+        self.active_key_id = None
+        self.add_key(key if key is not None else AESGCM.generate_key(bit_length=256), activate=True)
+
+    def add_key(self, key, activate=False):
+        """Register a key and return its id"""
+        key_id = len(self._ciphers) + 1
+        self._ciphers[key_id] = AESGCM(key)
+        if activate:
+            self.active_key_id = key_id
+        return key_id
+
+    def rotate(self):
+        """Generate a new key and use it for every block from now on"""
+        return self.add_key(AESGCM.generate_key(bit_length=256), activate=True)
+
+    def seal(self, reading, fields, key_id=None):
+        """Encrypt the given fields of a reading; the other fields stay readable and are authenticated"""
+        if _SEALED_KEY in reading:
+            raise ValueError(f"{_SEALED_KEY!r} is reserved for the ciphertext of a sealed reading")
+        key_id = self.active_key_id if key_id is None else key_id
+        clear = {name: value for name, value in reading.items() if name not in fields}
+        secret = {name: reading[name] for name in fields if name in reading}
+        nonce = os.urandom(_NONCE_SIZE)
+        ciphertext = self._ciphers[key_id].encrypt(nonce, _CANONICAL_JSON.encode(secret).encode(),
+                                                   _CANONICAL_JSON.encode(clear).encode())
+        clear[_SEALED_KEY] = base64.b64encode(nonce + ciphertext).decode()
+        return clear
+
+    def open(self, sealed, key_id):
+        """Decrypt a sealed reading back into the original dictionary"""
+        clear = dict(sealed)
+        blob = base64.b64decode(clear.pop(_SEALED_KEY))
+        secret = self._ciphers[key_id].decrypt(blob[:_NONCE_SIZE], blob[_NONCE_SIZE:],
+                                               _CANONICAL_JSON.encode(clear).encode())
+        clear.update(json.loads(secret))
+        return clear
+
+# Block whose sensor fields are encrypted before hashing; the key id is part of the header
+class EncryptedBlock(blockchain.Block):
+    __slots__ = ("key_id",)
+
+    def __init__(self, index, previous_hash, timestamp, sensor_data, hash_format=blockchain.HASH_FORMAT_V1,
+                 key_id=1):
+        self.key_id = key_id
+        super().__init__(index, previous_hash, timestamp, sensor_data, hash_format=hash_format)
+
+    def legacy_preimage(self):
+        return super().legacy_preimage() + f"{self.key_id}".encode()
+
+    def canonical_payload(self):
+        return struct.pack(">I", self.key_id) + super().canonical_payload()
+
+# Blockchain that stores heart rate and glucose encrypted, decrypting only on demand
+class EncryptedBlockchain(blockchain.Blockchain):
+    """Encrypt selected sensor fields with AES-GCM before blocks are hashed
+
+    add_block() seals the reading with the active key while building the
+    block. add_blocks() seals a whole batch under one key id first,
+    spreading large batches over a thread pool (the cipher runs in OpenSSL
+    without the GIL), then hashes and links the blocks in order. Clear
+    fields such as patient_id stay queryable; decrypt() opens a block only
+    when it is read.
+    """
+
+    block_class = EncryptedBlock
+    encrypted_fields = ("heart_rate", "glucose")
+    parallel_threshold = 1000  # Batches at least this large are sealed in a thread pool
+    seal_batch_size = 256  # Readings per thread pool task
+
+    def __init__(self, keyring=None, workers=None, **kwargs):
+        self.keyring = keyring if keyring is not None else KeyRing()
+        self.workers = workers
+        super().__init__(**kwargs)
+
+    def create_genesis_block(self):
+        """Create the Genesis block with encrypted dummy data"""
+        return self._new_block(0, "0", time.time(), dict(self.genesis_data))
+
+    def _new_block(self, index, previous_hash, timestamp, sensor_data):
+        key_id = self.keyring.active_key_id
+        sealed = self.keyring.seal(sensor_data, self.encrypted_fields, key_id)
+        return self._sealed_block(index, previous_hash, timestamp, sealed, key_id)
+
+    def _sealed_block(self, index, previous_hash, timestamp, sealed, key_id):
+        return self.block_class(index, previous_hash, timestamp, sealed, hash_format=self.hash_format,
+                                key_id=key_id)
+
+    def _seal_batch(self, readings, key_id):
+        def seal(batch):
+            return [self.keyring.seal(reading, self.encrypted_fields, key_id) for reading in batch]
+
+        if len(readings) < self.parallel_threshold:
+            return seal(readings)
+        size = self.seal_batch_size
+        batches = [readings[i:i + size] for i in range(0, len(readings), size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return [payload for sealed in executor.map(seal, batches) for payload in sealed]
+
+    @metrics.timed("blockchain_add_blocks")
+    def add_blocks(self, readings):
+        """Seal a batch of readings under one key id (in parallel if large) and add one block per reading"""
+        key_id = self.keyring.active_key_id
+        blocks = []
+        for sealed in self._seal_batch(list(readings), key_id):
+            previous_block = self.chain[-1]
+            new_block = self._sealed_block(len(self.chain), previous_block.current_hash, time.time(), sealed, key_id)
+            blocks.append(self._append(new_block))
+        return blocks
+
+    def decrypt(self, block):
+        """Plaintext sensor data of one block"""
+        return self.keyring.open(block.sensor_data, block.key_id)
+
+    def read_patient(self, patient_id, since=None, until=None):
+        """Decrypted sensor data of a patient's blocks; other blocks are never decrypted"""
+        return [self.decrypt(block) for block in self.blocks_for_patient(patient_id, since, until)]
@@ -0,0 +1,53 @@
+import numpy as np
+
+# MIT-BIH beats are sampled at 125 Hz; each row starts at an R-peak and holds
+# about 1.2 RR intervals of signal before zero padding
+SAMPLING_RATE = 125
+SEGMENT_RR_RATIO = 1.2
+MAX_HEART_RATE = 220  # bpm, sets the refractory period after the first R-peak
+
+# Rows processed per vectorized step, keeps the boolean temporaries cache-sized
+BLOCK_ROWS = 16384
+
+# Estimate heart rate (bpm) for every beat of an ECG matrix in one call
+def estimate_heart_rates(matrix, sampling_rate=SAMPLING_RATE, peak_threshold=0.5):
+    """Return an array of heart rates, one per row of a (beats x samples) ECG matrix
+
+    The RR interval is the distance from the R-peak at the start of the row
+    to the next local maximum reaching peak_threshold of the row maximum.
+    Rows without a second peak fall back to the segment length (signal
+    before zero padding is SEGMENT_RR_RATIO RR intervals long).
+    """
+    signals = np.asarray(matrix, dtype=np.float32)
+    if signals.ndim != 2:
+        raise ValueError(f"Expected a 2-D beats x samples matrix, got shape {signals.shape}")
+    if signals.shape[1] == 0:
+        # Rows without samples have no heart rate
+        return np.full(len(signals), np.nan)
+    rr_samples = np.empty(len(signals))
+    for start in range(0, len(signals), BLOCK_ROWS):
+        block = signals[start:start + BLOCK_ROWS]
+        rr_samples[start:start + len(block)] = _rr_samples(block, sampling_rate, peak_threshold)
+    return 60.0 * sampling_rate / rr_samples
+
+def _rr_samples(signals, sampling_rate, peak_threshold):
+    """RR interval, in samples, of each row"""
+    num_samples = signals.shape[1]
+
+    # Fallback: signal length before the zero padding
+    nonzero = signals != 0
+    signal_length = num_samples - nonzero[:, ::-1].argmax(axis=1)
+    signal_length[~nonzero.any(axis=1)] = num_samples
+    fallback = signal_length / SEGMENT_RR_RATIO
+    if num_samples < 3:
+        return fallback  # Too short to hold a local maximum
+
+    # Candidate R-peaks: local maxima above the threshold, past the refractory period
+    refractory = int(sampling_rate * 60 / MAX_HEART_RATE)
+    middle = signals[:, 1:-1]
+    is_peak = (middle > signals[:, :-2]) & (middle >= signals[:, 2:])
+    is_peak &= middle >= peak_threshold * signals.max(axis=1, keepdims=True)
+    is_peak[:, :max(refractory - 1, 0)] = False
+    has_peak = is_peak.any(axis=1)
+    rr_samples = is_peak.argmax(axis=1) + 1.0
+    return np.where(has_peak, rr_samples, fallback)
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import metrics
+from blockchain import Blockchain
+
+logger = logging.getLogger(__name__)
+
+# Asyncio front end that batches sensor readings from many connections into blocks
+class IngestService:
+    """Accept newline-delimited JSON readings over TCP or a UNIX socket
+
+    Every connection handler parses readings and puts them on a bounded
+    queue; when the queue is full the handlers stop reading their sockets,
+    which pushes back on the senders. A single writer task drains the queue
+    in batches of up to batch_size readings (or whatever arrived within
+    batch_timeout seconds) and appends one block per batch, so the chain
+    stays strictly ordered. A batch that cannot be appended is logged and
+    counted in readings_failed, and stop() re-raises the first such error
+    once everything else is written. A line longer than line_limit bytes
+    gets an error reply and closes its connection.
+    """
+
+    required_fields = ("sensor_id", "heart_rate", "glucose")
+
+    def __init__(self, blockchain, queue_size=10000, batch_size=500, batch_timeout=0.05, track_latency=False,
+                 line_limit=65536):
+        self.blockchain = blockchain
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.track_latency = track_latency
+        self.line_limit = line_limit
+        self.latencies_ns = []  # Receive-to-append latency per reading, if tracked
+        self.readings_appended = 0
+        self.readings_rejected = 0
+        self.readings_failed = 0
+        self.error = None  # First append failure, re-raised by stop()
+        self._queue = None
+        self._server = None
+        self._writer = None
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Start listening and the writer task; return the asyncio server"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer = asyncio.create_task(self._write_blocks())
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, unix_path, limit=self.line_limit)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port, limit=self.line_limit)
+        return self._server
+
+    async def drain(self):
+        """Wait until every queued reading has been appended; raises if the writer task died"""
+        joined = asyncio.ensure_future(self._queue.join())
+        try:
+            await asyncio.wait((joined, self._writer), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            joined.cancel()
+        if self._writer.done() and not self._writer.cancelled():
+            self._writer.result()  # Re-raises what stopped the writer
+            raise RuntimeError("The block writer stopped")
+
+    async def stop(self):
+        """Stop accepting connections, append what is queued and stop the writer
+
+        Raises the writer's failure, or the first error that kept a batch
+        out of the chain.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        try:
+            await self.drain()
+        finally:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        if self.error is not None:
+            raise self.error
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    # Longer than line_limit: the rest of the stream can no longer be split into readings
+                    self.readings_rejected += 1
+                    writer.write(json.dumps({"error": f"line longer than {self.line_limit} bytes"}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    reading = json.loads(line)
+                    if not isinstance(reading, dict) or not all(field in reading for field in self.required_fields):
+                        raise ValueError("not a reading")
+                except ValueError:
+                    self.readings_rejected += 1
+                    continue
+                await self._queue.put((time.perf_counter_ns(), reading))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write_blocks(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                self.blockchain.add_block({"readings": [reading for _, reading in batch]})
+            except Exception as e:
+                logger.exception("Could not append a block of %d readings", len(batch))
+                self.readings_failed += len(batch)
+                if self.error is None:
+                    self.error = e
+            else:
+                if self.track_latency:
+                    appended = time.perf_counter_ns()
+                    self.latencies_ns.extend(appended - received for received, _ in batch)
+                self.readings_appended += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+# Main function
+async def serve(args):
+    blockchain = Blockchain(path=args.chain_path) if args.chain_path else Blockchain()
+    with blockchain:
+        service = IngestService(blockchain, queue_size=args.queue_size, batch_size=args.batch_size,
+                                batch_timeout=args.batch_timeout)
+        server = await service.start(args.host, args.port, unix_path=args.unix_path)
+        print(f"Listening on {args.unix_path or f'{args.host}:{args.port}'}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Append the readings still queued before the chain is closed
+            await service.stop()
+
+def main():
+    metrics.enable_profiling()
+    parser = argparse.ArgumentParser(description="Sensor reading ingestion service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-path")
+    parser.add_argument("--chain-path", help="persist the chain to this on-disk log")
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--batch-timeout", type=float, default=0.05)
+    asyncio.run(serve(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import importlib.util
+import sys
+
+# Module object whose code only runs on first attribute access
+def lazy_import(name):
+    """Import name lazily, so scripts load pandas, numpy etc. only if they use them
+
+    The module is registered in sys.modules right away; a later plain
+    import of the same name returns the same (possibly still lazy) object.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
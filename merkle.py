@@ -0,0 +1,121 @@
+import hashlib
+import json
+import time
+
+import blockchain
+
+# Domain-separation prefixes so a leaf can never be passed off as an inner node
+_LEAF = b"\x00"
+_NODE = b"\x01"
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+def leaf_hash(reading):
+    """SHA-256 of one reading's canonical JSON"""
+    return hashlib.sha256(_LEAF + _CANONICAL_JSON.encode(reading).encode()).digest()
+
+def _node_hash(left, right):
+    return hashlib.sha256(_NODE + left + right).digest()
+
+# Merkle tree over the readings of one block
+class MerkleTree:
+    """All levels of the tree, leaves first; an odd last node is carried up unchanged"""
+
+    def __init__(self, readings):
+        level = [leaf_hash(reading) for reading in readings]
+        self.levels = [level]
+        while len(level) > 1:
+            next_level = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                next_level.append(level[-1])
+            self.levels.append(next_level)
+            level = next_level
+
+    @property
+    def root(self):
+        """Hex root hash (the hash of no data for an empty block)"""
+        top = self.levels[-1]
+        return top[0].hex() if top else hashlib.sha256(b"").hexdigest()
+
+    def proof(self, position):
+        """Inclusion proof for the reading at position: [(sibling_hex, sibling_is_left), ...]"""
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                proof.append((level[sibling].hex(), sibling < position))
+            position //= 2
+        return proof
+
+def verify_proof(reading, proof, root):
+    """Check in O(log n) hashes that reading is included under root"""
+    node = leaf_hash(reading)
+    for sibling_hex, sibling_is_left in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _node_hash(sibling, node) if sibling_is_left else _node_hash(node, sibling)
+    return node.hex() == root
+
+# Block whose header commits to a batch of readings through their Merkle root
+class MerkleBlock(blockchain.Block):
+    __slots__ = ("merkle_root",)
+
+    def __init__(self, index, previous_hash, timestamp, sensor_data, hash_format=blockchain.HASH_FORMAT_V1):
+        self.merkle_root = MerkleTree(sensor_data).root  # sensor_data: list of reading dicts
+        super().__init__(index, previous_hash, timestamp, sensor_data, hash_format=hash_format)
+
+    def legacy_preimage(self):
+        return f"{self.index}{self.previous_hash}{self.timestamp}{self.merkle_root}".encode()
+
+    def canonical_payload(self):
+        """Only the root is hashed into the header, so header checks stay O(1) per block"""
+        return bytes.fromhex(self.merkle_root)
+
+    def merkle_tree(self):
+        """Rebuild the tree, e.g. to produce proofs for several readings"""
+        return MerkleTree(self.sensor_data)
+
+    def inclusion_proof(self, position):
+        """Proof that the reading at position belongs to this block"""
+        return self.merkle_tree().proof(position)
+
+    def verify_body(self):
+        """Check that the stored readings still hash to the header's Merkle root"""
+        return MerkleTree(self.sensor_data).root == self.merkle_root
+
+# Blockchain that grows one block per batch of readings
+class MerkleBlockchain(blockchain.Blockchain):
+    block_class = MerkleBlock
+    body_mismatch_message = "Integrity check failed at Block {index}: Merkle root mismatch"
+
+    def create_genesis_block(self):
+        """Create the Genesis block with an empty batch"""
+        return self.block_class(0, "0", time.time(), [], hash_format=self.hash_format)
+
+    def add_batch(self, readings):
+        """Add one block holding all readings under a single Merkle root"""
+        return self.add_block(list(readings))
+
+    def verify_chain(self, full=False, workers=None):
+        """Verify headers and links as Blockchain does, then the readings of each newly verified block
+
+        Header hashes only cover the Merkle root, so every block that is
+        (re)verified also has its body rebuilt into a tree and compared
+        with the root; full=True checks every block, genesis included.
+        """
+        start = 0 if full else self._resume_point()
+        if not super().verify_chain(full=full, workers=workers):
+            return False
+        if full and not self.chain[0].verify_body():
+            print(self.body_mismatch_message.format(index=0))
+            return False
+        for i in range(start + 1, len(self.chain)):
+            if not self.chain[i].verify_body():
+                return self._fail(i, self.body_mismatch_message)
+        return True
+
+    def verify_bodies(self):
+        """Check every block's readings against its Merkle root, without rehashing headers"""
+        for block in self.chain:
+            if not block.verify_body():
+                print(self.body_mismatch_message.format(index=block.index))
+                return False
+        return True
@@ -0,0 +1,182 @@
+import atexit
+import bisect
+import contextlib
+import functools
+import json
+import os
+import time
+
+# SENSOR_METRICS=1 turns the instrumentation on for the whole process; the
+# snapshot is written at exit to SENSOR_METRICS_FILE (.json, or .prom for the
+# Prometheus text format). SENSOR_PROFILE=cprofile|tracemalloc makes
+# enable_profiling(), which the scripts call at the start of main(), capture a
+# profile of the run into SENSOR_PROFILE_FILE.
+ENABLED = os.environ.get("SENSOR_METRICS", "") not in ("", "0")
+METRICS_FILE = os.environ.get("SENSOR_METRICS_FILE", "sensor_metrics.json")
+PROFILE_MODE = os.environ.get("SENSOR_PROFILE", "")
+PROFILE_FILE = os.environ.get("SENSOR_PROFILE_FILE")
+PREFIX = "sensor_"
+
+# Histogram bucket upper bounds in nanoseconds: 256 ns, 512 ns, ... ~69 s
+BUCKETS_NS = tuple(2 ** exponent for exponent in range(8, 37))
+
+# Latency histogram with fixed power-of-two buckets
+class Histogram:
+    __slots__ = ("counts", "count", "total_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_NS) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.total_ns = 0
+
+    def observe(self, value_ns):
+        self.counts[bisect.bisect_left(BUCKETS_NS, value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile, in seconds"""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_NS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound / 1e9
+        return float("inf")
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(BUCKETS_NS + (float("inf"),), self.counts):
+            cumulative += count
+            buckets.append([bound / 1e9, cumulative])
+        return {
+            "count": self.count,
+            "sum_seconds": self.total_ns / 1e9,
+            "p50_seconds": self.quantile(0.5) if self.count else None,
+            "p99_seconds": self.quantile(0.99) if self.count else None,
+            "buckets": buckets
+        }
+
+# Named counters and histograms of one process
+class Registry:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """JSON-ready view of every metric"""
+        return {
+            "counters": dict(self.counters),
+            "histograms": {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        }
+
+    def prometheus(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {PREFIX}{name}_total counter")
+            lines.append(f"{PREFIX}{name}_total {value}")
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{PREFIX}{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, cumulative in histogram.snapshot()["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum {histogram.total_ns / 1e9!r}")
+            lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write a snapshot to path: Prometheus text for .prom/.txt, JSON otherwise"""
+        with open(path, "w") as f:
+            if path.endswith((".prom", ".txt")):
+                f.write(self.prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=2)
+
+REGISTRY = Registry()
+
+# Time every call of a function into the histogram `name`
+def timed(name):
+    """Decorator; when metrics are disabled it returns the function itself, so there is no overhead"""
+    def decorate(function):
+        if not ENABLED:
+            return function
+        histogram = REGISTRY.histogram(name)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter_ns() - start)
+
+        return wrapper
+    return decorate
+
+def increment(name, amount=1):
+    """Add to a counter (for rare events; hot paths should rely on histogram counts)"""
+    if ENABLED:
+        REGISTRY.increment(name, amount)
+
+# cProfile or tracemalloc capture of a block of code
+@contextlib.contextmanager
+def capture(mode, path=None):
+    """Profile the enclosed code; mode is "cprofile" (pstats file) or "tracemalloc" (top allocations)"""
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path or "sensor_profile.prof")
+    elif mode == "tracemalloc":
+        import tracemalloc
+
+        tracemalloc.start(25)
+        try:
+            yield tracemalloc
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(path or "sensor_tracemalloc.txt", "w") as f:
+                f.write(f"current {current} bytes, peak {peak} bytes\n")
+                for stat in snapshot.statistics("lineno")[:50]:
+                    f.write(f"{stat}\n")
+    else:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+_profile = None
+
+# Profile the rest of the run
+def enable_profiling(mode=None, path=None):
+    """Start a capture (mode defaults to SENSOR_PROFILE) that is closed and written at exit
+
+    Does nothing without a mode or when a capture is already running;
+    returns whether one is running.
+    """
+    global _profile
+    mode = mode or PROFILE_MODE
+    if _profile is None and mode:
+        _profile = capture(mode, path or PROFILE_FILE)
+        _profile.__enter__()
+        atexit.register(_profile.__exit__, None, None, None)
+    return _profile is not None
+
+if ENABLED:
+    atexit.register(lambda: REGISTRY.write(METRICS_FILE))
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# The sensor scripts number patients by row: row i of a file is patient P{i+1:03d}.
+# Code i is the integer form of that id; the strings are only built for display.
+def patient_id(code):
+    """Display id of a patient code"""
+    return f"P{str(code + 1).zfill(3)}"
+
+def patient_ids(codes):
+    """Display ids of several patient codes"""
+    return [patient_id(code) for code in codes]
+
+def patient_code(patient_id):
+    """Integer code of a display id, e.g. P042 -> 41"""
+    return int(patient_id[1:]) - 1
+
+def positional_codes(count, start=0):
+    """Codes of rows start .. start+count-1"""
+    return np.arange(start, start + count, dtype=np.int64)
+
+# Dense integer codes for patient ids that are not positional
+class PatientRegistry:
+    """Categorical codes shared by every loader that registers ids with it"""
+
+    def __init__(self):
+        self._codes = {}
+        self._ids = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def encode(self, ids):
+        """Codes for ids, registering unseen ones; hashes each distinct id once"""
+        uniques_codes, uniques = pd.factorize(pd.Series(ids), use_na_sentinel=False)
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for position, value in enumerate(uniques):
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self._ids)
+                self._ids.append(value)
+            mapping[position] = code
+        return mapping[uniques_codes]
+
+    def decode(self, codes):
+        """Ids for codes"""
+        return [self._ids[code] for code in codes]
+
+# Join two frames on patient_code by direct indexing, without sorting or hashing keys
+def join_by_code(left, right, left_columns, right_columns):
+    """Rows of patients present in both frames, ordered by code
+
+    Each frame's values are scattered into arrays indexed by patient code
+    and gathered back for the codes both frames have, so the cost is
+    O(rows + code range). Codes must be unique within each frame.
+    """
+    if not len(left) or not len(right):
+        return pd.DataFrame({column: [] for column in ("patient_code", *left_columns, *right_columns)})
+    left_codes = left["patient_code"].to_numpy()
+    right_codes = right["patient_code"].to_numpy()
+    base = min(left_codes.min(), right_codes.min())
+    size = int(max(left_codes.max(), right_codes.max()) - base) + 1
+    present = np.zeros(size, dtype=bool)
+    present[left_codes - base] = True
+    in_right = np.zeros(size, dtype=bool)
+    in_right[right_codes - base] = True
+    present &= in_right
+    slots = np.flatnonzero(present)
+    combined = {"patient_code": slots + base}
+    for frame_codes, frame, columns in ((left_codes, left, left_columns), (right_codes, right, right_columns)):
+        for column in columns:
+            values = frame[column].to_numpy()
+            scattered = np.empty(size, dtype=values.dtype)
+            scattered[frame_codes - base] = values
+            combined[column] = scattered[slots]
+    return pd.DataFrame(combined)
+
+# Join two code-ordered chunk streams without materializing either side
+def iter_join_by_code(left_chunks, right_chunks, left_columns, right_columns):
+    """Yield joined chunks; each input stream must be sorted by patient_code
+
+    The stream that is behind is read next, and rows are joined once both
+    streams have read past their code, so only rows beyond the other
+    stream's position wait in a buffer. After one stream ends, the other
+    is read until it passes that stream's last buffered code.
+    """
+    left, right = _CodeStream(left_chunks, left_columns), _CodeStream(right_chunks, right_columns)
+    while not (left.exhausted or right.exhausted):
+        behind = min((stream for stream in (left, right) if not stream.done), key=lambda stream: stream.position)
+        behind.read()
+        limit = min(left.complete_upto, right.complete_upto)
+        joined = join_by_code(left.take(limit), right.take(limit), left_columns, right_columns)
+        if len(joined):
+            yield joined
+
+# One side of iter_join_by_code: a chunk iterator and the rows not joined yet
+class _CodeStream:
+    def __init__(self, chunks, columns):
+        self._chunks = iter(chunks)
+        self.columns = ["patient_code", *columns]
+        self.buffer = pd.DataFrame(columns=self.columns)
+        self.position = -np.inf  # Last code read so far
+        self.done = False
+
+    @property
+    def complete_upto(self):
+        """Every row with a code up to this one has been read"""
+        return np.inf if self.done else self.position
+
+    @property
+    def exhausted(self):
+        """Nothing left to join: the stream ended and its buffer is empty"""
+        return self.done and self.buffer.empty
+
+    def read(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.done = True
+        elif len(chunk):
+            chunk = chunk[self.columns]
+            self.buffer = chunk if self.buffer.empty else pd.concat([self.buffer, chunk], ignore_index=True)
+            self.position = chunk["patient_code"].iloc[-1]
+
+    def take(self, limit):
+        """Remove and return the buffered rows with codes up to limit"""
+        ready = (self.buffer["patient_code"] <= limit).to_numpy()
+        taken = self.buffer[ready]
+        self.buffer = self.buffer[~ready]
+        return taken
@@ -0,0 +1,198 @@
+import hashlib
+import itertools
+import multiprocessing
+import os
+import struct
+from multiprocessing.connection import wait
+
+import blockchain
+
+# Nonces tried between two looks at the stop flag
+CHECK_EVERY = 4096
+_NONCE = struct.Struct(">Q")
+_DIFFICULTY = struct.Struct(">H")
+
+def target_for(difficulty):
+    """Largest 32-byte digest with at least `difficulty` leading zero bits"""
+    return ((1 << (256 - difficulty)) - 1).to_bytes(32, "big")
+
+def meets_difficulty(hex_hash, difficulty):
+    return bytes.fromhex(hex_hash) <= target_for(difficulty)
+
+def _nonce_bytes(nonce, hash_format):
+    if hash_format == blockchain.HASH_FORMAT_LEGACY:
+        return str(nonce).encode()
+    return _NONCE.pack(nonce)
+
+# Try nonces start, start + step, ... until one hashes below the target
+def search_nonce(prefix, hash_format, difficulty, start=1, step=1, stop_event=None):
+    """Return the first winning nonce, or None if stop_event was set first
+
+    The preimage prefix is hashed once; every attempt only copies that
+    state and hashes the nonce bytes.
+    """
+    base = hashlib.sha256(prefix)
+    target = target_for(difficulty)
+    nonces = itertools.count(start, step)
+    while True:
+        for nonce in itertools.islice(nonces, CHECK_EVERY):
+            attempt = base.copy()
+            attempt.update(_nonce_bytes(nonce, hash_format))
+            if attempt.digest() <= target:
+                return nonce
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+# Worker: search its share of the nonce space for every job it is sent
+def _miner(connection, stop_event, offset, workers):
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+        prefix, hash_format, difficulty = job
+        connection.send(search_nonce(prefix, hash_format, difficulty, offset + 1, workers, stop_event))
+
+# Persistent process pool that mines one block at a time
+class NonceSearchPool:
+    """Split each nonce search over worker processes and stop them all at the first hit"""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count()
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        self._stop = context.Event()
+        self._connections = []
+        self._processes = []
+        for offset in range(self.workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=_miner, args=(child, self._stop, offset, self.workers), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def search(self, prefix, hash_format, difficulty):
+        """Winning nonce for prefix; returns once every worker has stopped"""
+        self._stop.clear()
+        for connection in self._connections:
+            connection.send((prefix, hash_format, difficulty))
+        found = []
+        pending = list(self._connections)
+        while pending:
+            for connection in wait(pending):
+                pending.remove(connection)
+                nonce = connection.recv()
+                if nonce is not None:
+                    found.append(nonce)
+                    self._stop.set()
+        return min(found)
+
+    def close(self):
+        for connection in self._connections:
+            connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join()
+
+# Block with a difficulty and a nonce; difficulty 0 leaves the hash exactly as for a plain Block
+class MinedBlock(blockchain.Block):
+    __slots__ = ("nonce", "difficulty")
+
+    def __init__(self, index, previous_hash, timestamp, sensor_data, hash_format=blockchain.HASH_FORMAT_V1,
+                 nonce=0, difficulty=0):
+        self.nonce = nonce
+        self.difficulty = difficulty
+        super().__init__(index, previous_hash, timestamp, sensor_data, hash_format=hash_format)
+
+    def _work_header(self, hash_format):
+        """The committed difficulty, hashed between the block fields and the nonce"""
+        if not self.difficulty:
+            return b""
+        if hash_format == blockchain.HASH_FORMAT_LEGACY:
+            return f"{self.difficulty}:".encode()
+        return _DIFFICULTY.pack(self.difficulty)
+
+    def preimage_prefix(self):
+        """Preimage without the nonce, the part shared by every mining attempt"""
+        if self.hash_format == blockchain.HASH_FORMAT_LEGACY:
+            return super().legacy_preimage() + self._work_header(blockchain.HASH_FORMAT_LEGACY)
+        return super().binary_preimage() + self._work_header(blockchain.HASH_FORMAT_V1)
+
+    def legacy_preimage(self):
+        suffix = _nonce_bytes(self.nonce, blockchain.HASH_FORMAT_LEGACY) if self.nonce else b""
+        return super().legacy_preimage() + self._work_header(blockchain.HASH_FORMAT_LEGACY) + suffix
+
+    def binary_preimage(self):
+        suffix = _nonce_bytes(self.nonce, blockchain.HASH_FORMAT_V1) if self.nonce else b""
+        return super().binary_preimage() + self._work_header(blockchain.HASH_FORMAT_V1) + suffix
+
+# Blockchain whose blocks must meet a leading-zero-bits target
+class MinedBlockchain(blockchain.Blockchain):
+    """Optional proof of work on top of the plain chain
+
+    Every new block commits to the chain's current difficulty in its
+    hashed header. With difficulty 0 (the default) nothing is mined and
+    blocks hash like plain blocks. Otherwise each block gets a nonce that
+    puts its hash at or below the target, searched in-process for easy
+    targets and by a NonceSearchPool of `workers` processes from
+    parallel_difficulty bits up. verify_chain() also checks every block it
+    verifies against its own difficulty; verify_work() checks only that,
+    for the whole chain.
+    """
+
+    block_class = MinedBlock
+    work_mismatch_message = "Integrity check failed at Block {index}: Hash does not meet the difficulty target"
+    parallel_difficulty = 12  # Below this a pool's round trips cost more than the search
+
+    def __init__(self, difficulty=0, workers=None, **kwargs):
+        if not 0 <= difficulty <= 256:
+            raise ValueError(f"Difficulty must be between 0 and 256 bits, got {difficulty}")
+        self.difficulty = difficulty
+        self.workers = workers or os.cpu_count()
+        self._pool = None
+        super().__init__(**kwargs)
+
+    def mine(self, block):
+        """Give block a nonce that meets its difficulty; blocks with difficulty 0 are returned as they are"""
+        if not block.difficulty:
+            return block
+        prefix = block.preimage_prefix()
+        if self.workers > 1 and block.difficulty >= self.parallel_difficulty:
+            if self._pool is None:
+                self._pool = NonceSearchPool(self.workers)
+            block.nonce = self._pool.search(prefix, block.hash_format, block.difficulty)
+        else:
+            block.nonce = search_nonce(prefix, block.hash_format, block.difficulty)
+        block.current_hash = block.calculate_hash()
+        return block
+
+    def _new_block(self, index, previous_hash, timestamp, sensor_data):
+        return self.mine(self.block_class(index, previous_hash, timestamp, sensor_data,
+                                          hash_format=self.hash_format, difficulty=self.difficulty))
+
+    def verify_chain(self, full=False, workers=None):
+        """Verify hashes and links as Blockchain does, then the work of each newly verified block"""
+        start = 0 if full else self._resume_point()
+        if not super().verify_chain(full=full, workers=workers):
+            return False
+        for i in range(start + 1, len(self.chain)):
+            block = self.chain[i]
+            if not meets_difficulty(block.current_hash, block.difficulty):
+                return self._fail(i, self.work_mismatch_message)
+        return True
+
+    def verify_work(self):
+        """Check that every block meets the difficulty target committed in its header"""
+        for block in self.chain:
+            if not meets_difficulty(block.current_hash, block.difficulty):
+                print(self.work_mismatch_message.format(index=block.index))
+                return False
+        return True
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        super().close()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# Rows are checked this many at a time, so every temporary mask stays cache-sized
+BLOCK_ROWS = 8192
+
+# Allowed range of every column
+class ValidityRules:
+    """Inclusive (low, high) bounds per column; None leaves that side open
+
+    Columns are named by label, or by position when every key is an int
+    (as with the headerless ECG files). Columns without a rule get the
+    default bounds; only numeric columns are range-checked.
+    """
+
+    def __init__(self, columns=None, default=(0, None)):
+        self.columns = dict(columns or {})
+        self.default = default
+
+    def bounds(self, label, position):
+        if self.columns and all(isinstance(key, int) for key in self.columns):
+            return self.columns.get(position, self.default)
+        return self.columns.get(label, self.default)
+
+# The rule of the original cleaning script: no negative value anywhere
+NON_NEGATIVE = ValidityRules()
+# Only reject missing values, like dropna()
+COMPLETE = ValidityRules(default=(None, None))
+
+# Outcome of one filtering pass over a frame
+class FilterResult:
+    def __init__(self, source, missing, incomplete, invalid):
+        self.source = source
+        self.missing = missing          # Missing values per column
+        self._incomplete = incomplete   # Row has a missing value
+        self._invalid = invalid         # Row is complete but breaks a rule
+
+    @property
+    def complete_rows(self):
+        return len(self.source) - int(np.count_nonzero(self._incomplete))
+
+    @property
+    def valid_rows(self):
+        return self.complete_rows - int(np.count_nonzero(self._invalid))
+
+    @property
+    def mask(self):
+        """Boolean array marking the rows that are complete and valid"""
+        return ~(self._incomplete | self._invalid)
+
+    @property
+    def invalid_rows(self):
+        """Complete rows that break a validity rule (the report of the cleaning script)"""
+        return self.source[self._invalid]
+
+    @property
+    def frame(self):
+        """Rows that are complete and valid"""
+        return self.source[self.mask]
+
+# Missing-value counts, invalid-row report and filtered frame from one pass over the data
+def filter_rows(frame, rules=NON_NEGATIVE, block_rows=BLOCK_ROWS):
+    """Check every column of frame against rules, BLOCK_ROWS rows at a time
+
+    Replaces isnull().sum(), dropna() and the (data < 0) masks of the
+    cleaning script: each column is read once as a NumPy view and the only
+    full-length temporaries are two boolean row masks.
+    """
+    rows = len(frame)
+    checks = []
+    for position, label in enumerate(frame.columns):
+        values = frame.iloc[:, position].to_numpy()
+        low, high = rules.bounds(label, position) if values.dtype.kind in "biuf" else (None, None)
+        checks.append((values, low, high))
+    missing = np.zeros(len(checks), dtype=np.int64)
+    incomplete = np.zeros(rows, dtype=bool)
+    invalid = np.zeros(rows, dtype=bool)
+    for start in range(0, rows, block_rows):
+        stop = min(start + block_rows, rows)
+        block_incomplete = incomplete[start:stop]
+        block_invalid = invalid[start:stop]
+        for position, (values, low, high) in enumerate(checks):
+            block = values[start:stop]
+            if block.dtype.kind == "f":
+                absent = np.isnan(block)
+            elif block.dtype.kind in "biu":
+                absent = None  # Integer columns cannot hold missing values
+            else:
+                absent = pd.isna(block)
+            if absent is not None:
+                missing[position] += np.count_nonzero(absent)
+                block_incomplete |= absent
+            # NaN compares False, so missing values never count as out of range
+            if low is not None:
+                block_invalid |= block < low
+            if high is not None:
+                block_invalid |= block > high
+        block_invalid &= ~block_incomplete
+    return FilterResult(frame, pd.Series(missing, index=frame.columns), incomplete, invalid)
@@ -0,0 +1,185 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from row_filter import ValidityRules, filter_rows
+
+# MIT-BIH beats: 187 signal samples followed by the class label
+ECG_SIGNAL_COLUMNS = 187
+ECG_DTYPE = np.float32
+
+# Validity rules for the loaders' rules= argument. The MIT-BIH beats are scaled
+# to [0, 1] and labelled 0-4; in the diabetes data a zero glucose, blood
+# pressure or BMI is a missing measurement, not a reading.
+ECG_RULES = ValidityRules({ECG_SIGNAL_COLUMNS: (0, 4)}, default=(0, 1))
+DIABETES_RULES = ValidityRules({
+    "Glucose": (1, None),
+    "BloodPressure": (1, None),
+    "BMI": (1, None),
+    "Outcome": (0, 1)
+})
+
+# Binary snapshots of parsed CSVs live here, keyed by source path, mtime and size.
+# Only formats that cannot execute code on load are used (.npy without pickle, Feather).
+CACHE_DIR = os.environ.get("SENSOR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "sensor_loader"))
+
+def _cache_prefix(file_path):
+    """Snapshot path prefix shared by every version of file_path"""
+    path_key = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()[:8]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(file_path)}-{path_key}")
+
+def _cache_path(file_path, suffix):
+    """Snapshot path for the current version (mtime and size) of file_path"""
+    stat = os.stat(file_path)
+    version_key = hashlib.sha256(f"{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()[:8]
+    return f"{_cache_prefix(file_path)}.{version_key}{suffix}"
+
+def _replace_snapshot(file_path, writes):
+    """Drop stale snapshots of file_path, then atomically write each (path, write) in order
+
+    The file readers check for goes last, so a crash never leaves it
+    without its companions.
+    """
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    for stale in glob.glob(glob.escape(_cache_prefix(file_path)) + ".*"):
+        os.remove(stale)
+    for path, write in writes:
+        temp_path = path + ".tmp"
+        write(temp_path)
+        os.replace(temp_path, path)
+
+def _feather_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _usecols_in_file_order(columns, usecols):
+    """Positions of usecols (names or positions) in file order, as read_csv returns them"""
+    usecols = list(usecols)
+    if all(isinstance(column, int) for column in usecols):
+        missing = sorted(set(usecols) - set(range(len(columns))))
+        positions = sorted(set(usecols))
+    else:
+        wanted = {str(column) for column in usecols}
+        missing = sorted(wanted - set(columns))
+        positions = [position for position, column in enumerate(columns) if column in wanted]
+    if missing:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+    return positions
+
+# Memory-mapped float32 snapshot of the whole ECG matrix
+def _ecg_snapshot(file_path, build):
+    """Return (matrix, columns) from the .npy snapshot, building it if asked"""
+    cache_path = _cache_path(file_path, ".npy")
+    columns_path = cache_path[:-len(".npy")] + ".columns.json"
+    if not os.path.exists(cache_path):
+        if not build:
+            return None, None
+        data = pd.read_csv(file_path, dtype=ECG_DTYPE)
+
+        def write_columns(path):
+            with open(path, "w") as f:
+                json.dump([str(column) for column in data.columns], f)
+
+        def write_matrix(path):
+            with open(path, "wb") as f:
+                np.save(f, data.to_numpy())
+
+        _replace_snapshot(file_path, [(columns_path, write_columns), (cache_path, write_matrix)])
+    with open(columns_path) as f:
+        columns = json.load(f)
+    return np.load(cache_path, mmap_mode="r"), columns
+
+def _ecg_frame(matrix, columns, start, stop, usecols):
+    """Rows [start, stop) of the snapshot; only the selected columns are copied out of the map"""
+    if usecols is None:
+        rows = matrix[start:stop]
+    else:
+        positions = _usecols_in_file_order(columns, usecols)
+        rows = matrix[start:stop, positions]
+        columns = [columns[position] for position in positions]
+    return pd.DataFrame(rows, columns=columns, index=pd.RangeIndex(start, start + len(rows)))
+
+def _filtered(frame, rules):
+    return frame if rules is None else filter_rows(frame, rules).frame
+
+# Read (part of) the MIT-BIH ECG CSV with compact float32 columns
+@metrics.timed("read_ecg")
+def read_ecg(file_path, nrows=None, usecols=None, cache=True, rules=None):
+    """Load ECG rows; nrows stops parsing early instead of reading the whole file
+
+    With cache=True a full load converts the CSV once into a memory-mapped
+    .npy snapshot that later loads (full or partial) are served from.
+    rules (e.g. ECG_RULES) drops incomplete and out-of-range rows.
+    """
+    if cache:
+        matrix, columns = _ecg_snapshot(file_path, build=nrows is None)
+        if matrix is not None:
+            return _filtered(_ecg_frame(matrix, columns, 0, nrows, usecols), rules)
+    return _filtered(pd.read_csv(file_path, nrows=nrows, usecols=usecols, dtype=ECG_DTYPE), rules)
+
+def _read_feather(cache_path, nrows, usecols):
+    """Memory-map a Feather snapshot and convert only the requested rows and columns"""
+    from pyarrow import feather
+
+    table = feather.read_table(cache_path, memory_map=True)
+    if usecols is not None:
+        table = table.select(_usecols_in_file_order(table.column_names, usecols))
+    if nrows is not None:
+        table = table.slice(0, nrows)
+    return table.to_pandas()
+
+# Read (part of) a diabetes CSV
+@metrics.timed("read_diabetes")
+def read_diabetes(file_path, nrows=None, usecols=None, cache=True, rules=None):
+    """Load diabetes rows, optionally only the first nrows and selected columns
+
+    With cache=True and pyarrow installed, a full load is snapshotted to
+    Feather and later loads read only the rows and columns they need from
+    the memory-mapped snapshot. rules (e.g. DIABETES_RULES) drops
+    incomplete and out-of-range rows.
+    """
+    if cache and _feather_available():
+        cache_path = _cache_path(file_path, ".feather")
+        if not os.path.exists(cache_path) and nrows is None:
+            data = pd.read_csv(file_path)
+
+            def write(path):
+                # Uncompressed, so a memory-mapped read of a few rows or columns copies only those
+                data.to_feather(path, compression="uncompressed")
+
+            _replace_snapshot(file_path, [(cache_path, write)])
+        if os.path.exists(cache_path):
+            return _filtered(_read_feather(cache_path, nrows, usecols), rules)
+    return _filtered(pd.read_csv(file_path, nrows=nrows, usecols=usecols), rules)
+
+# Stream a CSV as consecutive windows of rows
+def iter_windows(file_path, window_size, usecols=None, dtype=None, nrows=None, rules=None):
+    """Yield DataFrames of window_size rows; only one window is held in memory at a time
+
+    With rules, each window keeps only its complete, in-range rows.
+    """
+    with pd.read_csv(file_path, chunksize=window_size, usecols=usecols, dtype=dtype, nrows=nrows) as reader:
+        for window in reader:
+            yield _filtered(window, rules)
+
+def iter_ecg_windows(file_path, window_size, usecols=None, nrows=None, cache=True, rules=None):
+    """Yield windows of ECG rows as float32 DataFrames (sliced from the snapshot if one exists)"""
+    matrix, columns = _ecg_snapshot(file_path, build=False) if cache else (None, None)
+    if matrix is None:
+        yield from iter_windows(file_path, window_size, usecols=usecols, dtype=ECG_DTYPE, nrows=nrows, rules=rules)
+        return
+    stop = len(matrix) if nrows is None else min(nrows, len(matrix))
+    for start in range(0, stop, window_size):
+        yield _filtered(_ecg_frame(matrix, columns, start, min(start + window_size, stop), usecols), rules)
+
+def iter_diabetes_windows(file_path, window_size, usecols=None, nrows=None, rules=None):
+    """Yield windows of diabetes rows"""
+    return iter_windows(file_path, window_size, usecols=usecols, nrows=nrows, rules=rules)
@@ -0,0 +1,150 @@
+import math
+
+import heart_rate
+import sensor_loader
+
+# Running mean and (population) standard deviation with Welford's algorithm
+class RunningStats:
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        """Fold one value into the statistics in O(1) time and memory"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        """Population standard deviation, the same as np.std's default"""
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+
+# Per-patient windowed statistics over a stream of sensor readings
+class WindowAggregator:
+    """Turn readings into one sensor_stats dictionary per patient and window
+
+    Windows are `size` time units long and start every `step` units from
+    time 0 (step == size gives tumbling windows, a smaller step sliding
+    ones), on one grid shared by every patient. Each open window keeps only
+    a RunningStats per field. A window is emitted as soon as a later
+    reading for the same patient passes its end, or once the watermark
+    (the latest time seen from any patient minus `lateness`) passes it, so
+    idle patients do not hold windows open. Readings must arrive in time
+    order per patient and have times >= 0; a reading that falls in an
+    already closed window is left out of it and counted in late_readings.
+    """
+
+    def __init__(self, size, step=None, fields=("heart_rate", "glucose"), lateness=0):
+        if size <= 0 or (step is not None and not 0 < step <= size):
+            raise ValueError("Window size must be positive and 0 < step <= size")
+        if lateness < 0:
+            raise ValueError("Lateness must be >= 0")
+        self.size = size
+        self.step = size if step is None else step
+        self.fields = tuple(fields)
+        self.lateness = lateness
+        self.watermark = 0  # Every window ending at or before this is closed
+        self.late_readings = 0
+        self._windows = {}  # window_start -> {patient_id: {field: RunningStats}}
+
+    def _stats(self, patient_id, window_start, window_stats):
+        stats = {
+            "patient_id": patient_id,
+            "window_start": window_start,
+            "window_end": window_start + self.size,
+            "count": window_stats[self.fields[0]].count
+        }
+        for field in self.fields:
+            stats[f"{field}_mean"] = window_stats[field].mean
+            stats[f"{field}_std"] = window_stats[field].std
+        return stats
+
+    def _close_patient(self, patient_id, time):
+        """Stats of the patient's windows that end at or before time"""
+        emitted = []
+        for window_start in sorted(self._windows):
+            if window_start + self.size > time:
+                break
+            patients = self._windows[window_start]
+            window_stats = patients.pop(patient_id, None)
+            if window_stats is not None:
+                emitted.append(self._stats(patient_id, window_start, window_stats))
+                if not patients:
+                    del self._windows[window_start]
+        return emitted
+
+    def _close_until(self, watermark):
+        """Stats of every patient's windows that end at or before watermark"""
+        emitted = []
+        for window_start in sorted(self._windows):
+            if window_start + self.size > watermark:
+                break
+            for patient_id, window_stats in self._windows.pop(window_start).items():
+                emitted.append(self._stats(patient_id, window_start, window_stats))
+        return emitted
+
+    def add(self, patient_id, time, reading):
+        """Add one reading; return the stats of the windows it closed"""
+        if time < 0:
+            raise ValueError(f"Reading times must be >= 0 (windows start at time 0), got {time}")
+        emitted = self._close_patient(patient_id, time)
+        first = (math.floor((time - self.size) / self.step) + 1) * self.step
+        window_start = max(first, 0)  # No windows before time 0
+        late = False
+        while window_start <= time:
+            if window_start + self.size <= self.watermark:
+                late = True
+            else:
+                patients = self._windows.setdefault(window_start, {})
+                window_stats = patients.get(patient_id)
+                if window_stats is None:
+                    window_stats = patients[patient_id] = {field: RunningStats() for field in self.fields}
+                for field in self.fields:
+                    window_stats[field].add(reading[field])
+            window_start += self.step
+        self.late_readings += late
+        if time - self.lateness > self.watermark:
+            self.watermark = time - self.lateness
+            emitted.extend(self._close_until(self.watermark))
+        return emitted
+
+    def flush(self):
+        """Emit every window still open, e.g. at the end of a dataset"""
+        emitted = self._close_until(float("inf"))
+        self._windows = {}
+        return emitted
+
+# Readings from the ECG and diabetes CSVs, row i of each paired as in the sensor scripts
+def iter_csv_readings(ecg_path, diabetes_path, glucose_column="Glucose", patients=1, chunk_rows=10000):
+    """Yield (patient_id, time, reading) tuples, streaming both files chunk by chunk
+
+    Row i goes to patient P{i % patients + 1:03d} at time i // patients, so
+    each patient gets one reading per time unit.
+    """
+    ecg_windows = sensor_loader.iter_ecg_windows(ecg_path, chunk_rows)
+    glucose_windows = sensor_loader.iter_diabetes_windows(diabetes_path, chunk_rows, usecols=[glucose_column])
+    row = 0
+    for ecg, glucose in zip(ecg_windows, glucose_windows):
+        heart_rates = heart_rate.estimate_heart_rates(ecg.iloc[:, :-1].to_numpy())
+        for rate, level in zip(heart_rates.tolist(), glucose[glucose_column].tolist()):
+            patient_id = f"P{str(row % patients + 1).zfill(3)}"
+            yield patient_id, row // patients, {"heart_rate": rate, "glucose": level}
+            row += 1
+
+# Feed a reading stream through an aggregator into a blockchain in one pass
+def stream_to_blockchain(readings, blockchain, aggregator):
+    """Append one sensor_stats block per closed window; return the number of blocks added"""
+    added = 0
+    for patient_id, time, reading in readings:
+        for stats in aggregator.add(patient_id, time, reading):
+            blockchain.add_block(stats)
+            added += 1
+    for stats in aggregator.flush():
+        blockchain.add_block(stats)
+        added += 1
+    return added
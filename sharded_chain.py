@@ -0,0 +1,128 @@
+import multiprocessing
+import zlib
+
+from blockchain import Blockchain
+
+# Readings a shard gets per message; larger batches mean fewer pipe round trips
+BATCH_SIZE = 1000
+
+def shard_of(patient_id, shards):
+    """Shard of a patient; stable across processes and runs (unlike hash())"""
+    return zlib.crc32(str(patient_id).encode()) % shards
+
+# Worker: owns one shard's chain and serves requests from the parent
+def _shard_worker(connection, blockchain_class, path, kwargs):
+    blockchain = blockchain_class(path=path, **kwargs) if path is not None else blockchain_class(**kwargs)
+    with blockchain, connection:
+        while True:
+            command, argument = connection.recv()
+            if command == "append":
+                for reading in argument:
+                    blockchain.add_block(reading)
+            elif command == "head":
+                head = blockchain.chain[-1]
+                connection.send((head.index, head.current_hash))
+            elif command == "verify":
+                chain = blockchain.chain
+                anchored = all(index < len(chain) and chain[index].current_hash == block_hash
+                               for index, block_hash in argument)
+                connection.send(anchored and blockchain.verify_chain(full=True))
+            elif command == "close":
+                break
+
+# Patients spread over independent chains, tied together by an anchor chain
+class ShardedBlockchain:
+    """Append readings to N shard chains, each in its own worker process
+
+    Readings are routed by patient_id, so one patient's blocks stay in
+    order on one shard. Every anchor_interval readings (and on close) the
+    head index and hash of every shard are committed as one block of the
+    anchor chain; verify_chain() checks the anchor chain and that every
+    anchored head is still in its shard. With path set, shard n is stored
+    at "<path>.shard<n>" and the anchor chain at "<path>.anchor".
+    """
+
+    def __init__(self, shards=4, blockchain_class=Blockchain, anchor_interval=10000, path=None,
+                 batch_size=BATCH_SIZE, **kwargs):
+        self.shards = shards
+        self.anchor_interval = anchor_interval
+        self.batch_size = batch_size
+        self.anchor_chain = Blockchain(path=f"{path}.anchor") if path is not None else Blockchain()
+        self._buffers = [[] for _ in range(shards)]
+        self._since_anchor = 0
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        self._connections = []
+        self._workers = []
+        for n in range(shards):
+            parent, child = context.Pipe()
+            shard_path = f"{path}.shard{n}" if path is not None else None
+            worker = context.Process(target=_shard_worker, args=(child, blockchain_class, shard_path, kwargs),
+                                     daemon=True)
+            worker.start()
+            child.close()
+            self._connections.append(parent)
+            self._workers.append(worker)
+
+    def add_block(self, sensor_data):
+        """Queue a reading for its patient's shard"""
+        shard = shard_of(sensor_data["patient_id"], self.shards)
+        buffer = self._buffers[shard]
+        buffer.append(sensor_data)
+        if len(buffer) >= self.batch_size:
+            self._connections[shard].send(("append", buffer))
+            self._buffers[shard] = []
+        self._since_anchor += 1
+        if self.anchor_interval and self._since_anchor >= self.anchor_interval:
+            self.anchor()
+
+    def flush(self):
+        """Send every buffered reading to its shard"""
+        for shard, buffer in enumerate(self._buffers):
+            if buffer:
+                self._connections[shard].send(("append", buffer))
+                self._buffers[shard] = []
+
+    def heads(self):
+        """(index, hash) of every shard's last block, once all sent readings are appended"""
+        self.flush()
+        for connection in self._connections:
+            connection.send(("head", None))
+        return [connection.recv() for connection in self._connections]
+
+    def anchor(self):
+        """Commit the current shard heads to the anchor chain"""
+        heads = self.heads()
+        self._since_anchor = 0
+        return self.anchor_chain.add_block({
+            "shard_heads": [{"shard": n, "index": index, "hash": block_hash}
+                            for n, (index, block_hash) in enumerate(heads)]
+        })
+
+    def _anchored_heads(self):
+        anchored = [[] for _ in range(self.shards)]
+        for block in self.anchor_chain.chain[1:]:
+            for head in block.sensor_data["shard_heads"]:
+                anchored[head["shard"]].append((head["index"], head["hash"]))
+        return anchored
+
+    def verify_chain(self):
+        """Verify the anchor chain and every shard (in parallel) against its anchored heads"""
+        self.flush()
+        if not self.anchor_chain.verify_chain(full=True):
+            return False
+        for connection, anchored in zip(self._connections, self._anchored_heads()):
+            connection.send(("verify", anchored))
+        return all([connection.recv() for connection in self._connections])
+
+    def close(self):
+        """Anchor the final heads and stop the workers"""
+        self.anchor()
+        for connection in self._connections:
+            connection.send(("close", None))
+            connection.close()
+        for worker in self._workers:
+            worker.join()
+        self.anchor_chain.close()
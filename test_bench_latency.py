@@ -0,0 +1,18 @@
+import importlib.util
+import os
+
+spec = importlib.util.spec_from_file_location(
+    "bench_latency", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "bench_latency.py"))
+bench_latency = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_latency)
+
+def test_summarize_reports_percentiles_in_microseconds():
+    row = bench_latency.summarize("append", "chain", 10, [1000 * n for n in range(1, 101)])
+    assert row["samples"] == 100
+    assert row["p50_us"] == 50.5 and row["max_us"] == 100
+    assert len(row["curve_us"]) == 100
+
+def test_summarize_of_no_samples():
+    row = bench_latency.summarize("query", "chain", 10, [])
+    assert row["samples"] == 0 and row["p99_us"] is None and row["curve_us"] == []
+    assert bench_latency.summarize("query", "chain", 10, [2000])["p50_us"] == 2.0
@@ -0,0 +1,291 @@
+import gc
+import hashlib
+import json
+import pickle
+
+import pytest
+
+import blockchain
+from blockchain import Block, Blockchain
+
+def reading(i):
+    return {"heart_rate": 60 + i % 40, "glucose": 90 + i % 50}
+
+def build(blocks=50, **kwargs):
+    chain = Blockchain(**kwargs)
+    for i in range(blocks):
+        chain.add_block(reading(i))
+    return chain
+
+def test_incremental_verify_only_checks_new_blocks():
+    chain = build(checkpoint_interval=10)
+    assert chain.verify_chain()
+    assert chain.verified_upto == 50
+    for i in range(50, 60):
+        chain.add_block(reading(i))
+    assert chain.verify_chain()
+    assert chain.verified_upto == 60
+
+def test_tamper_after_watermark_is_detected(capsys):
+    chain = build()
+    assert chain.verify_chain()
+    chain.add_block(reading(50))
+    chain.chain[51].sensor_data["glucose"] = 500
+    assert not chain.verify_chain()
+    assert "Block 51: Hash mismatch" in capsys.readouterr().out
+    assert chain.verified_upto == 50
+
+def test_full_verify_catches_tamper_behind_watermark():
+    chain = build()
+    assert chain.verify_chain()
+    chain.chain[20].sensor_data["glucose"] = 500
+    assert chain.verify_chain()  # Incremental: block 20 was already verified
+    assert not chain.verify_chain(full=True)
+
+def test_checkpoints_are_signed_and_detect_tampering(capsys):
+    chain = build(checkpoint_interval=10)
+    assert chain.verify_chain()
+    assert [checkpoint.index for checkpoint in chain.checkpoints] == [10, 20, 30, 40, 50]
+    chain.chain[30].current_hash = chain.chain[30].calculate_hash()[::-1]
+    assert not chain.verify_chain(full=True)
+    assert "checkpoint 30: Signature mismatch" in capsys.readouterr().out
+
+def test_replaced_watermark_block_falls_back_to_checkpoint():
+    chain = build(checkpoint_interval=10)
+    assert chain.verify_chain()
+    # Rewriting the tail (watermark block included) moves the resume point back to the last checkpoint
+    chain.chain[45].sensor_data["glucose"] = 1
+    for block in chain.chain[45:]:
+        block.previous_hash = chain.chain[block.index - 1].current_hash
+        block.current_hash = block.calculate_hash()
+    assert chain._resume_point() == 40
+
+def test_failed_check_keeps_everything_before_it_verified():
+    chain = build()
+    chain.chain[30].sensor_data["glucose"] = 500
+    assert not chain.verify_chain()
+    assert chain.verified_upto == 29
+    assert not chain.verify_chain()  # The tampered block stays unverified
+
+def test_parallel_verify_reports_the_sequential_failure(capsys):
+    sequential, parallel = build(200), build(200)
+    for chain in (sequential, parallel):
+        chain.chain[150].sensor_data["glucose"] = 500
+        chain.chain[120].previous_hash = "f" * 64
+        chain.chain[120].current_hash = chain.chain[120].calculate_hash()  # Broken link, consistent hash
+    assert not sequential.verify_chain()
+    expected = capsys.readouterr().out
+    assert not parallel.verify_chain(workers=2)
+    assert capsys.readouterr().out == expected
+    assert "Block 120: Previous hash mismatch" in expected
+    assert parallel.verified_upto == sequential.verified_upto == 119
+
+def test_parallel_verify_of_a_valid_chain():
+    chain = build(200)
+    assert chain.verify_chain(workers=2)
+    assert chain.verified_upto == 200
+
+def test_legacy_format_reproduces_the_original_hash():
+    block = blockchain.Block(3, "ab" * 32, 1700000000.5, reading(3), hash_format=blockchain.HASH_FORMAT_LEGACY)
+    preimage = f"{block.index}{block.previous_hash}{block.timestamp}{json.dumps(block.sensor_data)}"
+    assert block.current_hash == hashlib.sha256(preimage.encode()).hexdigest()
+
+def test_v1_hash_ignores_key_order_and_separates_fields():
+    first = blockchain.Block(1, "0", 1.0, {"heart_rate": 70, "glucose": 95})
+    reordered = blockchain.Block(1, "0", 1.0, {"glucose": 95, "heart_rate": 70})
+    assert first.current_hash == reordered.current_hash
+    # "1" + "23..." and "12" + "3..." concatenate to the same legacy string, not the same V1 preimage
+    legacy = [blockchain.Block(index, previous, 1.0, {}, hash_format=blockchain.HASH_FORMAT_LEGACY)
+              for index, previous in ((1, "23"), (12, "3"))]
+    assert legacy[0].current_hash == legacy[1].current_hash
+    v1 = [blockchain.Block(index, previous, 1.0, {}) for index, previous in ((1, "23"), (12, "3"))]
+    assert v1[0].current_hash != v1[1].current_hash
+
+def test_chain_uses_its_hash_format():
+    chain = build(5, hash_format=blockchain.HASH_FORMAT_LEGACY)
+    assert all(block.hash_format == blockchain.HASH_FORMAT_LEGACY for block in chain.chain)
+    assert chain.verify_chain(full=True)
+
+def test_compact_chain_round_trips_blocks():
+    plain, compact = Blockchain(), Blockchain(compact=True)
+    for i in range(20):
+        data = {"heart_rate": 60 + i, "glucose": 90.5 + i}
+        for chain in (plain, compact):
+            block = chain.add_block(dict(data))
+    assert isinstance(compact.chain, blockchain.CompactChain)
+    assert compact.chain.fields == ("heart_rate", "glucose")  # From genesis_data
+    for block in compact.chain:
+        assert block.current_hash == block.calculate_hash()
+        assert type(block.sensor_data["heart_rate"]) is int
+    assert [block.sensor_data for block in compact.chain[1:]] == [block.sensor_data for block in plain.chain[1:]]
+    assert compact.chain[-1].previous_hash == compact.chain[-2].current_hash
+    assert compact.verify_chain(full=True)
+    assert not compact.chain._overflow
+
+def test_compact_chain_declared_fields_and_misfit_warning():
+    fields = ("heart_rate_mean", "glucose_mean")
+    chain = Blockchain(compact=True, compact_fields=fields)
+    chain.add_block({"heart_rate_mean": 70.0, "glucose_mean": 95.0})
+    assert chain.chain.fields == fields
+    with pytest.warns(RuntimeWarning, match="does not fit the compact columns"):
+        chain.add_block({"heart_rate_mean": "high", "glucose_mean": 95.0})
+    chain.add_block({"other": 1})  # Warned only once per chain
+    assert chain.chain[2].sensor_data == {"heart_rate_mean": "high", "glucose_mean": 95.0}
+    assert chain.verify_chain(full=True)
+
+def test_compact_chain_views_are_read_only():
+    chain = build(5, compact=True)
+    block = chain.chain[3]
+    with pytest.raises(AttributeError):
+        block.sensor_data = {"heart_rate": 0, "glucose": 0}
+    with pytest.raises(AttributeError):
+        block.current_hash = "0" * 64
+    with pytest.raises(TypeError):
+        block.sensor_data["glucose"] = 500
+    with pytest.raises(TypeError):
+        block.sensor_data.update(glucose=500)
+    assert isinstance(block, Block)
+    assert chain.verify_chain(full=True)
+
+def test_compact_chain_views_pickle_as_plain_blocks():
+    block = build(3, compact=True).chain[2]
+    copy = pickle.loads(pickle.dumps(block))
+    assert type(copy) is Block and type(copy.sensor_data) is dict
+    assert copy.current_hash == block.current_hash == copy.calculate_hash()
+    copy.sensor_data["glucose"] = 1  # Copies are ordinary, mutable blocks
+
+def test_load_blocks_keeps_compact_fields():
+    fields = ("heart_rate_mean", "glucose_mean")
+    chain = Blockchain(compact=True, compact_fields=fields)
+    chain.add_block({"heart_rate_mean": 70.0, "glucose_mean": 95.0})
+    chain.load_blocks(list(chain.chain), verified=True)
+    assert chain.chain.fields == fields
+    assert list(chain.chain._overflow) == [0]  # Only the placeholder genesis data
+
+def test_disk_chain_round_trip(tmp_path):
+    path = str(tmp_path / "chain")
+    with build(30, path=path, sync_every=7) as chain:
+        hashes = [block.current_hash for block in chain.chain]
+        data = [block.sensor_data for block in chain.chain]
+    with Blockchain(path=path) as reopened:
+        assert [block.current_hash for block in reopened.chain] == hashes
+        assert [block.sensor_data for block in reopened.chain] == data
+        assert reopened.verify_chain(full=True)
+        reopened.add_block(reading(30))
+    assert len(Blockchain(path=path).chain) == 32
+
+def test_disk_chain_context_manager_and_finalizer_write_pending_blocks(tmp_path):
+    with Blockchain(path=str(tmp_path / "managed"), sync_every=1000) as chain:
+        chain.add_block(reading(1))
+    assert len(Blockchain(path=str(tmp_path / "managed")).chain) == 2
+    chain = Blockchain(path=str(tmp_path / "forgotten"), sync_every=1000)
+    chain.add_block(reading(1))
+    del chain
+    gc.collect()
+    assert len(Blockchain(path=str(tmp_path / "forgotten")).chain) == 2
+
+@pytest.mark.parametrize("sensor_data", [
+    {"heart_rate": (70, 71)},
+    {1: 70},
+    {"readings": [{"heart_rate": 70, "at": (1, 2)}]},
+])
+def test_disk_chain_rejects_payloads_json_would_change(tmp_path, sensor_data):
+    with Blockchain(path=str(tmp_path / "chain")) as chain:
+        with pytest.raises(ValueError, match="Block 1"):
+            chain.add_block(sensor_data)
+        assert len(chain.chain) == 1
+        chain.add_block({"readings": [{"heart_rate": 70, "ok": None, "flag": True}]})
+        assert chain.verify_chain(full=True)
+
+def test_reopened_disk_chain_resumes_from_its_signed_watermark(tmp_path):
+    path, key = str(tmp_path / "chain"), b"k" * 32
+    with build(25, path=path, checkpoint_key=key, checkpoint_interval=10) as chain:
+        assert chain.verify_chain()
+    with Blockchain(path=path, checkpoint_key=key) as reopened:
+        assert reopened.verified_upto == 25
+        assert [checkpoint.index for checkpoint in reopened.checkpoints] == [10, 20]
+        assert reopened._resume_point() == 25
+    with Blockchain(path=path) as other_key:  # A different key trusts nothing that was saved
+        assert other_key.verified_upto == 0
+        assert other_key.checkpoints == []
+
+def test_forged_watermark_is_ignored(tmp_path):
+    path, key = str(tmp_path / "chain"), b"k" * 32
+    with build(25, path=path, checkpoint_key=key) as chain:
+        assert chain.verify_chain()
+    state_path = path + ".verified"
+    with open(state_path) as f:
+        state = json.load(f)
+    state["verified_upto"], state["block_hash"] = 20, "0" * 64
+    with open(state_path, "w") as f:
+        json.dump(state, f)
+    with Blockchain(path=path, checkpoint_key=key) as reopened:
+        assert reopened.verified_upto == 0
+
+def patient_reading(i, patient_id):
+    return {"patient_id": patient_id, **reading(i)}
+
+def test_indexes_are_maintained_on_append():
+    chain = Blockchain()
+    for i in range(30):
+        chain.add_block(patient_reading(i, f"P{i % 3}"))
+        assert len(chain._time_index.positions) == len(chain.chain)  # Indexed before any query
+    assert chain._time_index.positions.typecode == "q"
+    assert [block.index for block in chain.blocks_for_patient("P1")] == list(range(2, 31, 3))
+    middle = chain.chain[10].timestamp, chain.chain[20].timestamp
+    assert [block.index for block in chain.blocks_between(*middle)] == list(range(10, 21))
+    assert chain.blocks_for_patient("P9") == []
+
+def test_indexes_cover_ingest_batches_and_lists():
+    chain = Blockchain()
+    chain.add_block({"readings": [patient_reading(1, "P1"), patient_reading(2, "P2")]})
+    chain.add_block([patient_reading(3, "P2")])
+    assert [block.index for block in chain.blocks_for_patient("P1")] == [1]
+    assert [block.index for block in chain.blocks_for_patient("P2")] == [1, 2]
+
+def test_indexes_are_rebuilt_when_the_chain_is_replaced():
+    chain, other = Blockchain(), Blockchain()
+    for i in range(5):
+        chain.add_block(patient_reading(i, "P1"))
+        other.add_block(patient_reading(i, "P2" if i % 2 else "P1"))
+    other.add_block(patient_reading(5, "P2"))
+    chain.load_blocks(list(other.chain), verified=True)  # Longer replacement
+    assert [block.index for block in chain.blocks_for_patient("P1")] == [1, 3, 5]
+    assert [block.index for block in chain.blocks_for_patient("P2")] == [2, 4, 6]
+    assert chain.blocks_between() == list(chain.chain)
+
+def test_out_of_order_timestamps_are_inserted_sorted():
+    chain = Blockchain()
+    for timestamp, patient_id in ((5.0, "P1"), (3.0, "P1"), (4.0, "P1")):
+        chain._append(Block(len(chain.chain), chain.chain[-1].current_hash, timestamp, patient_reading(0, patient_id)))
+    assert [block.timestamp for block in chain.blocks_for_patient("P1")] == [3.0, 4.0, 5.0]
+    assert [block.index for block in chain.blocks_between(3.5, 5.0)] == [3, 1]
+
+def test_reopened_disk_chain_is_indexed_on_the_first_query(tmp_path):
+    path = str(tmp_path / "chain")
+    with Blockchain(path=path) as chain:
+        chain.add_block(patient_reading(1, "P1"))
+    with Blockchain(path=path) as reopened:
+        assert reopened._indexed_upto == 0
+        reopened.add_block(patient_reading(2, "P1"))  # Not indexed ahead of the older blocks
+        assert [block.index for block in reopened.blocks_for_patient("P1")] == [1, 2]
+        reopened.add_block(patient_reading(3, "P1"))  # Caught up: indexed on append
+        assert reopened._indexed_upto == 4
+
+def test_reopening_a_disk_chain_reads_no_payloads(tmp_path, monkeypatch):
+    path, key = str(tmp_path / "chain"), b"k" * 32
+    with Blockchain(path=path, checkpoint_key=key, checkpoint_interval=10) as chain:
+        for i in range(25):
+            chain.add_block(patient_reading(i, "P1"))
+        assert chain.verify_chain()
+
+    def read_payload(self, i):
+        raise AssertionError(f"payload of block {i} was read")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(blockchain.DiskChain, "_view", read_payload)
+        reopened = Blockchain(path=path, checkpoint_key=key)
+        assert reopened.verified_upto == 25 and len(reopened.checkpoints) == 2
+        assert reopened._resume_point() == 25
+    assert len(reopened.blocks_for_patient("P1")) == 25
+    reopened.close()
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+import chain_io
+import merkle
+from blockchain import Blockchain
+
+def build(blocks=30):
+    chain = Blockchain()
+    for i in range(blocks):
+        chain.add_block({"patient_id": f"P00{i % 3 + 1}", "heart_rate": 60 + i, "glucose": 90.5 + i})
+    return chain
+
+@pytest.mark.parametrize("export", [chain_io.export_ndjson, chain_io.export_binary])
+def test_round_trip_keeps_every_block(tmp_path, export):
+    chain, path = build(), str(tmp_path / "chain.export")
+    assert export(chain, path) == 31
+    imported = chain_io.import_chain(path, Blockchain())
+    assert [block.current_hash for block in imported.chain] == [block.current_hash for block in chain.chain]
+    assert [block.sensor_data for block in imported.chain] == [block.sensor_data for block in chain.chain]
+    assert imported.verified_upto == 30
+    assert imported.verify_chain(full=True)
+    assert [block.index for block in imported.blocks_for_patient("P002")] == list(range(2, 31, 3))
+
+@pytest.mark.parametrize("export", [chain_io.export_ndjson, chain_io.export_binary])
+def test_extra_header_fields_round_trip(tmp_path, export):
+    chain = merkle.MerkleBlockchain()
+    chain.add_batch([{"heart_rate": 70}, {"heart_rate": 71}, {"heart_rate": 72}])
+    path = str(tmp_path / "merkle.export")
+    export(chain, path)
+    imported = chain_io.import_chain(path, merkle.MerkleBlockchain())
+    assert imported.chain[1].merkle_root == chain.chain[1].merkle_root
+    assert imported.verify_chain(full=True)
+
+def test_tampered_export_is_rejected(tmp_path):
+    path = tmp_path / "chain.ndjson"
+    chain_io.export_ndjson(build(), str(path))
+    lines = path.read_text().splitlines()
+    record = json.loads(lines[12])
+    record["sensor_data"]["glucose"] = 500
+    lines[12] = json.dumps(record)
+    path.write_text("\n".join(lines) + "\n")
+    with pytest.raises(ValueError, match="Block 12: Hash mismatch"):
+        chain_io.import_chain(str(path), Blockchain())
+    assert len(list(chain_io.iter_export(str(path), verify=False))) == 31
+
+def test_truncated_binary_export_is_rejected(tmp_path):
+    path = tmp_path / "chain.bin"
+    chain_io.export_binary(build(5), str(path))
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError, match="truncated"):
+        list(chain_io.iter_binary(str(path)))
+
+def test_print_chain_summarizes_long_chains(capsys):
+    build(30).print_chain(head=2, tail=1)
+    out = capsys.readouterr().out
+    assert out.count('"Index"') == 3
+    assert "... 28 blocks not shown ..." in out and "31 blocks in total" in out
+
+def test_tampered_merkle_body_is_rejected(tmp_path):
+    chain = merkle.MerkleBlockchain()
+    chain.add_batch([{"heart_rate": 70}, {"heart_rate": 71}])
+    chain.add_batch([{"heart_rate": 72}])
+    path = tmp_path / "merkle.ndjson"
+    chain_io.export_ndjson(chain, str(path))
+    path.write_text(path.read_text().replace('{"heart_rate":70}', '{"heart_rate":999}'))
+    with pytest.raises(ValueError, match="Block 1: Body does not match its header"):
+        chain_io.import_chain(str(path), merkle.MerkleBlockchain())
+    unverified = chain_io.import_chain(str(path), merkle.MerkleBlockchain(), verify=False)
+    assert not unverified.verify_chain()
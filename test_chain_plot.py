@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import chain_plot
+from blockchain import Blockchain
+
+@pytest.mark.parametrize("count, per_row", [(1, 1), (10, 3), (100, 7), (12, 4)])
+def test_ribbon_keeps_consecutive_cells_adjacent(count, per_row):
+    rows, columns = chain_plot.ribbon_layout(count, per_row)
+    steps = np.abs(np.diff(rows)) + np.abs(np.diff(columns))
+    assert (steps == 1).all()
+    assert len(set(zip(rows.tolist(), columns.tolist()))) == count
+    assert columns.min() >= 0 and columns.max() < per_row
+
+def test_bin_values_averages_consecutive_blocks():
+    assert chain_plot.bin_values([1, 3, 5, 7, 9], 2).tolist() == [2.0, 6.0, 9.0]
+
+def test_block_values_default_to_seconds_between_blocks():
+    chain = Blockchain()
+    for i in range(3):
+        chain.add_block({"heart_rate": 60 + i, "glucose": 90})
+    gaps = chain_plot.block_values(chain.chain)
+    assert gaps[0] == 0 and len(gaps) == 4 and (gaps >= 0).all()
+    assert chain_plot.block_values(chain.chain, lambda block: block.index).tolist() == [0, 1, 2, 3]
+
+def test_large_chains_are_binned_to_the_cell_limit(tmp_path):
+    pytest.importorskip("matplotlib")
+    path = tmp_path / "chain.png"
+    size = chain_plot.render_chain(str(path), np.arange(10_000), highlight=[9_999], max_cells=1_000)
+    assert size == 10 and path.stat().st_size > 0
+
+def test_small_chains_are_drawn_block_by_block(tmp_path):
+    pytest.importorskip("matplotlib")
+    from matplotlib.figure import Figure
+
+    ax = Figure().add_subplot()
+    assert chain_plot.draw_chain(ax, np.ones(20), highlight=[3]) == 1
+    assert len(ax.texts) == 20
+    assert chain_plot.render_chain(str(tmp_path / "empty.svg"), []) == 1
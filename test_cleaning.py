@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cleaning
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame({
+        "Glucose": rng.integers(-5, 200, 500).astype(float),
+        "BMI": rng.normal(30, 6, 500).round(1),
+        "Age": rng.integers(21, 80, 500),
+        "Constant": np.ones(500),
+        "Label": rng.choice(["a", "b"], 500)
+    })
+    frame.loc[rng.choice(500, 40, replace=False), "BMI"] = np.nan
+    path = tmp_path / "raw.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+def in_memory(path):
+    """The original script's sequence, whole file at once"""
+    from sklearn.preprocessing import MinMaxScaler
+
+    data = pd.read_csv(path).dropna()
+    numeric = data.select_dtypes(include=[np.number]).columns
+    data = data[~(data[numeric] < 0).any(axis=1)].copy()
+    data[numeric] = MinMaxScaler().fit_transform(data[numeric])
+    return data
+
+def test_chunked_cleaning_matches_the_in_memory_script(raw_csv, tmp_path):
+    pytest.importorskip("sklearn")
+    output = tmp_path / "clean.csv"
+    scan = cleaning.clean_normalize_csv(str(raw_csv), str(output), chunk_rows=64)
+    expected = in_memory(raw_csv)
+    result = pd.read_csv(output)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.select_dtypes(include=[np.number]).to_numpy(),
+                               expected.select_dtypes(include=[np.number]).to_numpy(), atol=1e-12)
+    assert result["Label"].tolist() == expected["Label"].tolist()
+    assert scan.rows == 500 and scan.valid_rows == len(expected)
+    assert scan.missing["BMI"] == 40 and scan.complete_rows == 460
+
+def test_scan_statistics_do_not_depend_on_the_chunk_size(raw_csv):
+    whole, chunked = cleaning.scan_csv(str(raw_csv), 1000), cleaning.scan_csv(str(raw_csv), 37)
+    assert whole.invalid_rows == chunked.invalid_rows > 0
+    for first, second in zip(whole.scale_and_offset(), chunked.scale_and_offset()):
+        np.testing.assert_allclose(first, second)
+    assert whole.scale_and_offset()[0][whole.numeric_columns.index("Constant")] == 1.0
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+import dataset_split
+
+def labelled(rows=200):
+    rng = np.random.default_rng(5)
+    frame = pd.DataFrame({"glucose": rng.normal(120, 30, rows), "diabetes": rng.integers(0, 2, rows)})
+    frame.loc[[3, 50, 77], "glucose"] = np.nan
+    return frame
+
+def test_split_frame_matches_train_test_split_on_frames():
+    from sklearn.model_selection import train_test_split
+
+    frame = labelled()
+    data = frame.dropna()
+    train, temp = train_test_split(data, test_size=0.3, stratify=data["diabetes"], random_state=42)
+    val, test = train_test_split(temp, test_size=0.5, stratify=temp["diabetes"], random_state=42)
+    for result, expected in zip(dataset_split.split_frame(frame, "diabetes"), (train, val, test)):
+        assert result.equals(expected)
+
+def test_splits_partition_the_complete_rows():
+    frame = labelled()
+    rows = dataset_split.complete_positions(frame)
+    assert not set(rows.tolist()) & {3, 50, 77} and len(rows) == 197
+    train, val, test = dataset_split.split_indices(frame["diabetes"].to_numpy()[rows])
+    assert sorted(np.concatenate([train, val, test]).tolist()) == list(range(197))
+
+def test_write_splits_copies_rows_in_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_split, "WRITE_ROWS", 3)
+    matrix = np.arange(40, dtype=np.float32).reshape(20, 2)
+    positions = {"train": np.array([0, 5, 6, 7, 19]), "test": np.array([2])}
+    written = dataset_split.write_splits(matrix, positions, str(tmp_path), "ecg")
+    assert np.array_equal(written["train"], matrix[positions["train"]])
+    assert np.array_equal(np.load(tmp_path / "ecg_test.npy"), matrix[[2]])
+    assert not written["train"].flags.writeable
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("cryptography")
+
+from blockchain import Blockchain
+import encryption
+from encryption import EncryptedBlockchain, KeyRing
+
+def reading(i):
+    return {"patient_id": f"P00{i % 3 + 1}", "heart_rate": 60 + i, "glucose": 90 + i}
+
+def test_sensor_fields_are_encrypted_and_decrypt_back():
+    chain = EncryptedBlockchain()
+    block = chain.add_block(reading(1))
+    assert set(block.sensor_data) == {"patient_id", "__enc__"}
+    assert chain.decrypt(block) == reading(1)
+    assert chain.verify_chain(full=True)
+
+def test_old_blocks_stay_readable_after_rotation():
+    chain = EncryptedBlockchain()
+    first = chain.add_block(reading(1))
+    chain.keyring.rotate()
+    second = chain.add_block(reading(2))
+    assert (first.key_id, second.key_id) == (1, 2)
+    assert [chain.decrypt(block) for block in (first, second)] == [reading(1), reading(2)]
+
+def test_clear_fields_are_authenticated():
+    keyring = KeyRing()
+    sealed = keyring.seal(reading(1), ("heart_rate", "glucose"))
+    sealed["patient_id"] = "P999"
+    with pytest.raises(Exception):  # cryptography's InvalidTag
+        keyring.open(sealed, keyring.active_key_id)
+
+def test_reserved_key_is_rejected():
+    with pytest.raises(ValueError, match="reserved"):
+        EncryptedBlockchain().add_block({"patient_id": "P001", "__enc__": "x", "heart_rate": 70})
+
+def test_read_patient_decrypts_only_that_patients_blocks():
+    chain = EncryptedBlockchain()
+    chain.add_blocks(reading(i) for i in range(9))
+    assert chain.read_patient("P002") == [reading(i) for i in (1, 4, 7)]
+
+def test_appends_go_through_the_timed_add_block():
+    assert EncryptedBlockchain.add_block is Blockchain.add_block  # Keeps its metrics.timed wrapper
+    chain = EncryptedBlockchain()
+    chain.add_blocks(reading(i) for i in range(4))
+    assert [block.index for block in chain.blocks_for_patient("P002")] == [2]
+    assert chain.verify_chain(full=True)
+
+@pytest.mark.parametrize("threshold", [1000, 5])
+def test_batches_are_sealed_under_one_key_and_linked_in_order(monkeypatch, threshold):
+    pools = []
+
+    class RecordingPool(encryption.ThreadPoolExecutor):
+        def __init__(self, **kwargs):
+            pools.append(kwargs)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(encryption, "ThreadPoolExecutor", RecordingPool)
+    chain = EncryptedBlockchain(workers=2)
+    chain.parallel_threshold, chain.seal_batch_size = threshold, 3
+    blocks = chain.add_blocks(reading(i) for i in range(20))
+    assert pools == ([{"max_workers": 2}] if threshold == 5 else [])
+    assert [chain.decrypt(block) for block in blocks] == [reading(i) for i in range(20)]
+    assert {block.key_id for block in blocks} == {chain.keyring.active_key_id}
+    assert [block.index for block in chain.blocks_for_patient("P003")] == list(range(3, 21, 3))
+    assert chain.verify_chain(full=True)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import heart_rate
+
+def beat(rr, samples=187):
+    """Row with R-peaks at sample 0 and sample rr over a low baseline"""
+    t = np.arange(samples)
+    row = 0.2 + 0.1 * np.sin(t / 7.0)
+    row[0] = row[rr] = 1.0
+    return row
+
+def test_rr_interval_between_r_peaks():
+    rates = heart_rate.estimate_heart_rates(np.array([beat(100), beat(75), beat(50)]))
+    assert rates == pytest.approx([60 * 125 / 100, 60 * 125 / 75, 60 * 125 / 50])
+
+def test_rows_without_a_second_peak_use_the_segment_length():
+    row = np.zeros(187)
+    row[:120] = np.linspace(1.0, 0.1, 120)  # Falling signal, then zero padding
+    rate, = heart_rate.estimate_heart_rates(row[np.newaxis])
+    assert rate == pytest.approx(60 * 125 / (120 / heart_rate.SEGMENT_RR_RATIO))
+
+def test_blocks_give_the_same_result_as_one_pass(monkeypatch):
+    rng = np.random.default_rng(1)
+    matrix = rng.random((100, 187)).astype(np.float32)
+    expected = heart_rate.estimate_heart_rates(matrix)
+    monkeypatch.setattr(heart_rate, "BLOCK_ROWS", 7)
+    assert np.array_equal(heart_rate.estimate_heart_rates(matrix), expected)
+
+def test_degenerate_shapes():
+    assert heart_rate.estimate_heart_rates(np.empty((0, 187))).shape == (0,)
+    assert np.isnan(heart_rate.estimate_heart_rates(np.empty((3, 0)))).all()
+    short = heart_rate.estimate_heart_rates(np.ones((2, 2)))
+    assert short.shape == (2,) and np.isfinite(short).all()
+    with pytest.raises(ValueError, match="2-D"):
+        heart_rate.estimate_heart_rates(np.ones(187))
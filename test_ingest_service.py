@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+
+from blockchain import Blockchain
+from ingest_service import IngestService
+
+def reading(sensor_id, seq):
+    return {"sensor_id": sensor_id, "seq": seq, "heart_rate": 60 + seq % 40, "glucose": 90 + seq % 50}
+
+async def send(port, lines):
+    """Send raw lines, half-close, and return whatever the service replied"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for line in lines:
+        writer.write(line)
+    await writer.drain()
+    writer.write_eof()
+    reply = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return reply
+
+async def started(service):
+    server = await service.start("127.0.0.1", 0)
+    return server.sockets[0].getsockname()[1]
+
+def encode(obj):
+    return json.dumps(obj).encode() + b"\n"
+
+def test_concurrent_feeds_end_up_in_one_ordered_chain():
+    async def run():
+        blockchain = Blockchain()
+        service = IngestService(blockchain, batch_size=50)
+        port = await started(service)
+        await asyncio.gather(*(send(port, [encode(reading(f"S{n}", i)) for i in range(200)]) for n in range(5)))
+        await service.stop()
+        return blockchain, service
+
+    blockchain, service = asyncio.run(run())
+    assert service.readings_appended == 1000 and service.readings_failed == 0
+    readings = [r for block in blockchain.chain[1:] for r in block.sensor_data["readings"]]
+    assert len(readings) == 1000
+    for n in range(5):
+        assert [r["seq"] for r in readings if r["sensor_id"] == f"S{n}"] == list(range(200))
+    assert blockchain.verify_chain(full=True)
+
+def test_only_json_objects_with_every_field_are_accepted():
+    async def run():
+        service = IngestService(Blockchain())
+        port = await started(service)
+        await send(port, [
+            encode(["sensor_id", "heart_rate", "glucose"]),  # A list "contains" the field names
+            encode({"sensor_id": "S1", "heart_rate": 70}),
+            b"not json\n",
+            encode(reading("S1", 1))
+        ])
+        await service.stop()
+        return service
+
+    service = asyncio.run(run())
+    assert service.readings_rejected == 3
+    assert service.readings_appended == 1
+
+def test_oversized_line_gets_an_error_and_the_service_keeps_running():
+    async def run():
+        service = IngestService(Blockchain(), line_limit=1024)
+        port = await started(service)
+        reply = await send(port, [b'{"sensor_id": "' + b"x" * 4096 + b'"}\n', encode(reading("S1", 1))])
+        await send(port, [encode(reading("S2", 2))])
+        await service.stop()
+        return service, reply
+
+    service, reply = asyncio.run(run())
+    assert b"line longer than 1024 bytes" in reply
+    assert service.readings_appended == 1  # The reading after the long line is lost with its connection
+
+class FailingBlockchain(Blockchain):
+    def __init__(self, failures, **kwargs):
+        self.failures = failures
+        super().__init__(**kwargs)
+
+    def add_block(self, sensor_data):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        return super().add_block(sensor_data)
+
+def test_failed_append_is_logged_and_reraised_by_stop(caplog):
+    async def run():
+        service = IngestService(FailingBlockchain(failures=1), batch_size=10, batch_timeout=0.01)
+        port = await started(service)
+        await send(port, [encode(reading("S1", i)) for i in range(10)])
+        await service.drain()  # Must not hang on the failed batch
+        await send(port, [encode(reading("S1", i)) for i in range(10, 15)])
+        with pytest.raises(OSError, match="disk full"):
+            await service.stop()
+        return service
+
+    service = asyncio.run(run())
+    assert service.readings_failed == 10
+    assert service.readings_appended == 5
+    assert "Could not append a block of 10 readings" in caplog.text
+
+def test_drain_raises_when_the_writer_task_dies():
+    async def run():
+        service = IngestService(Blockchain())
+
+        async def broken_batch():
+            raise RuntimeError("writer bug")
+
+        service._next_batch = broken_batch
+        await started(service)
+        await service._queue.put((0, reading("S1", 1)))
+        with pytest.raises(RuntimeError, match="writer bug"):
+            await asyncio.wait_for(service.drain(), 5)
+        service._server.close()
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Submodules that only exist in sys.modules once the package itself has executed
+HEAVY = {"pandas": "pandas.core.frame", "numpy": "numpy.linalg", "sklearn": "sklearn.base",
+         "matplotlib": "matplotlib.pyplot"}
+
+def executed_after_import(module):
+    code = (f"import importlib, json, sys; sys.path.insert(0, {ROOT!r})\n"
+            f"importlib.import_module({module!r})\n"
+            f"print(json.dumps([name for name, probe in {HEAVY!r}.items() if probe in sys.modules]))\n")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+@pytest.mark.parametrize("module", ["blockchain", "1", "2", "3", "4", "5", "6", "7", "8", "CMB_1OMT_4"])
+def test_importing_does_not_load_data_libraries(module):
+    assert executed_after_import(module) == []
+
+def test_lazy_module_runs_on_first_attribute_access():
+    code = (f"import sys; sys.path.insert(0, {ROOT!r})\n"
+            "from lazy_imports import lazy_import\n"
+            "colorsys = lazy_import('colorsys')\n"
+            "assert sys.modules['colorsys'] is colorsys and type(colorsys) is not type(sys)  # Not run yet\n"
+            "assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)\n"
+            "import colorsys as again\n"
+            "assert again is colorsys and type(colorsys) is type(sys)\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_missing_module_fails_at_lazy_import():
+    from lazy_imports import lazy_import
+
+    with pytest.raises(ModuleNotFoundError, match="no_such_module"):
+        lazy_import("no_such_module")
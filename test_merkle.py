@@ -0,0 +1,49 @@
+import pytest
+
+import merkle
+
+def readings(count, offset=0):
+    return [{"sensor_id": f"S{i % 3}", "heart_rate": 60 + i % 40, "glucose": 90 + i} for i in range(offset, offset + count)]
+
+def build(batches=5, size=7):
+    chain = merkle.MerkleBlockchain()
+    for n in range(batches):
+        chain.add_batch(readings(size, n * size))
+    return chain
+
+@pytest.mark.parametrize("count", [1, 2, 5, 8, 13])
+def test_every_reading_has_a_valid_proof(count):
+    batch = readings(count)
+    tree = merkle.MerkleTree(batch)
+    for position, reading in enumerate(batch):
+        assert merkle.verify_proof(reading, tree.proof(position), tree.root)
+    assert not merkle.verify_proof({"heart_rate": 0}, tree.proof(0), tree.root)
+
+def test_valid_chain_verifies():
+    chain = build()
+    assert chain.verify_chain(full=True)
+    assert chain.chain[3].verify_body()
+
+def test_tampered_body_fails_verify_chain(capsys):
+    chain = build()
+    chain.chain[3].sensor_data[2]["glucose"] = 500  # Header hash is unchanged
+    assert chain.chain[3].current_hash == chain.chain[3].calculate_hash()
+    assert not chain.verify_chain()
+    assert "Block 3: Merkle root mismatch" in capsys.readouterr().out
+    assert chain.verified_upto == 2
+    assert not chain.verify_chain()  # Still unverified on the next incremental pass
+
+def test_incremental_verify_checks_bodies_of_new_blocks_only():
+    chain = build()
+    assert chain.verify_chain()
+    chain.chain[2].sensor_data.append({"heart_rate": 1})
+    chain.add_batch(readings(3, 100))
+    assert chain.verify_chain()  # Block 2 was already verified
+    assert not chain.verify_chain(full=True)
+
+def test_empty_and_odd_batches():
+    chain = merkle.MerkleBlockchain()
+    chain.add_batch([])
+    chain.add_batch(readings(3))
+    assert chain.verify_chain(full=True)
+    assert chain.chain[1].merkle_root == chain.chain[0].merkle_root
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def run(code, tmp_path, **environment):
+    env = dict(os.environ, **environment)
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True,
+                   capture_output=True, text=True)
+
+def test_histogram_quantiles_and_prometheus_text():
+    registry = metrics.Registry()
+    for value_ns in (300, 300, 1000, 5_000_000):
+        registry.histogram("verify").observe(value_ns)
+    registry.increment("failures", 2)
+    histogram = registry.histogram("verify")
+    assert histogram.quantile(0.5) == 512 / 1e9
+    assert histogram.snapshot()["buckets"][-1] == [float("inf"), 4]
+    text = registry.prometheus()
+    assert "sensor_failures_total 2" in text
+    assert 'sensor_verify_seconds_bucket{le="+Inf"} 4' in text
+    assert "sensor_verify_seconds_count 4" in text
+
+def test_timed_is_free_when_disabled_and_counts_when_enabled(monkeypatch):
+    def work():
+        return 1
+
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    assert metrics.timed("work")(work) is work
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "REGISTRY", metrics.Registry())
+    timed = metrics.timed("work")(work)
+    assert timed() == 1 and timed() == 1
+    assert metrics.REGISTRY.histogram("work").count == 2
+
+def test_each_verification_is_timed_once(tmp_path):
+    code = (f"import sys; sys.path.insert(0, {ROOT!r})\n"
+            "from blockchain import Blockchain\n"
+            "chain = Blockchain()\n"
+            "chain.add_block({'heart_rate': 70, 'glucose': 90})\n"
+            "chain.is_chain_valid(full=True)\n")
+    run(code, tmp_path, SENSOR_METRICS="1", SENSOR_METRICS_FILE=str(tmp_path / "metrics.json"))
+    histograms = json.loads((tmp_path / "metrics.json").read_text())["histograms"]
+    assert histograms["blockchain_verify_chain"]["count"] == 1
+    assert "blockchain_is_chain_valid" not in histograms
+    assert histograms["blockchain_add_block"]["count"] == 1
+
+@pytest.mark.parametrize("enable", [False, True])
+def test_profiling_starts_only_when_enabled(tmp_path, enable):
+    code = (f"import sys; sys.path.insert(0, {ROOT!r})\n"
+            "import metrics\n"
+            + ("assert metrics.enable_profiling()\n" if enable else "assert metrics._profile is None\n"))
+    run(code, tmp_path, SENSOR_PROFILE="cprofile", SENSOR_PROFILE_FILE=str(tmp_path / "run.prof"))
+    assert (tmp_path / "run.prof").exists() == enable
+
+def test_enable_profiling_without_a_mode_does_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "PROFILE_MODE", "")
+    assert not metrics.enable_profiling()
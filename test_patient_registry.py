@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import patient_registry
+
+def frame(codes, column, offset=0):
+    codes = np.asarray(codes, dtype=np.int64)
+    return pd.DataFrame({"patient_code": codes, column: codes * 10 + offset})
+
+def chunked(data, bounds):
+    return [data.iloc[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+def streamed(left_chunks, right_chunks):
+    chunks = list(patient_registry.iter_join_by_code(left_chunks, right_chunks, ["Glucose"], ["Heart_Rate"]))
+    return pd.concat(chunks, ignore_index=True) if chunks else None
+
+def test_codes_and_ids_round_trip():
+    assert patient_registry.patient_id(41) == "P042"
+    assert patient_registry.patient_code("P042") == 41
+    assert patient_registry.patient_ids(patient_registry.positional_codes(2, start=9)) == ["P010", "P011"]
+
+def test_registry_assigns_dense_codes_once():
+    registry = patient_registry.PatientRegistry()
+    assert registry.encode(["b", "a", "b"]).tolist() == [0, 1, 0]
+    assert registry.encode(["c", "a"]).tolist() == [2, 1]
+    assert registry.decode([2, 0]) == ["c", "b"] and len(registry) == 3
+
+def test_join_keeps_codes_present_in_both():
+    joined = patient_registry.join_by_code(frame([0, 2, 5, 7], "Glucose"), frame([2, 3, 7, 9], "Heart_Rate", 1),
+                                           ["Glucose"], ["Heart_Rate"])
+    assert joined["patient_code"].tolist() == [2, 7]
+    assert joined["Glucose"].tolist() == [20, 70] and joined["Heart_Rate"].tolist() == [21, 71]
+
+@pytest.mark.parametrize("left_bounds, right_bounds", [
+    ([0, 10], [0, 3, 6, 10]),  # One side ends after its first chunk
+    ([0, 3, 6, 10], [0, 10]),
+    ([0, 1, 2, 7, 10], [0, 4, 4, 9, 10]),  # Empty chunk in the middle
+    ([0, 0, 10], [0, 5, 10, 10]),  # Empty first and last chunks
+])
+def test_streamed_join_matches_the_in_memory_join(left_bounds, right_bounds):
+    left, right = frame(range(10), "Glucose"), frame(range(10), "Heart_Rate", 1)
+    expected = patient_registry.join_by_code(left, right, ["Glucose"], ["Heart_Rate"])
+    result = streamed(chunked(left, left_bounds), chunked(right, right_bounds))
+    assert len(result) == 10
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_streamed_join_with_gaps_and_uneven_ranges():
+    left = frame([0, 1, 4, 8, 9, 15, 20, 21, 30], "Glucose")
+    right = frame([1, 2, 3, 4, 9, 14, 15, 21, 22, 23, 24, 40], "Heart_Rate", 1)
+    expected = patient_registry.join_by_code(left, right, ["Glucose"], ["Heart_Rate"])
+    result = streamed(chunked(left, [0, 2, 3, 9]), chunked(right, [0, 5, 6, 7, 12]))
+    assert result["patient_code"].tolist() == [1, 4, 9, 15, 21]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_streamed_join_of_an_empty_stream():
+    assert streamed([], [frame(range(3), "Heart_Rate")]) is None
@@ -0,0 +1,80 @@
+import pytest
+
+import blockchain
+import proof_of_work
+from proof_of_work import MinedBlock, MinedBlockchain
+
+def reading(i):
+    return {"heart_rate": 60 + i, "glucose": 90 + i}
+
+@pytest.mark.parametrize("hash_format", [blockchain.HASH_FORMAT_V1, blockchain.HASH_FORMAT_LEGACY])
+def test_mined_blocks_meet_their_difficulty(hash_format):
+    chain = MinedBlockchain(difficulty=8, workers=1, hash_format=hash_format)
+    for i in range(5):
+        block = chain.add_block(reading(i))
+        assert block.difficulty == 8 and block.nonce > 0
+        assert proof_of_work.meets_difficulty(block.current_hash, 8)
+    assert chain.verify_chain(full=True) and chain.verify_work()
+
+def test_difficulty_zero_blocks_hash_like_plain_blocks():
+    chain = MinedBlockchain()
+    block = chain.add_block(reading(1))
+    assert type(block) is MinedBlock and (block.nonce, block.difficulty) == (0, 0)
+    plain = blockchain.Block(block.index, block.previous_hash, block.timestamp, reading(1))
+    assert block.current_hash == plain.current_hash
+    assert chain.verify_work()
+
+def test_difficulty_is_committed_in_the_header():
+    chain = MinedBlockchain(difficulty=6, workers=1)
+    block = chain.add_block(reading(1))
+    block.difficulty = 0  # Claiming less work changes the hash
+    assert block.calculate_hash() != block.current_hash
+    assert not chain.verify_chain(full=True)
+
+def test_each_block_is_checked_against_its_own_difficulty(capsys):
+    chain = MinedBlockchain(difficulty=4, workers=1)
+    chain.add_block(reading(1))
+    chain.difficulty = 10
+    chain.add_block(reading(2))
+    chain.difficulty = 0
+    chain.add_block(reading(3))
+    assert [block.difficulty for block in chain.chain] == [0, 4, 10, 0]
+    assert chain.verify_chain(full=True) and chain.verify_work()
+    forged = chain.chain[2]
+    forged.nonce = 0
+    while proof_of_work.meets_difficulty(forged.current_hash, 10):  # Rehash until it misses its 10 bits
+        forged.nonce += 1
+        forged.current_hash = forged.calculate_hash()
+    assert not chain.verify_work()
+    assert "Block 2: Hash does not meet the difficulty target" in capsys.readouterr().out
+
+def test_parallel_search_finds_a_winning_nonce():
+    chain = MinedBlockchain(difficulty=12, workers=2)
+    try:
+        block = chain.add_block(reading(1))
+        assert proof_of_work.meets_difficulty(block.current_hash, 12)
+    finally:
+        chain.close()
+
+def test_out_of_range_difficulty_is_rejected():
+    with pytest.raises(ValueError, match="between 0 and 256"):
+        MinedBlockchain(difficulty=300)
+
+def test_unmined_rewrite_fails_is_chain_valid(capsys):
+    chain = MinedBlockchain(difficulty=10, workers=1)
+    for i in range(3):
+        chain.add_block(reading(i))
+    assert chain.is_chain_valid()
+    forged = chain.chain[2]
+    forged.sensor_data["glucose"] = 500
+    forged.nonce = 0
+    while True:  # Rehash without mining until the hash misses the target
+        forged.nonce += 1
+        forged.current_hash = forged.calculate_hash()
+        if not proof_of_work.meets_difficulty(forged.current_hash, 10):
+            break
+    chain.chain[3].previous_hash = forged.current_hash
+    chain.chain[3].current_hash = chain.chain[3].calculate_hash()
+    assert not chain.is_chain_valid(full=True)
+    assert "Block 2: Hash does not meet the difficulty target" in capsys.readouterr().out
+    assert chain.verified_upto == 1
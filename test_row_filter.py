@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+import row_filter
+
+def sample(rows=1000):
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame({
+        "heart_rate": rng.normal(70, 30, rows),
+        "glucose": rng.integers(-10, 200, rows),
+        "note": rng.choice(["ok", None], rows, p=[0.95, 0.05])
+    })
+    frame.loc[rng.choice(rows, 50, replace=False), "heart_rate"] = np.nan
+    return frame
+
+def test_matches_dropna_and_the_negative_value_filter():
+    frame = sample()
+    result = row_filter.filter_rows(frame, block_rows=64)
+    assert result.missing.equals(frame.isnull().sum())
+    complete = frame.dropna()
+    numeric = complete.select_dtypes(include=[np.number])
+    expected = complete[~(numeric < 0).any(axis=1)]
+    assert result.frame.equals(expected)
+    assert result.complete_rows == len(complete) and result.valid_rows == len(expected)
+    assert result.invalid_rows.equals(complete[(numeric < 0).any(axis=1)])
+
+def test_block_size_does_not_change_the_result():
+    frame = sample()
+    assert np.array_equal(row_filter.filter_rows(frame, block_rows=7).mask, row_filter.filter_rows(frame).mask)
+
+def test_column_rules_by_label_and_by_position():
+    frame = pd.DataFrame({"heart_rate": [30.0, 80.0, 250.0], "glucose": [-1.0, 90.0, 95.0]})
+    by_label = row_filter.ValidityRules({"heart_rate": (40, 220)}, default=(None, None))
+    assert row_filter.filter_rows(frame, by_label).frame.index.tolist() == [1]
+    by_position = row_filter.ValidityRules({1: (0, None)}, default=(None, None))
+    assert row_filter.filter_rows(frame, by_position).frame.index.tolist() == [1, 2]
+    assert len(row_filter.filter_rows(frame, row_filter.COMPLETE).frame) == 3
@@ -0,0 +1,72 @@
+import importlib
+
+import pandas as pd
+
+script = importlib.import_module("8")
+
+def diabetes_frame(rows=20):
+    return pd.DataFrame({
+        "Pregnancies": [i % 5 for i in range(rows)],
+        "Glucose": [80.0 + i for i in range(rows)],
+        "Outcome": [i % 2 for i in range(rows)]
+    })
+
+def test_add_blocks_from_frame_links_and_verifies():
+    blockchain = script.Blockchain()
+    frame = diabetes_frame()
+    blocks = blockchain.add_blocks_from_frame(frame)
+    assert len(blocks) == len(frame)
+    assert len(blockchain.chain) == len(frame) + 1
+    for previous, block in zip(blockchain.chain, blockchain.chain[1:]):
+        assert block.previous_hash == previous.hash
+        assert block.index == previous.index + 1
+    assert blockchain.is_chain_valid(full=True)
+
+def test_add_blocks_from_frame_matches_row_by_row_blocks():
+    blockchain = script.Blockchain()
+    frame = diabetes_frame(5)
+    blocks = blockchain.add_blocks_from_frame(frame)
+    for block, (_, row) in zip(blocks, frame.iterrows()):
+        expected = script.Block(block.index, block.previous_hash, row.to_dict(), block.timestamp, token=block.token)
+        assert block.data == expected.data
+        assert block.hash == expected.hash
+
+def test_tampered_row_is_detected():
+    blockchain = script.Blockchain()
+    blockchain.add_blocks_from_frame(diabetes_frame())
+    blockchain.chain[7].sensor_data["Glucose"] = 1000.0
+    assert not blockchain.is_chain_valid(full=True)
+
+def test_add_block_hashes_a_linked_block_only_once(monkeypatch):
+    blockchain = script.Blockchain()
+    latest = blockchain.get_latest_block()
+    block = script.Block(1, latest.hash, {"Glucose": 90.0}, 1.0, token=7)
+    unlinked = script.Block(2, "", {"Glucose": 91.0}, 2.0, token=8)
+    calls = []
+    monkeypatch.setattr(script.Block, "calculate_hash", lambda self: calls.append(self) or "0" * 64)
+    blockchain.add_block(block)
+    assert calls == []
+    blockchain.add_block(unlinked)
+    assert calls == [unlinked] and unlinked.previous_hash == block.hash
+
+def test_add_block_links_and_indexes_unlinked_blocks():
+    blockchain = script.Blockchain()
+    for i in range(3):
+        blockchain.add_block(script.Block(i + 1, "", {"patient_id": "P001", "Glucose": 90.0 + i}, 1.0 + i))
+    assert blockchain.is_chain_valid(full=True)
+    assert [block.index for block in blockchain.blocks_for_patient("P001")] == [1, 2, 3]
+
+class CountingChain(list):
+    extends = 0
+
+    def extend(self, blocks):
+        self.extends += 1
+        super().extend(blocks)
+
+def test_add_blocks_from_frame_extends_once_and_is_indexed_on_query():
+    blockchain = script.Blockchain()
+    blockchain.chain = CountingChain(blockchain.chain)
+    frame = diabetes_frame(6).assign(patient_id=["P001", "P002"] * 3)
+    blockchain.add_blocks_from_frame(frame)
+    assert blockchain.chain.extends == 1 and len(blockchain.chain) == 7
+    assert [block.index for block in blockchain.blocks_for_patient("P002")] == [2, 4, 6]
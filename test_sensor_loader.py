@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sensor_loader
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(sensor_loader, "CACHE_DIR", str(directory))
+    return directory
+
+@pytest.fixture
+def ecg_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.random((50, sensor_loader.ECG_SIGNAL_COLUMNS)).round(4))
+    frame[sensor_loader.ECG_SIGNAL_COLUMNS] = np.arange(50) % 5
+    path = tmp_path / "mitbih.csv"
+    frame.to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture
+def diabetes_csv(tmp_path):
+    frame = pd.DataFrame({
+        "Pregnancies": np.arange(40) % 6,
+        "Glucose": 80 + np.arange(40),
+        "BMI": 20.5 + np.arange(40) / 4,
+        "Outcome": np.arange(40) % 2
+    })
+    path = tmp_path / "diabetes.csv"
+    frame.to_csv(path, index=False)
+    return str(path)
+
+def test_read_ecg_parses_only_the_requested_rows(ecg_csv):
+    data = sensor_loader.read_ecg(ecg_csv, nrows=5, cache=False)
+    assert data.shape == (5, sensor_loader.ECG_SIGNAL_COLUMNS + 1)
+    assert (data.dtypes == np.float32).all()
+    expected = pd.read_csv(ecg_csv, nrows=5).astype(np.float32)
+    assert np.array_equal(data.to_numpy(), expected.to_numpy())
+
+def test_read_diabetes_rows_and_columns(diabetes_csv):
+    data = sensor_loader.read_diabetes(diabetes_csv, nrows=5, usecols=["Glucose"], cache=False)
+    assert list(data.columns) == ["Glucose"]
+    assert data["Glucose"].tolist() == [80, 81, 82, 83, 84]
+
+def test_windows_cover_the_file_in_order(diabetes_csv):
+    windows = list(sensor_loader.iter_diabetes_windows(diabetes_csv, 16))
+    assert [len(window) for window in windows] == [16, 16, 8]
+    assert pd.concat(windows).equals(pd.read_csv(diabetes_csv))
+
+def test_ecg_windows_honour_nrows_and_usecols(ecg_csv):
+    windows = list(sensor_loader.iter_ecg_windows(ecg_csv, 8, usecols=["0", "1"], nrows=20, cache=False))
+    assert [len(window) for window in windows] == [8, 8, 4]
+    assert all(list(window.columns) == ["0", "1"] for window in windows)
+    assert windows[0].dtypes.tolist() == [np.float32, np.float32]
+
+def test_ecg_snapshot_serves_partial_reads_like_the_csv(ecg_csv, cache_dir):
+    full = sensor_loader.read_ecg(ecg_csv)  # Builds the snapshot
+    assert len(list(cache_dir.glob("*.npy"))) == 1
+    assert np.array_equal(full.to_numpy(), sensor_loader.read_ecg(ecg_csv, cache=False).to_numpy())
+    for usecols in (["5", "2"], [5, 2]):
+        cached = sensor_loader.read_ecg(ecg_csv, nrows=7, usecols=usecols)
+        parsed = sensor_loader.read_ecg(ecg_csv, nrows=7, usecols=usecols, cache=False)
+        assert list(cached.columns) == list(parsed.columns) == ["2", "5"]  # File order, warm or cold
+        assert np.array_equal(cached.to_numpy(), parsed.to_numpy())
+    with pytest.raises(ValueError, match="Usecols do not match"):
+        sensor_loader.read_ecg(ecg_csv, usecols=["nope"])
+
+def test_ecg_snapshot_is_rebuilt_when_the_csv_changes(ecg_csv, cache_dir):
+    sensor_loader.read_ecg(ecg_csv)
+    with open(ecg_csv, "a") as f:
+        f.write(",".join(["0.5"] * sensor_loader.ECG_SIGNAL_COLUMNS + ["1"]) + "\n")
+    assert len(sensor_loader.read_ecg(ecg_csv)) == 51
+    assert len(list(cache_dir.glob("*.npy"))) == 1  # The stale snapshot was dropped
+
+def test_interrupted_snapshot_write_leaves_no_half_snapshot(ecg_csv, cache_dir, monkeypatch):
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(np, "save", crash)
+        with pytest.raises(OSError):
+            sensor_loader.read_ecg(ecg_csv)
+    assert not list(cache_dir.glob("*.npy"))
+    assert len(sensor_loader.read_ecg(ecg_csv)) == 50
+
+def test_diabetes_feather_snapshot_serves_partial_reads(diabetes_csv, cache_dir):
+    pytest.importorskip("pyarrow")
+    sensor_loader.read_diabetes(diabetes_csv)
+    assert len(list(cache_dir.glob("*.feather"))) == 1
+    cached = sensor_loader.read_diabetes(diabetes_csv, nrows=5, usecols=["Outcome", "Glucose"])
+    parsed = sensor_loader.read_diabetes(diabetes_csv, nrows=5, usecols=["Outcome", "Glucose"], cache=False)
+    assert cached.equals(parsed)
+
+def test_diabetes_without_pyarrow_is_not_cached(diabetes_csv, cache_dir, monkeypatch):
+    monkeypatch.setattr(sensor_loader, "_feather_available", lambda: False)
+    data = sensor_loader.read_diabetes(diabetes_csv)
+    assert data.equals(pd.read_csv(diabetes_csv))
+    assert not cache_dir.exists() or not list(cache_dir.iterdir())
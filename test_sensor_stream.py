@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import sensor_stream
+from blockchain import Blockchain
+
+def reading(heart_rate, glucose=100.0):
+    return {"heart_rate": heart_rate, "glucose": glucose}
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(2).normal(70, 5, 1000)
+    stats = sensor_stream.RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.std == pytest.approx(values.std())
+
+def test_tumbling_windows_per_patient():
+    aggregator = sensor_stream.WindowAggregator(size=10)
+    emitted = []
+    for time in range(25):
+        for patient_id in ("P001", "P002"):
+            emitted += aggregator.add(patient_id, time, reading(60 + time, 90 + time % 3))
+    emitted += aggregator.flush()
+    windows = [(stats["patient_id"], stats["window_start"], stats["count"]) for stats in emitted]
+    assert sorted(windows) == [("P001", 0, 10), ("P001", 10, 10), ("P001", 20, 5),
+                               ("P002", 0, 10), ("P002", 10, 10), ("P002", 20, 5)]
+    first = next(stats for stats in emitted if stats["patient_id"] == "P001" and stats["window_start"] == 10)
+    assert first["heart_rate_mean"] == pytest.approx(np.mean(range(70, 80)))
+    assert first["heart_rate_std"] == pytest.approx(np.std(range(70, 80)))
+    assert first["window_end"] == 20
+
+def test_sliding_windows_overlap():
+    aggregator = sensor_stream.WindowAggregator(size=10, step=5)
+    for time in range(20):
+        aggregator.add("P001", time, reading(70))
+    starts = sorted(stats["window_start"] for stats in aggregator.flush())
+    assert starts == [10, 15]  # 0 and 5 were emitted while streaming
+
+def test_idle_patients_windows_close_on_the_watermark():
+    aggregator = sensor_stream.WindowAggregator(size=10)
+    aggregator.add("P001", 3, reading(70))  # P001 then goes quiet
+    assert aggregator.add("P002", 9, reading(80)) == []
+    emitted = aggregator.add("P002", 10, reading(80))
+    assert sorted(stats["patient_id"] for stats in emitted) == ["P001", "P002"]
+    assert aggregator._windows == {10: {"P002": aggregator._windows[10]["P002"]}}
+
+def test_open_windows_stay_bounded_with_many_patients():
+    aggregator = sensor_stream.WindowAggregator(size=5)
+    emitted = 0
+    for time in range(1000):
+        emitted += len(aggregator.add(f"P{time:04d}", time, reading(70)))  # Every patient is seen once
+    assert emitted == 995
+    assert sum(len(patients) for patients in aggregator._windows.values()) == 5
+
+def test_lateness_keeps_windows_open_and_counts_late_readings():
+    aggregator = sensor_stream.WindowAggregator(size=10, lateness=5)
+    aggregator.add("P001", 12, reading(70))
+    assert aggregator.add("P002", 8, reading(80)) == []  # Within the allowed lateness
+    emitted = aggregator.add("P001", 16, reading(70))
+    assert [(stats["patient_id"], stats["window_start"]) for stats in emitted] == [("P002", 0)]
+    aggregator.add("P002", 9, reading(80))  # Its window already closed
+    assert aggregator.late_readings == 1
+
+def test_negative_times_are_rejected():
+    with pytest.raises(ValueError, match=">= 0"):
+        sensor_stream.WindowAggregator(size=10).add("P001", -1, reading(70))
+
+def test_stream_to_blockchain_adds_one_block_per_window():
+    readings = [(f"P00{i % 3 + 1}", i // 3, reading(60 + i)) for i in range(90)]
+    blockchain = Blockchain()
+    added = sensor_stream.stream_to_blockchain(readings, blockchain, sensor_stream.WindowAggregator(size=10))
+    assert added == 9 and len(blockchain.chain) == 10
+    assert {block.sensor_data["count"] for block in blockchain.chain[1:]} == {10}
+    assert blockchain.verify_chain(full=True)